@@ -3,10 +3,12 @@ from .team_comparison import router as team_comparison_router
 from .headshots import router as headshots_router
 from .teams import router as teams_router
 from .players import router as players_router
+from .props import router as props_router
 from .schedule import router as schedule_router
 from .standings import router as standings_router
+from .streaks import router as streaks_router
 from .team_stats import router as team_stats_router
-from .trends import router as trends_router
+from .trends import router as trends_router, league_router as league_trends_router
 
 
 router = APIRouter(prefix="/nfl")
@@ -16,9 +18,12 @@ router.include_router(team_comparison_router)
 router.include_router(headshots_router)
 router.include_router(teams_router)
 router.include_router(players_router)
+router.include_router(props_router)
 router.include_router(schedule_router)
 router.include_router(standings_router)
+router.include_router(streaks_router)
 router.include_router(team_stats_router)
 router.include_router(trends_router)
+router.include_router(league_trends_router)
 
 
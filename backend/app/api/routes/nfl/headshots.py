@@ -1,13 +1,23 @@
 from fastapi import APIRouter, Query
-from typing import Optional
-from app.services.nfl.headshots import resolve_headshot_service
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.services.nfl.headshots import resolve_headshot_service, resolve_headshots_service
 
 
 router = APIRouter(tags=["NFL - Headshots"])
 
 
+class HeadshotsRequest(BaseModel):
+  queries: List[str] = Field(..., min_length=1, max_length=500)
+  season: Optional[int] = None
+
+
 @router.get("/players/headshot")
 async def resolve_headshot(q: str = Query(..., min_length=2), season: Optional[int] = Query(None)):
   return await resolve_headshot_service(q, season)
 
 
+@router.post("/players/headshots")
+async def resolve_headshots(body: HeadshotsRequest):
+  """Resolve many player names or gsis ids in one call (query -> headshot URLs)"""
+  return await resolve_headshots_service(body.queries, body.season)
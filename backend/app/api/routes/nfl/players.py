@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Query
 from typing import Optional
-from app.services.nfl.players import get_player_vs_team_service, search_players_service, get_player_career_service
+from app.services.nfl.players import get_player_vs_team_service, get_player_vs_all_service, get_player_hit_rates_service, get_player_usage_service, get_player_similar_service, get_players_gamelogs_service, search_players_service, get_player_career_service, resolve_player_service
+from app.services.nfl.projections import get_player_projection_service
 
 
 router = APIRouter(tags=["NFL - Players"])
@@ -16,6 +17,16 @@ async def player_vs_team(
     return await get_player_vs_team_service(player, team, seasons, game_types)
 
 
+@router.get("/player/{player}/vs")
+async def player_vs_all(
+    player: str,
+    seasons: Optional[str] = Query(None),
+    game_types: Optional[str] = Query(None)
+):
+    """Player splits against every opponent in one response"""
+    return await get_player_vs_all_service(player, seasons, game_types)
+
+
 @router.get("/player/{player}/career")
 async def player_career(
     player: str,
@@ -25,16 +36,100 @@ async def player_career(
     return await get_player_career_service(player, seasons, game_types)
 
 
+@router.get("/player/{player}/hit-rates")
+async def player_hit_rates(
+    player: str,
+    stat: str = Query(..., description="e.g. rec_yards, pass_yards, rush_rec_yards, receptions"),
+    lines: Optional[str] = Query(None, description="e.g. 64.5,70.5"),
+    seasons: Optional[str] = Query(None),
+    game_types: Optional[str] = Query(None),
+    last_n: Optional[int] = Query(None, ge=1),
+    venue: Optional[str] = Query(None, description="home or away"),
+    opponent: Optional[str] = Query(None),
+    scoring: Optional[str] = Query(None, description="Profile for stat=fantasy, e.g. half_ppr or ppr;passing_tds=6"),
+):
+    """How often a player went over/under prop lines (player_id or name)"""
+    return await get_player_hit_rates_service(
+        player, stat, lines, seasons, game_types, last_n=last_n, venue=venue, opponent=opponent, scoring=scoring,
+    )
+
+
+@router.get("/player/{player}/projection")
+async def player_projection(
+    player: str,
+    stat: str = Query(..., description="e.g. rec_yards, pass_yards, receptions"),
+    opponent: Optional[str] = Query(None, description="Scale by this defense's allowed rate to the player's position"),
+    lines: Optional[str] = Query(None, description="e.g. 64.5,70.5"),
+    seasons: Optional[str] = Query(None, description="e.g. 2024,2025"),
+    game_types: Optional[str] = Query(None),
+    last_n: int = Query(16, ge=1, le=100),
+    half_life: Optional[float] = Query(None, gt=0, description="Recency half-life in games"),
+    draws: Optional[int] = Query(None, ge=100, le=20000),
+):
+    """Bootstrap P10-P90 range of a player's next-game stat (player_id or name)"""
+    return await get_player_projection_service(
+        player, stat, opponent, lines, seasons, game_types, last_n=last_n, half_life=half_life, draws=draws,
+    )
+
+
+@router.get("/player/{player}/similar")
+async def player_similar(
+    player: str,
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    metric: str = Query("cosine", description="cosine or euclidean"),
+):
+    """Players with the closest per-game profile in the same position group (player_id or name)"""
+    return await get_player_similar_service(player, season, game_types, limit, metric)
+
+
+@router.get("/player/{player}/usage")
+async def player_usage(
+    player: str,
+    seasons: Optional[str] = Query(None),
+    game_types: Optional[str] = Query(None),
+    window: Optional[int] = Query(None, ge=1, le=17, description="Rolling window in games"),
+):
+    """Target/carry/air-yards/red-zone/snap shares per game (player_id or name)"""
+    return await get_player_usage_service(player, seasons, game_types, window)
+
+
+@router.get("/players/gamelogs")
+async def players_gamelogs(
+    ids: str = Query(..., description="Comma separated player_ids (up to 100)"),
+    stats: Optional[str] = Query(None, description="e.g. rec_yards,targets (default fantasy_points_ppr)"),
+    last_n: int = Query(10, ge=1, le=100),
+    seasons: Optional[str] = Query(None),
+    game_types: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="pid:season-week pairs (the response's next_cursor), or one player's next_cursor with a single id"),
+):
+    """Last-N game logs of many players as compact per-stat arrays"""
+    return await get_players_gamelogs_service(ids, stats, last_n, seasons, game_types, cursor)
+
+
 @router.get("/players/search")
 async def search_players(q: str = Query(..., min_length=2), limit: int = Query(20, ge=1, le=50)):
     return await search_players_service(q, limit)
 
 
+@router.get("/players/resolve")
+async def resolve_player(
+    name: str = Query(..., min_length=2),
+    seasons: Optional[str] = Query(None),
+    game_types: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """Ranked player_id candidates for a name (handles nicknames, suffixes and typos)"""
+    return await resolve_player_service(name, seasons, game_types, limit)
+
+
 @router.get("/players/ranks")
 async def get_player_ranks(
     season: Optional[int] = Query(None),
-    game_types: Optional[str] = Query(None)
+    game_types: Optional[str] = Query(None),
+    scoring: Optional[str] = Query(None, description="Fantasy scoring profile, e.g. half_ppr or ppr;passing_tds=6"),
 ):
     """Get player rankings for current season (2025) by position (QB, RB, WR/TE, DEF, K)"""
     from app.services.nfl.players import get_player_ranks_service
-    return await get_player_ranks_service(season, game_types)
+    return await get_player_ranks_service(season, game_types, scoring)
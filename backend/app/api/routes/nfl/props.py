@@ -0,0 +1,67 @@
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.services.nfl.projections import project_slate_service
+from app.services.nfl.props import evaluate_props_service
+
+
+router = APIRouter(tags=["NFL - Props"])
+
+
+class Prop(BaseModel):
+    player: str
+    stat: str
+    line: Optional[float] = None
+
+
+class PropsRequest(BaseModel):
+    props: List[Prop] = Field(..., min_length=1, max_length=20000)
+    seasons: Optional[List[int]] = None
+    game_types: Optional[List[str]] = None
+    last_n: Optional[int] = Field(None, ge=1)
+    venue: Optional[str] = Field(None, description="home or away")
+    opponent: Optional[str] = None
+    scoring: Optional[str] = Field(None, description="Profile for the 'fantasy' stat, e.g. half_ppr or ppr;passing_tds=6")
+
+
+@router.post("/props/evaluate")
+async def evaluate_props(body: PropsRequest):
+    """Hit rates for a whole slate of (player, stat, line) props with shared filters"""
+    return await evaluate_props_service(
+        [p.model_dump() for p in body.props],
+        body.seasons,
+        body.game_types,
+        last_n=body.last_n,
+        venue=body.venue,
+        opponent=body.opponent,
+        scoring=body.scoring,
+    )
+
+
+class Projection(BaseModel):
+    player: str
+    stat: str
+    opponent: Optional[str] = None
+    lines: Optional[List[float]] = None
+
+
+class ProjectionsRequest(BaseModel):
+    items: List[Projection] = Field(..., min_length=1, max_length=2000)
+    seasons: Optional[List[int]] = None
+    game_types: Optional[List[str]] = None
+    last_n: int = Field(16, ge=1, le=100)
+    half_life: Optional[float] = Field(None, gt=0, description="Recency half-life in games")
+    draws: Optional[int] = Field(None, ge=100, le=20000)
+
+
+@router.post("/props/project")
+async def project_props(body: ProjectionsRequest):
+    """Bootstrap P10-P90 next-game ranges for a slate, optionally opponent adjusted"""
+    return await project_slate_service(
+        [p.model_dump() for p in body.items],
+        body.seasons,
+        body.game_types,
+        last_n=body.last_n,
+        half_life=body.half_life,
+        draws=body.draws,
+    )
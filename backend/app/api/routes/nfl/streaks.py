@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.services.nfl.streaks import get_player_streaks_service, get_team_streaks_service
+
+
+router = APIRouter(tags=["NFL - Streaks"], prefix="/streaks")
+
+
+@router.get("/players")
+async def player_streaks(
+    stat: str = Query(..., description="e.g. receptions, rec_yards, rush_tds"),
+    threshold: float = Query(..., description="e.g. 6 with op=gte for 6+"),
+    op: str = Query("gte", description="gte, gt, lte, lt or eq"),
+    season: Optional[int] = Query(None),
+    span: int = Query(1, ge=1, le=5, description="Seasons ending at `season` to chain together"),
+    game_types: Optional[str] = Query(None),
+    position: Optional[str] = Query(None, description="Position group, e.g. WR"),
+    limit: int = Query(25, ge=1, le=200),
+):
+    """Longest active and all-time player streaks over a stat threshold"""
+    return await get_player_streaks_service(stat, threshold, op, season, span, game_types, position=position, limit=limit)
+
+
+@router.get("/teams")
+async def team_streaks(
+    stat: str = Query("win", description="win, loss, cover, no_cover, over, under, or points/points_allowed/margin/total with a threshold"),
+    threshold: Optional[float] = Query(None),
+    op: Optional[str] = Query(None, description="gte, gt, lte, lt or eq"),
+    season: Optional[int] = Query(None),
+    span: int = Query(1, ge=1, le=5, description="Seasons ending at `season` to chain together"),
+    game_types: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=32),
+):
+    """Longest active and all-time team streaks (results, ATS, totals)"""
+    return await get_team_streaks_service(stat, threshold, op, season, span, game_types, limit=limit)
@@ -8,6 +8,10 @@ from app.services.nfl.team_stats import (
     get_team_special_teams_service,
     get_special_teams_league_service,
 )
+from app.services.nfl.correlations import get_team_correlations_service
+from app.services.nfl.defense_position import get_dvp_ranks_service, get_team_dvp_service
+from app.services.nfl.drives import get_drive_ranks_service, get_team_drives_service
+from app.services.nfl.usage import get_team_usage_service
 
 router = APIRouter(tags=["NFL - Team Stats"], prefix="/team")
 
@@ -87,3 +91,84 @@ async def get_team_special_teams(
     return await get_team_special_teams_service(team, season, game_types, last_n=last_n, venue=venue, opponent_conf=opponent_conf, opponent_div=opponent_div)
 
 
+@router.get("/drives/ranks")
+async def get_league_drives(
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    side: Optional[str] = Query(None, description="offense (default) or defense"),
+    last_n: Optional[int] = Query(None),
+    venue: Optional[str] = Query(None),
+    opponent_conf: Optional[str] = Query(None),
+    opponent_div: Optional[str] = Query(None),
+):
+    return await get_drive_ranks_service(season, game_types, side=side, last_n=last_n, venue=venue, opponent_conf=opponent_conf, opponent_div=opponent_div)
+
+
+@router.get("/{team}/drives")
+async def get_team_drives(
+    team: str = Path(..., min_length=2, max_length=4),
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    side: Optional[str] = Query(None, description="offense (default) or defense"),
+    last_n: Optional[int] = Query(None),
+    venue: Optional[str] = Query(None),
+    opponent_conf: Optional[str] = Query(None),
+    opponent_div: Optional[str] = Query(None),
+    include_drives: bool = Query(False),
+):
+    return await get_team_drives_service(team, season, game_types, side=side, last_n=last_n, venue=venue, opponent_conf=opponent_conf, opponent_div=opponent_div, include_drives=include_drives)
+
+
+@router.get("/dvp/ranks")
+async def get_league_dvp(
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    position: Optional[str] = Query(None, description="QB, RB, WR, TE (comma separated; default all)"),
+    last_n: Optional[int] = Query(None),
+    venue: Optional[str] = Query(None),
+    scoring: Optional[str] = Query(None, description="Fantasy scoring profile, e.g. half_ppr or ppr;passing_tds=6"),
+):
+    return await get_dvp_ranks_service(season, game_types, position=position, last_n=last_n, venue=venue, scoring=scoring)
+
+
+@router.get("/{team}/dvp")
+async def get_team_dvp(
+    team: str = Path(..., min_length=2, max_length=4),
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    position: Optional[str] = Query(None, description="QB, RB, WR, TE (comma separated; default all)"),
+    last_n: Optional[int] = Query(None),
+    venue: Optional[str] = Query(None),
+    include_weeks: bool = Query(False),
+    scoring: Optional[str] = Query(None, description="Fantasy scoring profile, e.g. half_ppr or ppr;passing_tds=6"),
+):
+    return await get_team_dvp_service(
+        team, season, game_types, position=position, last_n=last_n, venue=venue, include_weeks=include_weeks, scoring=scoring,
+    )
+
+
+@router.get("/{team}/usage")
+async def get_team_usage(
+    team: str = Path(..., min_length=2, max_length=4),
+    season: Optional[int] = Query(None),
+    game_types: Optional[str] = Query(None),
+    last_n: Optional[int] = Query(None),
+    include_weeks: bool = Query(False),
+):
+    return await get_team_usage_service(team, season, game_types, last_n=last_n, include_weeks=include_weeks)
+
+
+@router.get("/{team}/correlations")
+async def get_team_correlations(
+    team: str = Path(..., min_length=2, max_length=4),
+    season: Optional[int] = Query(None),
+    span: int = Query(2, ge=1, le=5, description="Seasons ending at `season`"),
+    game_types: Optional[str] = Query(None),
+    stats: Optional[str] = Query(None, description="Stats for every player (default by position), e.g. rec_yards,receptions"),
+    max_players: int = Query(6, ge=1, le=15),
+    min_games: int = Query(5, ge=3),
+    limit: int = Query(20, ge=1, le=200),
+):
+    return await get_team_correlations_service(
+        team, season, span, game_types, stats=stats, max_players=max_players, min_games=min_games, limit=limit,
+    )
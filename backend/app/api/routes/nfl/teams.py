@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 from app.services.nfl.teams import get_teams_service
-from app.services.nfl.splits import get_team_home_away_splits_service
+from app.services.nfl.splits import get_team_home_away_splits_service, get_league_splits_service
 
 
 router = APIRouter(tags=["NFL - Teams"])
@@ -11,8 +11,23 @@ async def list_teams():
     return await get_teams_service()
 
 
-@router.get("/team/{team}/splits")
-async def team_splits(team: str, season: int | None = Query(None)):
-    return await get_team_home_away_splits_service(team, season)
+@router.get("/teams/splits")
+async def league_splits(
+    season: int | None = Query(None),
+    dims: str | None = Query(None, description="venue,opp_conf,opp_div,division_game,roof,surface,weekday,rest,favorite"),
+    where: str | None = Query(None, description="e.g. roof:dome|closed,favorite:underdog"),
+    game_types: str | None = Query(None),
+    by_team: bool = Query(True),
+):
+    return await get_league_splits_service(season, dims=dims, where=where, game_types=game_types, by_team=by_team)
 
 
+@router.get("/team/{team}/splits")
+async def team_splits(
+    team: str,
+    season: int | None = Query(None),
+    dims: str | None = Query(None, description="venue,opp_conf,opp_div,division_game,roof,surface,weekday,rest,favorite"),
+    where: str | None = Query(None, description="e.g. roof:dome|closed,favorite:underdog"),
+    game_types: str | None = Query(None),
+):
+    return await get_team_home_away_splits_service(team, season, dims=dims, where=where, game_types=game_types)
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Query
 from typing import Optional
-from app.services.nfl.trends import get_team_trends_service
+from app.services.nfl.trends import get_team_trends_service, get_league_trends_service
 
 
 router = APIRouter(prefix="/team", tags=["nfl-trends"])
+league_router = APIRouter(prefix="/trends", tags=["nfl-trends"])
 
 
 @router.get("/{team}/trends")
@@ -15,6 +16,7 @@ async def team_trends(
     venue: str | None = Query(None),
     opponent_conf: str | None = Query(None),
     opponent_div: str | None = Query(None),
+    lines: str | None = Query(None, description="e.g. 23.5,27 or game:23.5;h1:10.5;fg:1.5"),
 ):
     return await get_team_trends_service(
         team,
@@ -24,6 +26,30 @@ async def team_trends(
         venue=venue,
         opponent_conf=opponent_conf,
         opponent_div=opponent_div,
+        lines=lines,
     )
 
 
+@league_router.get("/league")
+async def league_trends(
+    season: int | None = Query(None),
+    game_types: str | None = Query(None),
+    last_n: int | None = Query(None),
+    venue: str | None = Query(None),
+    opponent_conf: str | None = Query(None),
+    opponent_div: str | None = Query(None),
+    lines: str | None = Query(None, description="e.g. 23.5,27 or game:23.5;h1:10.5;fg:1.5"),
+    sort_by: str | None = Query(None, description="e.g. game:23.5, game:23.5:under, margin:7, wl:h1, games"),
+    order: str | None = Query(None, description="desc (default) or asc"),
+):
+    return await get_league_trends_service(
+        season,
+        game_types,
+        last_n=last_n,
+        venue=venue,
+        opponent_conf=opponent_conf,
+        opponent_div=opponent_div,
+        lines=lines,
+        sort_by=sort_by,
+        order=order,
+    )
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import nflreadpy as nfl
+
+from app.core.settings import settings
+
+
+T = TypeVar("T")
+
+_STORE: Dict[Tuple[str, Hashable], Tuple[int, Any]] = {}
+_STORE_LOCK = threading.Lock()
+_BUILD_LOCKS: Dict[Tuple[str, Hashable], threading.Lock] = {}
+# name -> keys of a bounded table, least recently used first
+_RECENT: Dict[str, "OrderedDict[Hashable, None]"] = {}
+
+
+def data_version(season: int) -> int:
+    """Version token for the nflverse data of a season.
+
+    Completed seasons never change, so they are always version 0. The current
+    season follows the nflreadpy cache window: once the downloaded files may have
+    been refreshed, the token moves on and dependent tables are rebuilt.
+    """
+    if int(season) < int(nfl.get_current_season()):
+        return 0
+    return int(time.time() // max(int(settings.cache_duration), 1))
+
+
+def peek(name: str, key: Hashable) -> Optional[Any]:
+    """The last value built for (name, key), whatever its version, or None (for incremental rebuilds)."""
+    with _STORE_LOCK:
+        hit = _STORE.get((name, key))
+    return hit[1] if hit is not None else None
+
+
+def _touch(name: str, key: Hashable, limit: Optional[int]) -> None:
+    """Mark (name, key) as just used and evict the table's oldest entries past `limit` (holds _STORE_LOCK)."""
+    if not limit:
+        return
+    recent = _RECENT.setdefault(name, OrderedDict())
+    recent[key] = None
+    recent.move_to_end(key)
+    while len(recent) > limit:
+        old, _ = recent.popitem(last=False)
+        _STORE.pop((name, old), None)
+        _BUILD_LOCKS.pop((name, old), None)
+
+
+def get_or_build(name: str, key: Hashable, version: int, build: Callable[[], T], *, limit: Optional[int] = None) -> T:
+    """Return the cached value for (name, key) if it was built for `version`.
+
+    Otherwise build it once (concurrent callers wait for the same build) and
+    replace any older version. With `limit`, the table named `name` keeps only
+    its `limit` most recently used keys. Meant to be called from a worker thread.
+    """
+    slot = (name, key)
+    with _STORE_LOCK:
+        hit = _STORE.get(slot)
+        if hit is not None and hit[0] == version:
+            _touch(name, key, limit)
+            return hit[1]
+        lock = _BUILD_LOCKS.setdefault(slot, threading.Lock())
+
+    with lock:
+        with _STORE_LOCK:
+            hit = _STORE.get(slot)
+            if hit is not None and hit[0] == version:
+                _touch(name, key, limit)
+                return hit[1]
+        value = build()
+        with _STORE_LOCK:
+            _STORE[slot] = (version, value)
+            _touch(name, key, limit)
+        return value
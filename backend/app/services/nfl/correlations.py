@@ -0,0 +1,192 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import nflreadpy as nfl
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_gamelogs import PROP_STATS, game_logs
+from app.services.nfl.scoreboard import parse_game_types
+from app.services.nfl.splits import load_team_results
+
+
+# Stats correlated per position group when the request names none
+DEFAULT_STATS: Dict[str, Tuple[str, ...]] = {
+    "QB": ("pass_yards", "pass_tds", "rush_yards"),
+    "RB": ("rush_yards", "rush_attempts", "receptions", "rec_yards"),
+    "WR": ("receptions", "rec_yards", "targets"),
+    "TE": ("receptions", "rec_yards", "targets"),
+}
+
+# Game-level team columns (from the team-results table)
+TEAM_COLUMNS: Dict[str, pl.Expr] = {
+    "points": pl.col("pf"),
+    "points_allowed": pl.col("pa"),
+    "margin": pl.col("margin"),
+    "total": pl.col("pf") + pl.col("pa"),
+}
+
+MAX_SPAN = 5
+
+# Correlation tables kept at once (stats/max_players/min_games make each query its own entry)
+CORRELATION_CACHE_SIZE = 16
+
+
+def pairwise_corr(values: np.ndarray, min_games: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pearson correlation of every column pair over the games where both are present.
+
+    `values` is games x columns with NaN for missing games; all sums come from
+    matrix products of the zero-filled values and the presence mask. Returns
+    (correlations with NaN where fewer than `min_games` shared games or no
+    variance, shared game counts).
+    """
+    mask = ~np.isnan(values)
+    x = np.where(mask, values, 0.0)
+    m = mask.astype(np.float64)
+    n = m.T @ m
+    sx = x.T @ m          # sx[i, j]: sum of column i over games where j is present too
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    cov = n * sxy - sx * sx.T
+    var = (n * sxx - sx ** 2) * (n * sxx - sx ** 2).T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var)
+    corr[(n < min_games) | ~(var > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0), n.astype(np.int64)
+
+
+def build_team_matrix(
+    logs: pl.DataFrame,
+    results: pl.DataFrame,
+    stats: Optional[List[str]],
+    max_players: int,
+    min_games: int,
+) -> Optional[Dict[str, Any]]:
+    """Games x (player, stat) matrix of one team's logs plus the team's game columns.
+
+    Players are the `max_players` with the most PPR points among those with at
+    least `min_games` games; each gets `stats` or their group's DEFAULT_STATS.
+    """
+    if logs.is_empty() or results.is_empty():
+        return None
+    players = (
+        logs.filter(pl.col("position_group").is_in(list(DEFAULT_STATS)))
+        .group_by("player_id")
+        .agg([
+            pl.col("player_name").last(),
+            pl.col("position").last(),
+            pl.col("position_group").last(),
+            pl.len().alias("games"),
+            pl.col("fantasy_points_ppr").sum().alias("points"),
+        ])
+        .filter(pl.col("games") >= min_games)
+        .sort(["points", "player_id"], descending=[True, False])
+        .head(max_players)
+    )
+    if players.is_empty():
+        return None
+
+    games = results.select(["season", "week", "game_id"] + [expr.cast(pl.Float64).alias(f"team_{name}") for name, expr in TEAM_COLUMNS.items()])
+    columns: List[Dict[str, Any]] = [
+        {"key": f"team_{name}", "player_id": None, "name": "team", "position": None, "stat": name} for name in TEAM_COLUMNS
+    ]
+    keep = logs.join(players.select("player_id"), on="player_id")
+    for p in players.iter_rows(named=True):
+        for stat in stats or DEFAULT_STATS[p["position_group"]]:
+            columns.append({"key": f"{p['player_id']}:{stat}", "player_id": p["player_id"], "name": p["player_name"], "position": p["position"], "stat": stat})
+    wanted = sorted({c["stat"] for c in columns if c["player_id"]})
+    wide = keep.select(["season", "week", "player_id"] + wanted).unpivot(
+        index=["season", "week", "player_id"], on=wanted, variable_name="stat", value_name="value"
+    ).with_columns((pl.col("player_id") + ":" + pl.col("stat")).alias("key")).pivot(
+        on="key", index=["season", "week"], values="value"
+    )
+    matrix = games.join(wide, on=["season", "week"], how="left").sort(["season", "week"])
+    keys = [c["key"] for c in columns]
+    for key in keys:
+        if key not in matrix.columns:
+            matrix = matrix.with_columns(pl.lit(None, dtype=pl.Float64).alias(key))
+    values = np.ascontiguousarray(matrix.select([pl.col(k).cast(pl.Float64) for k in keys]).to_numpy(), dtype=np.float64)
+    corr, shared = pairwise_corr(values, min_games)
+    return {"columns": columns, "games": matrix.height, "corr": corr, "shared": shared}
+
+
+def load_team_correlations(
+    team: str, seasons: List[int], game_types: List[str], stats: Optional[List[str]], max_players: int, min_games: int
+) -> Optional[Dict[str, Any]]:
+    """A team's correlation matrix over `seasons`; the CORRELATION_CACHE_SIZE latest queries are cached (blocking)."""
+    seasons, types = sorted(seasons), tuple(sorted(game_types))
+    stats = list(dict.fromkeys(stats)) if stats else None
+
+    def _build() -> Optional[Dict[str, Any]]:
+        logs = game_logs(seasons)
+        if logs.is_empty():
+            return None
+        logs = logs.filter((pl.col("team") == team) & pl.col("season_type").is_in(types))
+        parts = [load_team_results(s) for s in seasons]
+        parts = [p for p in parts if not p.is_empty()]
+        if not parts:
+            return None
+        results = pl.concat(parts, how="vertical_relaxed").filter((pl.col("team") == team) & pl.col("season_type").is_in(types))
+        return build_team_matrix(logs, results, stats, max_players, min_games)
+
+    key = (team, tuple(seasons), types, tuple(stats or ()), max_players, min_games)
+    return get_or_build("team_correlations", key, tuple(data_version(s) for s in seasons), _build, limit=CORRELATION_CACHE_SIZE)
+
+
+def top_pairs(table: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """Strongest correlations between columns of different players (or a player and the team)."""
+    columns, corr, shared = table["columns"], table["corr"], table["shared"]
+    i, j = np.triu_indices(len(columns), k=1)
+    owner = np.array([c["player_id"] or "team" for c in columns], dtype=object)
+    keep = (owner[i] != owner[j]) & ~np.isnan(corr[i, j])
+    i, j = i[keep], j[keep]
+    order = np.argsort(-np.abs(corr[i, j]))[:limit]
+    return [
+        {"a": columns[a]["key"], "b": columns[b]["key"], "corr": round(float(corr[a, b]), 3), "games": int(shared[a, b])}
+        for a, b in zip(i[order].tolist(), j[order].tolist())
+    ]
+
+
+async def get_team_correlations_service(
+    team: str,
+    season: Optional[int] = None,
+    span: int = 2,
+    game_types: Optional[str] = None,
+    *,
+    stats: Optional[str] = None,
+    max_players: int = 6,
+    min_games: int = 5,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """Same-game correlations between a team's top players' stats and the team's score, over `span` seasons ending at `season`."""
+    team_abbr = (team or "").upper()
+    end = int(season) if season else int(nfl.get_current_season())
+    span = min(max(int(span or 1), 1), MAX_SPAN)
+    seasons = list(range(max(1999, end - span + 1), end + 1))
+    types = parse_game_types(game_types, "REG,POST")
+    stat_list = [s.strip().lower() for s in str(stats or "").split(",") if s.strip()] or None
+    unknown = [s for s in stat_list or [] if s not in PROP_STATS]
+    if unknown:
+        return {"status": "error", "message": f"Unknown stats: {', '.join(unknown)}", "stats": list(PROP_STATS)}
+
+    try:
+        table = await run_in_threadpool(load_team_correlations, team_abbr, seasons, types, stat_list, max_players, min_games)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to build correlations: {str(e)}", "team": team_abbr}
+
+    if table is None:
+        return {"status": "success", "team": team_abbr, "seasons": seasons, "games": 0, "columns": [], "matrix": [], "pairs": []}
+
+    corr = np.round(table["corr"], 3)
+    return {
+        "status": "success",
+        "team": team_abbr,
+        "seasons": seasons,
+        "game_types": types,
+        "games": table["games"],
+        "columns": table["columns"],
+        "matrix": [[None if np.isnan(v) else float(v) for v in row] for row in corr],
+        "shared_games": table["shared"].tolist(),
+        "pairs": top_pairs(table, limit),
+    }
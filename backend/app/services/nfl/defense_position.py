@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Optional
+
+import nflreadpy as nfl
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build, peek
+from app.services.nfl.fantasy import FANTASY_STAT, parse_scoring, profile_hash, profile_table, with_fantasy
+from app.services.nfl.player_gamelogs import load_game_logs
+from app.services.nfl.scoreboard import parse_game_types
+
+
+DVP_POSITIONS = ("QB", "RB", "WR", "TE")
+
+# Stats allowed to each position group (game-log columns)
+DVP_METRICS = (
+    "pass_yards", "pass_tds", "interceptions",
+    "rush_attempts", "rush_yards", "rush_tds",
+    "targets", "receptions", "rec_yards", "rec_tds",
+    "fantasy_points", "fantasy_points_ppr",
+)
+
+
+def _metrics(frame: pl.DataFrame) -> List[str]:
+    """DVP_METRICS plus points under the request's scoring profile when the table carries them."""
+    return [m for m in DVP_METRICS + (FANTASY_STAT,) if m in frame.columns]
+
+
+def build_dvp_weekly(logs: pl.DataFrame) -> pl.DataFrame:
+    """What each defense allowed to each position group in each game."""
+    if logs.is_empty() or "position_group" not in logs.columns:
+        return pl.DataFrame()
+    # The venue in the logs is the player's; the defense played on the other side
+    venue = pl.when(pl.col("venue") == "home").then(pl.lit("away")).when(pl.col("venue") == "away").then(pl.lit("home")).otherwise(pl.lit(None))
+    return (
+        logs.filter(pl.col("position_group").is_in(DVP_POSITIONS) & pl.col("opponent_team").is_not_null())
+        .group_by([pl.col("opponent_team").alias("defense"), "position_group", "season", "season_type", "week"])
+        .agg(
+            [pl.col("team").first().alias("opp"), venue.first().alias("venue"), pl.col("player_id").n_unique().alias("players")]
+            + [pl.col(m).sum().round(2) for m in _metrics(logs)]
+        )
+        .sort(["defense", "position_group", "season", "week"])
+    )
+
+
+def load_dvp_weekly(season: int, scoring: Optional[str] = None) -> pl.DataFrame:
+    """Season defense-vs-position table, refreshed from the cached game logs when the data version moves (blocking).
+    The `fantasy` column is scored with the `scoring` profile (see fantasy.parse_scoring);
+    custom profiles are kept in a small LRU (see fantasy.profile_table).
+
+    A refresh keeps the previous table's weeks before its latest one and only
+    rebuilds from that week on (it may have been partial), so a new week costs
+    one week of aggregation; corrections to older weeks wait for a restart.
+    """
+    season = int(season)
+    profile = parse_scoring(scoring)
+    table, limit = profile_table("dvp_weekly", profile)
+    key = (season, profile_hash(profile))
+
+    def _build() -> pl.DataFrame:
+        logs = load_game_logs(season)["frame"]
+        previous = peek(table, key)
+        if previous is None or previous.is_empty() or logs.is_empty():
+            return build_dvp_weekly(with_fantasy(logs, [season], profile))
+        since = previous["week"].max()
+        fresh = build_dvp_weekly(with_fantasy(logs.filter(pl.col("week") >= since), [season], profile))
+        return pl.concat([previous.filter(pl.col("week") < since), fresh], how="vertical_relaxed").sort(
+            ["defense", "position_group", "season", "week"]
+        )
+
+    return get_or_build(table, key, data_version(season), _build, limit=limit)
+
+
+def select_dvp(
+    weekly: pl.DataFrame,
+    game_types: Optional[str] = None,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+) -> pl.DataFrame:
+    """Filter the weekly table; `last_n` keeps each defense's most recent games."""
+    if weekly.is_empty():
+        return weekly
+    df = weekly.filter(pl.col("season_type").is_in(parse_game_types(game_types)))
+    if str(venue or "").lower() in ("home", "away"):
+        df = df.filter(pl.col("venue") == str(venue).lower())
+    if last_n and last_n > 0:
+        df = df.filter(pl.col("week").rank("dense", descending=True).over("defense") <= int(last_n))
+    return df
+
+
+def with_cumulative(weekly: pl.DataFrame) -> pl.DataFrame:
+    """Add running season totals (<metric>_cum) per defense and position group."""
+    if weekly.is_empty():
+        return weekly
+    return weekly.sort(["defense", "position_group", "week"]).with_columns(
+        [pl.col(m).cum_sum().over(["defense", "position_group"]).round(2).alias(f"{m}_cum") for m in _metrics(weekly)]
+    )
+
+
+def summarize_dvp(weekly: pl.DataFrame) -> pl.DataFrame:
+    """Totals, per-game averages and ranks per (defense, position group).
+
+    <metric>_rank is 1 for the defense allowing the least per game to that
+    position group (so 32 is the softest matchup).
+    """
+    if weekly.is_empty():
+        return pl.DataFrame()
+    # Per-game rates divide by every game the defense played, including weeks a group was shut out
+    metrics = _metrics(weekly)
+    games = weekly.group_by("defense").agg(pl.col("week").n_unique().alias("games"))
+    summary = weekly.group_by(["defense", "position_group"]).agg(
+        [pl.col(m).sum().round(2) for m in metrics]
+    ).join(games, on="defense").with_columns(
+        [(pl.col(m) / pl.col("games")).round(2).alias(f"{m}_per_game") for m in metrics]
+    )
+    return summary.with_columns(
+        [pl.col(f"{m}_per_game").rank("min").over("position_group").cast(pl.Int64).alias(f"{m}_rank") for m in metrics]
+    ).sort(["position_group", "fantasy_points_ppr_per_game"])
+
+
+def _positions(raw: Optional[str]) -> List[str]:
+    wanted = [p.strip().upper() for p in str(raw or "").split(",") if p.strip()]
+    return [p for p in wanted if p in DVP_POSITIONS] or list(DVP_POSITIONS)
+
+
+async def get_dvp_ranks_service(
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    *,
+    position: Optional[str] = None,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    scoring: Optional[str] = None,
+) -> Dict[str, Any]:
+    """What every defense allows to each position group, with league ranks."""
+    season_val = int(season) if season else int(nfl.get_current_season())
+    positions = _positions(position)
+
+    try:
+        weekly = await run_in_threadpool(load_dvp_weekly, season_val, scoring)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load defense-vs-position: {str(e)}", "season": season_val, "positions": {}}
+    summary = summarize_dvp(select_dvp(weekly, game_types, last_n=last_n, venue=venue))
+    out = {p: [] for p in positions}
+    if not summary.is_empty():
+        for p in positions:
+            out[p] = summary.filter(pl.col("position_group") == p).to_dicts()
+    return {"status": "success", "season": season_val, "scoring": scoring, "positions": out}
+
+
+async def get_team_dvp_service(
+    team: str,
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    *,
+    position: Optional[str] = None,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    include_weeks: bool = False,
+    scoring: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One defense's allowed stats by position group, ranked against the league (same filters for every team)."""
+    team_abbr = (team or "").upper()
+    season_val = int(season) if season else int(nfl.get_current_season())
+    positions = _positions(position)
+
+    try:
+        weekly = await run_in_threadpool(load_dvp_weekly, season_val, scoring)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load defense-vs-position: {str(e)}", "season": season_val, "team": team_abbr, "positions": {}}
+    selected = select_dvp(weekly, game_types, last_n=last_n, venue=venue)
+    summary = summarize_dvp(selected)
+    rows = {r["position_group"]: r for r in summary.filter(pl.col("defense") == team_abbr).to_dicts()} if not summary.is_empty() else {}
+    out: Dict[str, Any] = {
+        "status": "success",
+        "season": season_val,
+        "team": team_abbr,
+        "scoring": scoring,
+        "positions": {p: rows.get(p, {}) for p in positions},
+    }
+    if include_weeks:
+        mine = selected.filter((pl.col("defense") == team_abbr) & pl.col("position_group").is_in(positions)) if not selected.is_empty() else selected
+        out["weeks"] = with_cumulative(mine).to_dicts() if not mine.is_empty() else []
+    return out
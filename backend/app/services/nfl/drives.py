@@ -0,0 +1,223 @@
+from typing import Any, Dict, List, Optional, Tuple
+import nflreadpy as nfl
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.scoreboard import load_team_games, select_team_games
+
+
+# nflverse fixed_drive_result -> compact result code
+DRIVE_RESULTS: Dict[str, str] = {
+    'touchdown': 'TD',
+    'field goal': 'FG',
+    'punt': 'PUNT',
+    'turnover': 'TO',
+    'opp touchdown': 'TO',
+    'turnover on downs': 'DOWNS',
+    'missed field goal': 'MISSED_FG',
+    'end of half': 'END_HALF',
+    'safety': 'SAFETY',
+}
+
+# (metric, higher_is_better) from the offense's point of view
+DRIVE_METRICS: List[Tuple[str, bool]] = [
+    ('points_per_drive', True),
+    ('td_pct', True),
+    ('fg_pct', True),
+    ('score_pct', True),
+    ('punt_pct', False),
+    ('to_pct', False),
+    ('three_and_out_pct', False),
+    ('yards_per_drive', True),
+    ('plays_per_drive', True),
+    ('top_per_drive', True),
+    ('start_yardline_100', False),
+]
+
+
+def _first_col(cols, names) -> Optional[str]:
+    return next((c for c in names if c in cols), None)
+
+
+def _clock_seconds(col: str) -> pl.Expr:
+    """"3:25" -> 205 seconds."""
+    parts = pl.col(col).cast(pl.Utf8).str.split(':')
+    return (parts.list.get(0, null_on_oob=True).cast(pl.Int64, strict=False) * 60
+            + parts.list.get(1, null_on_oob=True).cast(pl.Int64, strict=False))
+
+
+def build_drives(pbp: pl.DataFrame) -> pl.DataFrame:
+    """One row per drive: who had it, where it started, what it produced."""
+    cols = set(pbp.columns)
+    drive_col = _first_col(cols, ('fixed_drive', 'drive'))
+    posteam_col = _first_col(cols, ('posteam', 'possession_team'))
+    defteam_col = _first_col(cols, ('defteam', 'def_team'))
+    if not ('game_id' in cols and drive_col and posteam_col):
+        return pl.DataFrame()
+
+    df = pbp.filter(pl.col(posteam_col).is_not_null() & pl.col(drive_col).is_not_null())
+    if 'play_id' in cols:
+        df = df.sort(['game_id', 'play_id'])
+
+    live = pl.lit(True)
+    if 'no_play' in cols:
+        live = live & (pl.col('no_play').fill_null(0).cast(pl.Int64) != 1)
+    scrimmage = live & pl.col('play_type').is_in(['pass', 'run']) if 'play_type' in cols else live
+
+    # Start = first snap of the drive (drive_play_number == 1), else its first scrimmage play
+    if 'yardline_100' not in cols:
+        start_expr = pl.lit(None, dtype=pl.Float64)
+    elif 'drive_play_number' in cols:
+        start_expr = pl.coalesce([
+            pl.col('yardline_100').filter(pl.col('drive_play_number') == 1).first(),
+            pl.col('yardline_100').filter(scrimmage).first(),
+        ])
+    else:
+        start_expr = pl.col('yardline_100').filter(scrimmage).first()
+
+    aggs: List[pl.Expr] = [
+        pl.col(posteam_col).first().alias('team'),
+        (pl.col(defteam_col).first() if defteam_col else pl.lit(None, dtype=pl.Utf8)).alias('opp'),
+        (pl.col('season_type').first() if 'season_type' in cols else pl.lit('REG')).alias('season_type'),
+        (pl.col('qtr').first() if 'qtr' in cols else pl.lit(None, dtype=pl.Int64)).alias('qtr'),
+        start_expr.alias('start_yardline_100'),
+        (pl.col('drive_play_count').first() if 'drive_play_count' in cols else scrimmage.sum()).cast(pl.Int64).alias('plays'),
+        (pl.col('yards_gained').filter(scrimmage).sum() if 'yards_gained' in cols else pl.lit(None, dtype=pl.Float64)).alias('yards'),
+        (_clock_seconds('drive_time_of_possession').first() if 'drive_time_of_possession' in cols else pl.lit(None, dtype=pl.Int64)).alias('top_seconds'),
+        (pl.col('drive_first_downs').first() if 'drive_first_downs' in cols else pl.lit(None, dtype=pl.Int64)).cast(pl.Int64).alias('first_downs'),
+        (pl.col('fixed_drive_result').first() if 'fixed_drive_result' in cols else pl.lit(None, dtype=pl.Utf8)).alias('raw_result'),
+    ]
+    if 'posteam_score_post' in cols and 'posteam_score' in cols:
+        aggs.append((pl.col('posteam_score_post').max() - pl.col('posteam_score').drop_nulls().first()).alias('points'))
+    else:
+        aggs.append(pl.lit(None, dtype=pl.Float64).alias('points'))
+
+    drives = df.group_by(['game_id', drive_col], maintain_order=True).agg(aggs).rename({drive_col: 'drive'})
+    result = pl.col('raw_result').str.to_lowercase().replace_strict(DRIVE_RESULTS, default='OTHER')
+    drives = drives.with_columns([
+        result.alias('result'),
+        pl.col('points').fill_null(0).clip(lower_bound=0).cast(pl.Int64).alias('points'),
+    ]).with_columns([
+        ((pl.col('result') == 'PUNT') & pl.when(pl.col('first_downs').is_not_null())
+            .then(pl.col('first_downs') == 0).otherwise(pl.col('plays') <= 3)).alias('three_and_out'),
+    ])
+    return drives.drop('raw_result').sort(['game_id', 'drive'])
+
+
+def load_drives(season: int) -> pl.DataFrame:
+    """Season drive table, built once per data version from PBP (blocking)."""
+    season = int(season)
+    return get_or_build('drives', season, data_version(season), lambda: build_drives(nfl.load_pbp([season])))
+
+
+def summarize_drives(drives: pl.DataFrame, by: str = 'team') -> pl.DataFrame:
+    """Per-drive rates grouped by `by` ('team' for offense, 'opp' for defense)."""
+    if drives.is_empty():
+        return pl.DataFrame()
+    n = pl.len()
+    return drives.group_by(by).agg([
+        n.alias('drives'),
+        pl.col('game_id').n_unique().alias('games'),
+        pl.col('points').sum().alias('points'),
+        (pl.col('points').sum() / n).round(2).alias('points_per_drive'),
+        ((pl.col('result') == 'TD').sum() / n * 100).round(1).alias('td_pct'),
+        ((pl.col('result') == 'FG').sum() / n * 100).round(1).alias('fg_pct'),
+        ((pl.col('points') > 0).sum() / n * 100).round(1).alias('score_pct'),
+        ((pl.col('result') == 'PUNT').sum() / n * 100).round(1).alias('punt_pct'),
+        ((pl.col('result') == 'TO').sum() / n * 100).round(1).alias('to_pct'),
+        (pl.col('three_and_out').sum() / n * 100).round(1).alias('three_and_out_pct'),
+        pl.col('yards').mean().round(1).alias('yards_per_drive'),
+        pl.col('plays').mean().round(1).alias('plays_per_drive'),
+        pl.col('top_seconds').mean().round(0).alias('top_per_drive'),
+        pl.col('start_yardline_100').mean().round(1).alias('start_yardline_100'),
+    ]).rename({by: 'team'})
+
+
+def rank_drive_metrics(summary: pl.DataFrame, side: str = 'offense') -> pl.DataFrame:
+    """Add <metric>_rank columns (1 = best for `side`)."""
+    if summary.is_empty():
+        return summary
+    ranks = []
+    for metric, higher_better in DRIVE_METRICS:
+        if side == 'defense':
+            higher_better = not higher_better
+        ranks.append(pl.col(metric).rank(method='min', descending=higher_better).cast(pl.Int64).alias(f'{metric}_rank'))
+    return summary.with_columns(ranks)
+
+
+def _select_drives(
+    drives: pl.DataFrame,
+    team_games: pl.DataFrame,
+    side: str,
+    game_types: Optional[str],
+    last_n: Optional[int],
+    venue: Optional[str],
+    opponent_conf: Optional[str],
+    opponent_div: Optional[str],
+) -> pl.DataFrame:
+    """Drives of the (team, game) pairs that pass the usual filters, for every team."""
+    games = select_team_games(
+        team_games, None, game_types, last_n=last_n, venue=venue,
+        opponent_conf=opponent_conf, opponent_div=opponent_div,
+    ).select(['game_id', 'team'])
+    key = 'team' if side == 'offense' else 'opp'
+    return drives.join(games.rename({'team': key}), on=['game_id', key], how='semi')
+
+
+async def get_drive_ranks_service(
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    *,
+    side: Optional[str] = None,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent_conf: Optional[str] = None,
+    opponent_div: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Drive metrics for every team with league ranks, served from the drive table."""
+    season_val = int(season) if season else int(nfl.get_current_season())
+    side_val = 'defense' if str(side or '').lower() == 'defense' else 'offense'
+
+    drives, team_games = await run_in_threadpool(lambda: (load_drives(season_val), load_team_games(season_val)))
+    if drives.is_empty() or team_games.is_empty():
+        return {"status": "success", "season": season_val, "side": side_val, "teams": []}
+
+    sel = _select_drives(drives, team_games, side_val, game_types, last_n, venue, opponent_conf, opponent_div)
+    summary = rank_drive_metrics(summarize_drives(sel, 'team' if side_val == 'offense' else 'opp'), side_val)
+    teams = summary.sort('points_per_drive_rank').to_dicts() if not summary.is_empty() else []
+    return {"status": "success", "season": season_val, "side": side_val, "teams": teams}
+
+
+async def get_team_drives_service(
+    team: str,
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    *,
+    side: Optional[str] = None,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent_conf: Optional[str] = None,
+    opponent_div: Optional[str] = None,
+    include_drives: bool = False,
+) -> Dict[str, Any]:
+    """One team's drive metrics and league ranks (same filters applied to every team)."""
+    team_abbr = (team or '').upper()
+    league = await get_drive_ranks_service(
+        season, game_types, side=side, last_n=last_n, venue=venue,
+        opponent_conf=opponent_conf, opponent_div=opponent_div,
+    )
+    row = next((r for r in league["teams"] if r["team"] == team_abbr), None)
+    out: Dict[str, Any] = {
+        "status": "success",
+        "season": league["season"],
+        "team": team_abbr,
+        "side": league["side"],
+        "metrics": row or {},
+    }
+    if include_drives:
+        drives, team_games = await run_in_threadpool(lambda: (load_drives(league["season"]), load_team_games(league["season"])))
+        sel = _select_drives(drives, team_games, league["side"], game_types, last_n, venue, opponent_conf, opponent_div)
+        key = 'team' if league["side"] == 'offense' else 'opp'
+        out["drives"] = sel.filter(pl.col(key) == team_abbr).to_dicts()
+    return out
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import season_frame
+
+
+# Points per unit of each weekly player-stats column ("standard" reproduces nflverse fantasy_points)
+STANDARD_SCORING: Dict[str, float] = {
+    "passing_yards": 0.04,
+    "passing_tds": 4,
+    "passing_interceptions": -2,
+    "passing_2pt_conversions": 2,
+    "rushing_yards": 0.1,
+    "rushing_tds": 6,
+    "rushing_2pt_conversions": 2,
+    "receptions": 0,
+    "receiving_yards": 0.1,
+    "receiving_tds": 6,
+    "receiving_2pt_conversions": 2,
+    "special_teams_tds": 6,
+    "sack_fumbles_lost": -2,
+    "rushing_fumbles_lost": -2,
+    "receiving_fumbles_lost": -2,
+}
+
+SCORING_PRESETS: Dict[str, Dict[str, float]] = {
+    "standard": STANDARD_SCORING,
+    "half_ppr": {**STANDARD_SCORING, "receptions": 0.5},
+    "ppr": {**STANDARD_SCORING, "receptions": 1},
+}
+DEFAULT_PRESET = "ppr"
+
+# Prop/metric name of points under the request's scoring profile
+FANTASY_STAT = "fantasy"
+
+# Custom (non-preset) profiles cached per table at once
+CUSTOM_PROFILE_CACHE_SIZE = 8
+
+
+def parse_scoring(raw: Optional[str]) -> Dict[str, float]:
+    """Scoring profile from a `scoring=` value: a preset name, optionally followed by overrides.
+
+    e.g. "half_ppr", "ppr;passing_tds=6", "standard;receptions=0.25;fg_made=3".
+    Overrides may name any numeric weekly player-stats column; unknown presets
+    fall back to DEFAULT_PRESET.
+    """
+    parts = [p.strip() for p in str(raw or "").split(";") if p.strip()]
+    preset = DEFAULT_PRESET
+    if parts and "=" not in parts[0]:
+        preset = parts.pop(0).lower().replace("-", "_")
+    profile = dict(SCORING_PRESETS.get(preset, SCORING_PRESETS[DEFAULT_PRESET]))
+    for part in parts:
+        column, _, value = part.partition("=")
+        try:
+            profile[column.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return profile
+
+
+def profile_hash(profile: Dict[str, float]) -> str:
+    """Stable short key of a profile (zero weights ignored), for caching."""
+    canonical = json.dumps({k: float(v) for k, v in sorted(profile.items()) if v}, sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+_PRESET_HASHES = frozenset(profile_hash(p) for p in SCORING_PRESETS.values())
+
+
+def is_preset(profile: Dict[str, float]) -> bool:
+    """True for the SCORING_PRESETS profiles."""
+    return profile_hash(profile) in _PRESET_HASHES
+
+
+def profile_table(name: str, profile: Dict[str, float]) -> Tuple[str, Optional[int]]:
+    """Cache table and size limit for tables scored under `profile`.
+
+    Presets are always kept; custom profiles share a `<name>_custom` table
+    holding the CUSTOM_PROFILE_CACHE_SIZE most recently used ones.
+    """
+    if is_preset(profile):
+        return name, None
+    return f"{name}_custom", CUSTOM_PROFILE_CACHE_SIZE
+
+
+def fantasy_expr(profile: Dict[str, float], schema: pl.Schema) -> pl.Expr:
+    """Points of one player-week as a single expression; profile columns missing from `schema` are skipped."""
+    terms = [
+        pl.col(column).cast(pl.Float64).fill_null(0) * float(points)
+        for column, points in profile.items()
+        if points and column in schema and schema[column].is_numeric()
+    ]
+    return pl.sum_horizontal(terms).round(2) if terms else pl.lit(0.0)
+
+
+def load_fantasy_points(season: int, profile: Dict[str, float]) -> pl.DataFrame:
+    """Fantasy points of every player-week of a season under `profile`, cached per profile hash and data version (blocking)."""
+    season = int(season)
+
+    def _build() -> pl.DataFrame:
+        frame = season_frame(season)
+        if frame.is_empty():
+            return pl.DataFrame(schema={"player_id": pl.Utf8, "season": pl.Int64, "week": pl.Int64, "fantasy": pl.Float64})
+        return frame.select(["player_id", "season", "week", fantasy_expr(profile, frame.schema).alias("fantasy")])
+
+    table, limit = profile_table("fantasy_points", profile)
+    return get_or_build(table, (season, profile_hash(profile)), data_version(season), _build, limit=limit)
+
+
+def with_fantasy(logs: pl.DataFrame, seasons: List[int], profile: Dict[str, float]) -> pl.DataFrame:
+    """Add a `fantasy` column to any player-week frame (player_id/season/week) under `profile` (blocking)."""
+    if logs.is_empty():
+        return logs.with_columns(pl.lit(None, dtype=pl.Float64).alias("fantasy"))
+    points = pl.concat([load_fantasy_points(s, profile) for s in seasons], how="vertical_relaxed").with_columns(
+        pl.col("season").cast(logs.schema["season"]), pl.col("week").cast(logs.schema["week"])
+    )
+    return logs.drop("fantasy", strict=False).join(points, on=["player_id", "season", "week"], how="left")
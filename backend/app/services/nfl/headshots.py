@@ -1,70 +1,122 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import nflreadpy as nfl
 from starlette.concurrency import run_in_threadpool
 import polars as pl
-import re
 
-
-def _normalize_query(q: str) -> str:
-  return re.sub(r"\s+", " ", q.strip()).lower()
+from app.services.nfl.player_registry import espn_headshots, load_player_registry, registry_find, registry_lookup
+from app.services.nfl.player_resolve import is_player_id, normalize_name
 
 
 async def resolve_headshot_service(q: str, season: Optional[int] = None) -> dict:
   """
-  Very simple resolver: tries to find a player's ESPN ID from rosters
-  and returns an ESPN headshot URL. This is a lightweight MVP, not fuzzy.
+  Resolve a player's ESPN ID from the player registry (rosters joined with
+  player stats) and return ESPN headshot URLs. Exact name first, then the
+  first registry player whose name contains the query.
   """
   current = nfl.get_current_season()
   year = int(season) if season else int(current)
 
-  def _load_rosters():
-    # nflreadpy exposes roster via load_rosters in newer versions; fallback to schedules players via pbp if needed
-    try:
-      return nfl.load_rosters([year])
-    except Exception:
-      return pl.DataFrame([])
-
-  rosters = await run_in_threadpool(_load_rosters)
-  if rosters is None or rosters.height == 0:
+  try:
+    registry = await run_in_threadpool(load_player_registry, year)
+  except Exception:
+    registry = None
+  if not registry or not registry["by_espn"]:
     return {"status": "not_found", "message": "rosters unavailable", "query": q}
 
-  norm = _normalize_query(q)
-  name_col = "full_name" if "full_name" in rosters.columns else ("player_name" if "player_name" in rosters.columns else None)
-  espn_col = "espn_id" if "espn_id" in rosters.columns else None
-
-  if not name_col or not espn_col:
-    return {"status": "not_found", "message": "columns not available", "query": q}
+  row = next((m for m in registry_find(registry, q) if m.get("espn_id")), None)
+  if row is None:
+    norm = normalize_name(q)
+    if not norm:
+      return {"status": "not_found", "query": q}
+    hits = registry["frame"].filter(
+      pl.col("espn_id").is_not_null() & pl.col("name_norm").str.contains(norm, literal=True)
+    ).head(1)
+    row = hits.row(0, named=True) if hits.height else None
 
-  df = rosters.with_columns(
-    pl.col(name_col)
-      .cast(pl.Utf8)
-      .str.replace(r"^\s+|\s+$", "", literal=False)
-      .alias("_name")
-  )
-  df = df.filter(pl.col("_name").str.to_lowercase().str.contains(re.escape(norm)))
-
-  if df.height == 0:
+  if row is None:
     return {"status": "not_found", "query": q}
 
-  # take first match
-  row = df.select(["_name", espn_col]).head(1).to_dicts()[0]
-  espn_id = str(row.get(espn_col)) if row.get(espn_col) is not None else None
-
-  if not espn_id or espn_id in ("None", "nan"):
+  urls = espn_headshots(row.get("espn_id"))
+  if not urls["headshot_url"]:
     return {"status": "not_found", "query": q}
 
-  headshot = f"https://a.espncdn.com/i/headshots/nfl/players/full/{espn_id}.png"
-  thumb = f"https://a.espncdn.com/combiner/i?img=/i/headshots/nfl/players/full/{espn_id}.png&w=96&h=96"
   return {
     "status": "success",
     "query": q,
     "season": year,
     "match": {
-      "name": row.get("_name"),
-      "espn_id": espn_id,
-      "headshot_url": headshot,
-      "thumbnail_url": thumb,
+      "name": row.get("full_name") or row.get("name"),
+      "espn_id": row.get("espn_id"),
+      "player_id": row.get("player_id"),
+      "headshot_url": urls["headshot_url"],
+      "thumbnail_url": urls["thumbnail_url"],
     },
   }
 
 
+def _headshot_match(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  urls = espn_headshots(row.get("espn_id"))
+  if not urls["headshot_url"] and row.get("headshot_url"):
+    urls = {"headshot_url": row["headshot_url"], "thumbnail_url": row["headshot_url"]}
+  if not urls["headshot_url"]:
+    return None
+  return {
+    "name": row.get("full_name") or row.get("name"),
+    "espn_id": row.get("espn_id"),
+    "player_id": row.get("player_id"),
+    "headshot_url": urls["headshot_url"],
+    "thumbnail_url": urls["thumbnail_url"],
+  }
+
+
+def resolve_headshots(registry: Dict[str, Any], queries: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+  """
+  Resolve many names/gsis ids against the registry in one join: ids by
+  player_id, names by normalised key (players with an ESPN id first), then
+  one vectorised name-contains pass for whatever is left.
+  """
+  frame = registry["frame"]
+  queries = list(dict.fromkeys(q for q in queries if q and q.strip()))
+  out: Dict[str, Optional[Dict[str, Any]]] = {q: None for q in queries}
+  if frame.is_empty() or not queries:
+    return out
+
+  hits = registry_lookup(registry, queries, prefer_espn=True)
+  for row in hits.iter_rows(named=True):
+    out[row["query"]] = _headshot_match(row)
+
+  # Partial names ("mahomes", "jamarr chase"): first registry player containing them, for all leftovers in one cross join
+  pending = [(q, normalize_name(q)) for q, m in out.items() if m is None and not is_player_id(q)]
+  pending = [(q, norm) for q, norm in pending if len(norm) >= 2]
+  if pending:
+    partial = (
+      pl.DataFrame({"query": [q for q, _ in pending], "norm": [n for _, n in pending]}).lazy()
+      .join(frame.lazy().filter(pl.col("espn_id").is_not_null()).with_row_index("rank"), how="cross")
+      .filter(pl.col("name_norm").str.contains(pl.col("norm"), literal=True))
+      .sort("rank")
+      .group_by("query", maintain_order=True)
+      .first()
+      .collect()
+    )
+    for row in partial.iter_rows(named=True):
+      out[row["query"]] = _headshot_match(row)
+  return out
+
+
+async def resolve_headshots_service(queries: List[str], season: Optional[int] = None) -> dict:
+  """Batch form of resolve_headshot_service: query -> match (or None) for every name or id."""
+  year = int(season) if season else int(nfl.get_current_season())
+  try:
+    registry = await run_in_threadpool(load_player_registry, year)
+  except Exception:
+    registry = None
+  if not registry or registry["frame"].is_empty():
+    return {"status": "not_found", "message": "rosters unavailable", "season": year, "results": {}}
+
+  results = await run_in_threadpool(resolve_headshots, registry, queries)
+  return {
+    "status": "success",
+    "season": year,
+    "count": sum(1 for m in results.values() if m),
+    "results": results,
+  }
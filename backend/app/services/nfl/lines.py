@@ -0,0 +1,193 @@
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import polars as pl
+
+
+# Markets understood by `lines=` and the lines used when none are given.
+# Point markets keep the historical integer keys ("17" = 17 or more).
+DEFAULT_LINES: Dict[str, List[float]] = {
+    'game': [17, 20, 23, 24, 27, 30],
+    'h1': [3, 6, 7, 10, 13, 17],
+    'h2': [3, 6, 7, 10, 13, 17],
+    'q1': [3, 7, 10],
+    'q2': [3, 7, 10],
+    'q3': [3, 7, 10],
+    'q4': [3, 7, 10],
+    'margin': [3, 4, 6, 7, 10, 13],
+    'fg': [1.5, 2.5],
+    'fg_h1': [0.5, 1.5],
+    'fg_h2': [0.5, 1.5],
+}
+AT_LEAST_MARKETS = {'game', 'h1', 'h2', 'q1', 'q2', 'q3', 'q4'}
+# Team-games column behind each market when it is not the market name itself
+MARKET_COLUMNS: Dict[str, str] = {'game': 'final', 'fg': 'fgm', 'fg_h1': 'fgm_h1', 'fg_h2': 'fgm_h2'}
+
+
+def line_key(line: float) -> str:
+    """23.0 -> "23", 23.5 -> "23.5" (matches the keys the API has always used)."""
+    f = float(line)
+    return str(int(f)) if f.is_integer() else str(f)
+
+
+def parse_numbers(raw: str) -> List[float]:
+    out: List[float] = []
+    for part in raw.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            out.append(float(part))
+        except ValueError:
+            continue
+    return sorted(set(out))
+
+
+def parse_lines(raw: Optional[str], default_market: str = 'game') -> Dict[str, List[float]]:
+    """Parse a `lines=` query value.
+
+    Accepts a bare list ("23.5,27") for `default_market`, or market groups separated
+    by semicolons ("game:23.5,27;h1:10.5;fg:1.5"). Unknown markets are ignored.
+    """
+    if not raw or not raw.strip():
+        return {}
+    out: Dict[str, List[float]] = {}
+    for group in raw.split(';'):
+        group = group.strip()
+        if not group:
+            continue
+        market, _, values = group.rpartition(':')
+        market = (market or default_market).strip().lower()
+        if market not in DEFAULT_LINES:
+            continue
+        nums = parse_numbers(values)
+        if nums:
+            out[market] = nums
+    return out
+
+
+def _sorted_values(values: Iterable[Any]) -> np.ndarray:
+    if isinstance(values, pl.Series):
+        arr = values.drop_nulls().cast(pl.Float64).to_numpy()
+    else:
+        arr = np.asarray(values, dtype=np.float64)
+    return np.sort(arr[~np.isnan(arr)])
+
+
+def count_lines(values: Iterable[Any], lines: List[float], *, at_least: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Over/under/push counts and hit rate for every line in one sorted pass.
+
+    With `at_least`, integer lines read as "N or more" (over = v >= N, no pushes),
+    which is how the default point lines have always been reported.
+    """
+    arr = _sorted_values(values)
+    n = int(arr.size)
+    if not lines:
+        return {}
+    edges = np.asarray(lines, dtype=np.float64)
+    if at_least:
+        edges = np.where(np.mod(edges, 1) == 0, edges - 0.5, edges)
+    below = np.searchsorted(arr, edges, side='left')
+    at_or_below = np.searchsorted(arr, edges, side='right')
+    out: Dict[str, Dict[str, Any]] = {}
+    for line, lo, hi in zip(lines, below.tolist(), at_or_below.tolist()):
+        over, under, push = n - hi, lo, hi - lo
+        decided = over + under
+        out[line_key(line)] = {
+            "over": over,
+            "under": under,
+            "push": push,
+            "hit_rate": round(over / decided, 3) if decided else None,
+        }
+    return out
+
+
+def count_margin_lines(values: Iterable[Any], lines: List[float]) -> Dict[str, Dict[str, Any]]:
+    """Games won by at least `line` and lost by at least `line`, for every line at once."""
+    arr = _sorted_values(values)
+    n = int(arr.size)
+    if not lines:
+        return {}
+    edges = np.asarray(lines, dtype=np.float64)
+    win_by = n - np.searchsorted(arr, edges, side='left')
+    lose_by = np.searchsorted(arr, -edges, side='right')
+    out: Dict[str, Dict[str, Any]] = {}
+    for line, wb, lb in zip(lines, win_by.tolist(), lose_by.tolist()):
+        out[line_key(line)] = {
+            "win_by": int(wb),
+            "lose_by": int(lb),
+            "win_by_rate": round(wb / n, 3) if n else None,
+            "lose_by_rate": round(lb / n, 3) if n else None,
+        }
+    return out
+
+
+def count_markets(per_game: pl.DataFrame, lines: Optional[Dict[str, List[float]]] = None) -> Dict[str, Dict[str, Any]]:
+    """Counts for every market of a team-games frame, using `lines` over the defaults."""
+    lines = lines or {}
+    out: Dict[str, Dict[str, Any]] = {}
+    for market, default in DEFAULT_LINES.items():
+        column = MARKET_COLUMNS.get(market, market)
+        if column not in per_game.columns:
+            out[market] = {}
+            continue
+        series = per_game[column]
+        if series.null_count() == series.len() and series.len() > 0:
+            out[market] = {}
+            continue
+        chosen = lines.get(market, default)
+        if market == 'margin':
+            out[market] = count_margin_lines(series, chosen)
+        else:
+            at_least = market in AT_LEAST_MARKETS and market not in lines
+            out[market] = count_lines(series, chosen, at_least=at_least)
+    return out
+
+
+def market_count_exprs(lines: Optional[Dict[str, List[float]]] = None) -> List[pl.Expr]:
+    """Aggregation expressions for every market/line, for use inside a group_by.
+
+    Columns are named "<market>:<line>:<stat>" plus "<market>:n" for the number of
+    games with a value; `nest_market_counts` turns a result row back into the
+    same nested shape `count_markets` returns.
+    """
+    lines = lines or {}
+    exprs: List[pl.Expr] = []
+    for market, default in DEFAULT_LINES.items():
+        value = pl.col(MARKET_COLUMNS.get(market, market))
+        exprs.append(value.is_not_null().sum().alias(f'{market}:n'))
+        at_least = market in AT_LEAST_MARKETS and market not in lines
+        for line in lines.get(market, default):
+            key = f'{market}:{line_key(line)}'
+            if market == 'margin':
+                exprs.append((value >= line).sum().alias(f'{key}:win_by'))
+                exprs.append((value <= -line).sum().alias(f'{key}:lose_by'))
+                continue
+            edge = line - 0.5 if at_least and float(line).is_integer() else line
+            exprs.append((value > edge).sum().alias(f'{key}:over'))
+            exprs.append((value < edge).sum().alias(f'{key}:under'))
+            exprs.append((value == edge).sum().alias(f'{key}:push'))
+    return exprs
+
+
+def nest_market_counts(row: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Rebuild {market: {line: {...}}} from one row of `market_count_exprs` output."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, value in row.items():
+        parts = name.split(':')
+        if len(parts) != 3:
+            continue
+        market, key, stat = parts
+        out.setdefault(market, {}).setdefault(key, {})[stat] = int(value or 0)
+    for market, by_line in out.items():
+        n = int(row.get(f'{market}:n') or 0)
+        if not n:
+            out[market] = {}
+            continue
+        for entry in by_line.values():
+            if market == 'margin':
+                entry["win_by_rate"] = round(entry["win_by"] / n, 3)
+                entry["lose_by_rate"] = round(entry["lose_by"] / n, 3)
+            else:
+                decided = entry["over"] + entry["under"]
+                entry["hit_rate"] = round(entry["over"] / decided, 3) if decided else None
+    return out
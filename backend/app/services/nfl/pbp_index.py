@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional
+
+import nflreadpy as nfl
+import numpy as np
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+
+
+# Role -> (player id column, player name column) in PBP
+PBP_ROLES = {
+    "passer": ("passer_player_id", "passer_player_name"),
+    "rusher": ("rusher_player_id", "rusher_player_name"),
+    "receiver": ("receiver_player_id", "receiver_player_name"),
+}
+
+# PBP columns kept for player play lists and the aggregates built on them
+PLAY_COLS = (
+    "game_id", "play_id", "season", "season_type", "game_type", "week", "posteam", "defteam",
+    "passer_player_id", "passer_player_name", "rusher_player_id", "rusher_player_name",
+    "receiver_player_id", "receiver_player_name",
+    "play_type", "yards_gained", "pass", "rush", "complete_pass", "interception", "sack",
+    "touchdown", "pass_touchdown", "rush_touchdown", "passing_yards", "rushing_yards", "receiving_yards", "air_yards",
+)
+
+
+def build_pbp_index(pbp: pl.DataFrame) -> Dict[str, Any]:
+    """Trimmed season PBP plus, per role, player_id -> row offsets into it.
+
+    `names` has one row per (role, player_id, name) with its play count, so
+    name lookups and searches scan a few thousand names instead of every play.
+    """
+    if pbp.is_empty():
+        return {"frame": pbp, "offsets": {}, "names": pl.DataFrame()}
+    frame = pbp.select([c for c in PLAY_COLS if c in pbp.columns])
+    if "play_id" in frame.columns:
+        frame = frame.sort(["game_id", "play_id"])
+    rows = frame.with_row_index("row")
+
+    offsets: Dict[str, Dict[str, np.ndarray]] = {}
+    names = []
+    for role, (id_col, name_col) in PBP_ROLES.items():
+        if id_col not in frame.columns:
+            continue
+        plays = rows.filter(pl.col(id_col).is_not_null())
+        grouped = plays.group_by(id_col).agg(pl.col("row"))
+        offsets[role] = {pid: np.asarray(r, dtype=np.int64) for pid, r in grouped.iter_rows()}
+        if name_col in frame.columns:
+            names.append(
+                plays.filter(pl.col(name_col).is_not_null())
+                .group_by([id_col, name_col])
+                .agg(pl.len().alias("rows"))
+                .select([
+                    pl.lit(role).alias("role"),
+                    pl.col(id_col).alias("player_id"),
+                    pl.col(name_col).alias("name"),
+                    pl.col(name_col).str.strip_chars().str.to_lowercase().alias("name_lower"),
+                    "rows",
+                ])
+            )
+    return {
+        "frame": frame,
+        "offsets": offsets,
+        "names": pl.concat(names, how="vertical_relaxed") if names else pl.DataFrame(),
+    }
+
+
+def load_pbp_index(season: int) -> Dict[str, Any]:
+    """Season PBP player index, built when the season's PBP is loaded, once per data version (blocking)."""
+    season = int(season)
+    return get_or_build("pbp_index", season, data_version(season), lambda: build_pbp_index(nfl.load_pbp([season])))
+
+
+def pbp_player_ids(seasons: List[int], name: str) -> List[str]:
+    """player_ids whose PBP name equals `name` (case-insensitive), most plays first (blocking)."""
+    key = (name or "").strip().lower()
+    parts = [load_pbp_index(s)["names"] for s in seasons]
+    parts = [p.filter(pl.col("name_lower") == key) for p in parts if not p.is_empty()]
+    parts = [p for p in parts if not p.is_empty()]
+    if not parts:
+        return []
+    found = pl.concat(parts).group_by("player_id").agg(pl.col("rows").sum()).sort(["rows", "player_id"], descending=[True, False])
+    return found["player_id"].to_list()
+
+
+def player_plays(
+    seasons: List[int],
+    player_ids: List[str],
+    role: str,
+    game_types: Optional[List[str]] = None,
+) -> pl.DataFrame:
+    """Plays where any of `player_ids` was the passer, rusher or receiver, gathered by offset (blocking)."""
+    parts = []
+    for season in seasons:
+        index = load_pbp_index(season)
+        by_player = index["offsets"].get(role, {})
+        hits = [by_player[pid] for pid in player_ids if pid in by_player]
+        if hits:
+            parts.append(index["frame"][np.sort(np.concatenate(hits))])
+    if not parts:
+        return pl.DataFrame()
+    plays = pl.concat(parts, how="diagonal_relaxed")
+    if game_types:
+        type_col = "season_type" if "season_type" in plays.columns else "game_type" if "game_type" in plays.columns else None
+        if type_col:
+            plays = plays.filter(pl.col(type_col).is_in(game_types))
+    return plays
+
+
+def search_pbp_names(seasons: List[int], query: str, game_types: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """PBP player names containing `query` (case-insensitive) with their play counts across roles (blocking).
+
+    Counts come from the index and cover every game type; `game_types` only
+    narrows them when given by recounting the matched players' plays.
+    """
+    needle = (query or "").strip().lower()
+    parts = [load_pbp_index(s)["names"] for s in seasons]
+    parts = [p.filter(pl.col("name_lower").str.contains(needle, literal=True)) for p in parts if not p.is_empty()]
+    parts = [p for p in parts if not p.is_empty()]
+    if not parts:
+        return []
+    matched = pl.concat(parts)
+    if game_types:
+        counts = []
+        for role in PBP_ROLES:
+            ids = matched.filter(pl.col("role") == role)["player_id"].unique().to_list()
+            plays = player_plays(seasons, ids, role, game_types)
+            if not plays.is_empty():
+                id_col, name_col = PBP_ROLES[role]
+                counts.append(plays.group_by(pl.col(name_col).alias("name")).agg(pl.len().alias("rows")))
+        matched = pl.concat(counts) if counts else pl.DataFrame(schema={"name": pl.Utf8, "rows": pl.UInt32})
+        matched = matched.filter(pl.col("name").str.to_lowercase().str.contains(needle, literal=True))
+    totals = matched.with_columns(pl.col("name").str.strip_chars()).filter(pl.col("name") != "").group_by("name").agg(pl.col("rows").sum().alias("count"))
+    return totals.sort(["count", "name"], descending=[True, False]).head(limit).to_dicts()
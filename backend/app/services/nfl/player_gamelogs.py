@@ -0,0 +1,201 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import row_spans, season_frame
+from app.services.nfl.splits import load_team_results
+
+
+# Prop stats -> weekly player-stats columns summed into them
+PROP_STATS: Dict[str, Tuple[str, ...]] = {
+    "pass_yards": ("passing_yards",),
+    "pass_tds": ("passing_tds",),
+    "pass_attempts": ("attempts",),
+    "completions": ("completions",),
+    "interceptions": ("passing_interceptions",),
+    "rush_yards": ("rushing_yards",),
+    "rush_attempts": ("carries",),
+    "rush_tds": ("rushing_tds",),
+    "receptions": ("receptions",),
+    "targets": ("targets",),
+    "rec_yards": ("receiving_yards",),
+    "rec_tds": ("receiving_tds",),
+    "rush_rec_yards": ("rushing_yards", "receiving_yards"),
+    "pass_rush_yards": ("passing_yards", "rushing_yards"),
+    "tds": ("rushing_tds", "receiving_tds"),
+    "tackles": ("def_tackles_solo", "def_tackles_with_assist"),
+    "sacks": ("def_sacks",),
+    "fg_made": ("fg_made",),
+    "pat_made": ("pat_made",),
+    "fantasy_points": ("fantasy_points",),
+    "fantasy_points_ppr": ("fantasy_points_ppr",),
+}
+
+LOG_INFO = ("player_display_name", "position", "position_group", "team", "opponent_team", "season", "week", "season_type")
+
+
+def build_game_logs(frame: pl.DataFrame, results: pl.DataFrame) -> Dict[str, Any]:
+    """One row per player per game with every prop stat and the game's venue.
+
+    `frame` is sorted by player_id/season/week so a player's games are
+    contiguous, and `index` maps player_id -> (offset, length) into it.
+    """
+    if frame.is_empty() or "player_id" not in frame.columns:
+        return {"frame": pl.DataFrame(), "index": {}}
+    cols = set(frame.columns)
+
+    def _stat(sources: Tuple[str, ...]) -> pl.Expr:
+        present = [pl.col(c).cast(pl.Float64).fill_null(0) for c in sources if c in cols]
+        return pl.sum_horizontal(present) if present else pl.lit(None, dtype=pl.Float64)
+
+    logs = frame.select(
+        ["player_id"]
+        + [pl.col(c) if c in cols else pl.lit(None).alias(c) for c in LOG_INFO]
+        + [_stat(src).alias(stat) for stat, src in PROP_STATS.items()]
+    ).rename({"player_display_name": "player_name"})
+
+    if not results.is_empty():
+        games = results.select(["season", "week", "team", "game_id", "gameday", "venue"]).unique(subset=["season", "week", "team"])
+        logs = logs.join(games, on=["season", "week", "team"], how="left")
+    else:
+        logs = logs.with_columns([pl.lit(None, dtype=pl.Utf8).alias(c) for c in ("game_id", "gameday", "venue")])
+
+    logs = logs.sort(["player_id", "season", "week"])
+    return {"frame": logs, "index": row_spans(logs)}
+
+
+def load_game_logs(season: int) -> Dict[str, Any]:
+    """Season player game logs, built once per data version (blocking)."""
+    season = int(season)
+
+    def _build() -> Dict[str, Any]:
+        try:
+            results = load_team_results(season)
+        except Exception:
+            results = pl.DataFrame()  # venue stays unknown without schedules
+        return build_game_logs(season_frame(season), results)
+
+    return get_or_build("player_game_logs", season, data_version(season), _build)
+
+
+def game_logs(seasons: List[int], player_ids: Optional[List[str]] = None) -> pl.DataFrame:
+    """Game logs for `seasons`, limited to `player_ids` (sliced through the index) when given."""
+    parts = []
+    for season in seasons:
+        logs = load_game_logs(season)
+        if player_ids is None:
+            parts.append(logs["frame"])
+            continue
+        for pid in player_ids:
+            span = logs["index"].get(pid)
+            if span:
+                parts.append(logs["frame"].slice(*span))
+    parts = [p for p in parts if not p.is_empty()]
+    return pl.concat(parts, how="vertical_relaxed") if parts else pl.DataFrame()
+
+
+def select_game_logs(
+    logs: pl.DataFrame,
+    game_types: Optional[List[str]] = None,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent: Optional[str] = None,
+) -> pl.DataFrame:
+    """Apply the usual filters; `last_n` keeps each player's most recent games."""
+    if logs.is_empty():
+        return logs
+    df = logs
+    if game_types:
+        df = df.filter(pl.col("season_type").is_in(game_types))
+    if opponent:
+        df = df.filter(pl.col("opponent_team") == str(opponent).upper())
+    if str(venue or "").lower() in ("home", "away"):
+        df = df.filter(pl.col("venue") == str(venue).lower())
+    df = df.sort(["player_id", "season", "week"])
+    if last_n and last_n > 0:
+        df = df.filter(pl.int_range(pl.len()).reverse().over("player_id") < int(last_n))
+    return df
+
+
+def game_cursor(season: int, week: int) -> str:
+    return f"{int(season)}-{int(week)}"
+
+
+def parse_cursor(raw: Optional[str]) -> Optional[int]:
+    """"2024-15" -> 202415 (games strictly before it are returned); None when missing or malformed."""
+    season, _, week = str(raw or "").partition("-")
+    if not (season.strip().isdigit() and week.strip().isdigit()):
+        return None
+    return int(season) * 100 + int(week)
+
+
+def parse_cursors(raw: Optional[str], player_ids: List[str]) -> Dict[str, int]:
+    """Per-player cursors from "pid:2024-15,pid:2023-9" -> {pid: 202415, ...}.
+
+    With pairs, ids absent from the cursor are finished (cursor 0, nothing
+    before it): the response's next_cursor only lists players with more games.
+    A bare "2024-15" is only accepted with a single player id, since each
+    player pages independently; ValueError otherwise. Malformed entries and
+    ids not in `player_ids` are ignored.
+    """
+    text = str(raw or "").strip()
+    if not text:
+        return {}
+    if ":" not in text:
+        if len(player_ids) != 1:
+            raise ValueError("A bare cursor needs exactly one id; pass pid:season-week pairs to page several players")
+        before = parse_cursor(text)
+        return {player_ids[0]: before} if before is not None else {}
+    out: Dict[str, int] = {pid: 0 for pid in player_ids}
+    for part in text.split(","):
+        pid, _, token = part.partition(":")
+        before = parse_cursor(token)
+        if pid.strip() in out and before is not None:
+            out[pid.strip()] = before
+    return out
+
+
+def page_game_logs(
+    player_ids: List[str],
+    seasons: List[int],
+    game_types: List[str],
+    limit: int,
+    before: Optional[Dict[str, int]] = None,
+) -> Dict[str, Tuple[pl.DataFrame, bool]]:
+    """Each player's most recent `limit` games before their own cursor in `before`, oldest first, and whether more remain.
+
+    Seasons are walked newest first and only until every player's page is
+    full, so short pages never load old seasons.
+    """
+    before = before or {}
+    order = pl.col("season") * 100 + pl.col("week")
+    pending = set(player_ids)
+    parts = []
+    for season in sorted(seasons, reverse=True):
+        # players whose cursor is before this season have nothing in it
+        active = sorted(pid for pid in pending if before.get(pid, season * 100 + 1) > season * 100)
+        if not active:
+            continue
+        logs = select_game_logs(game_logs([season], active), game_types)
+        if logs.is_empty():
+            continue
+        if before:
+            cursor = pl.col("player_id").replace_strict(before, default=None, return_dtype=pl.Int64)
+            logs = logs.filter(cursor.is_null() | (order < cursor))
+        parts.append(logs)
+        counts = dict(pl.concat(parts, how="vertical_relaxed").group_by("player_id").len().iter_rows())
+        # one extra game tells whether there is another page
+        pending = {pid for pid in pending if counts.get(pid, 0) <= limit}
+        if not pending:
+            break
+    if not parts:
+        return {}
+
+    logs = pl.concat(parts, how="vertical_relaxed").sort(["player_id", "season", "week"], descending=[False, True, True])
+    logs = logs.filter(pl.int_range(pl.len()).over("player_id") <= limit)
+    out: Dict[str, Tuple[pl.DataFrame, bool]] = {}
+    for (pid,), rows in logs.partition_by("player_id", as_dict=True, maintain_order=True).items():
+        out[pid] = (rows.head(limit).reverse(), rows.height > limit)
+    return out
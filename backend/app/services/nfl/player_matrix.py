@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import row_spans, season_frame
+from app.services.nfl.player_sums import merge_sums, season_sums
+
+
+def build_vs_matrix(frame: pl.DataFrame) -> Dict[str, Any]:
+    """Player x opponent x season (x season_type) sums of one season's weekly rows.
+
+    Sums are kept as floats; `player_vs_sums` truncates them once after merging
+    game types. `frame` is sorted by player_id/opponent_team/season so a player's rows are
+    contiguous, and `index` maps player_id -> (offset, length) into it.
+    """
+    if frame.is_empty() or not {"player_id", "opponent_team", "season"} <= set(frame.columns):
+        return {"frame": pl.DataFrame(), "index": {}}
+    keys = ["player_id", "opponent_team", "season"] + (["season_type"] if "season_type" in frame.columns else [])
+    matrix = season_sums(frame, keys)
+    return {"frame": matrix, "index": row_spans(matrix)}
+
+
+def load_vs_matrix(season: int) -> Dict[str, Any]:
+    """Season player-vs-opponent matrix, built once per data version (blocking)."""
+    season = int(season)
+    return get_or_build("player_vs_matrix", season, data_version(season), lambda: build_vs_matrix(season_frame(season)))
+
+
+def player_vs_sums(
+    seasons: List[int],
+    player_id: str,
+    game_types: Optional[List[str]] = None,
+    opponent: Optional[str] = None,
+) -> pl.DataFrame:
+    """A player's int sums per (opponent_team, season), game types merged before truncating, sliced from each season's matrix."""
+    parts = []
+    for season in seasons:
+        matrix = load_vs_matrix(season)
+        span = matrix["index"].get(player_id)
+        if span:
+            parts.append(matrix["frame"].slice(*span))
+    if not parts:
+        return pl.DataFrame()
+    rows = pl.concat(parts, how="vertical_relaxed")
+    if game_types and "season_type" in rows.columns:
+        rows = rows.filter(pl.col("season_type").is_in(game_types))
+    if opponent:
+        rows = rows.filter(pl.col("opponent_team") == opponent)
+    if rows.is_empty():
+        return pl.DataFrame()
+    return merge_sums(rows, ["opponent_team", "season"])
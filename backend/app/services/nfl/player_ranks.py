@@ -0,0 +1,280 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.fantasy import FANTASY_STAT, fantasy_expr, parse_scoring, profile_hash, profile_table
+from app.services.nfl.player_registry import load_player_registry
+from app.services.nfl.player_store import season_frame
+
+
+def _round(expr: pl.Expr, digits: int) -> pl.Expr:
+    """Round half to even like numpy/pandas (polars' round goes half away from zero)."""
+    scaled = expr * 10 ** digits
+    low = scaled.floor()
+    frac = scaled - low
+    even = pl.when(frac > 0.5).then(low + 1).when(frac < 0.5).then(low).otherwise(low + low % 2)
+    # the final round only snaps away float noise from the division; ties are already gone
+    return (even / 10 ** digits).round(digits)
+
+
+def _ratio(num: str, den: str, digits: int, scale: int = 1) -> pl.Expr:
+    return pl.when(pl.col(den) > 0).then(_round(pl.col(num) / pl.col(den) * scale, digits)).otherwise(0.0)
+
+
+# Position group -> how to build its table from weekly rows:
+#   rows: weekly rows that count towards the group
+#   sums: output column -> candidate source columns (first present wins; missing -> column left out)
+#   derived: output column -> expression over the sums
+#   qualify: minimum volume to be ranked
+#   metrics: (column, higher_is_better) given <column>_rank and <column>_pctile; the first one orders the list
+RANK_GROUPS: Dict[str, Dict[str, Any]] = {
+    "qb": {
+        "rows": pl.col("passing_yards").fill_null(0) > 0,
+        "sums": {
+            "yards_total": ("passing_yards",),
+            "td_total": ("passing_tds",),
+            "attempts_total": ("attempts", "passing_attempts"),
+            "completions_total": ("completions", "passing_completions"),
+            "interceptions": ("passing_interceptions",),
+            "sacks_total": ("sacks_suffered", "sacks"),
+            "sack_yards_total": ("sack_yards_lost", "sack_yards"),
+            "fantasy_total": (FANTASY_STAT,),
+        },
+        "derived": {
+            "yards_per_game": _ratio("yards_total", "games", 1),
+            "attempts_per_game": _ratio("attempts_total", "games", 1),
+            "completions_per_game": _ratio("completions_total", "games", 1),
+            "yards_per_attempt": _ratio("yards_total", "attempts_total", 2),
+            "td_per_game": _ratio("td_total", "games", 2),
+            "sacks_per_game": _ratio("sacks_total", "games", 2),
+            "yards_per_sack": _ratio("sack_yards_total", "sacks_total", 1),
+            "fantasy_per_game": _ratio("fantasy_total", "games", 2),
+        },
+        "qualify": pl.col("attempts_total") >= 75,
+        "metrics": [
+            ("yards_total", True), ("yards_per_game", True), ("attempts_per_game", True),
+            ("completions_per_game", True), ("yards_per_attempt", True), ("td_total", True),
+            ("td_per_game", True), ("interceptions", False), ("sacks_per_game", False),
+            ("yards_per_sack", False), ("fantasy_total", True), ("fantasy_per_game", True),
+        ],
+    },
+    "rb": {
+        "rows": pl.col("rushing_yards").fill_null(0) > 0,
+        "sums": {
+            "yards_total": ("rushing_yards",),
+            "td_total": ("rushing_tds",),
+            "attempts_total": ("carries",),
+            "fantasy_total": (FANTASY_STAT,),
+        },
+        "derived": {
+            "yards_per_game": _ratio("yards_total", "games", 1),
+            "attempts_per_game": _ratio("attempts_total", "games", 1),
+            "yards_per_carry": _ratio("yards_total", "attempts_total", 2),
+            "fantasy_per_game": _ratio("fantasy_total", "games", 2),
+        },
+        "qualify": pl.col("attempts_total") >= 35,
+        "metrics": [
+            ("yards_total", True), ("yards_per_game", True), ("td_total", True),
+            ("attempts_per_game", True), ("yards_per_carry", True), ("fantasy_total", True),
+            ("fantasy_per_game", True),
+        ],
+    },
+    "wr_te": {
+        "rows": pl.col("receiving_yards").fill_null(0) > 0,
+        "sums": {
+            "yards_total": ("receiving_yards",),
+            "td_total": ("receiving_tds",),
+            "targets_total": ("targets",),
+            "receptions_total": ("receptions",),
+            "fantasy_total": (FANTASY_STAT,),
+        },
+        "derived": {
+            "yards_per_game": _ratio("yards_total", "games", 1),
+            "targets_per_game": _ratio("targets_total", "games", 1),
+            "receptions_per_game": _ratio("receptions_total", "games", 1),
+            "yards_per_reception": _ratio("yards_total", "receptions_total", 2),
+            "yards_per_target": _ratio("yards_total", "targets_total", 2),
+            "fantasy_per_game": _ratio("fantasy_total", "games", 2),
+        },
+        "qualify": pl.col("targets_total") >= 20,
+        "metrics": [
+            ("yards_total", True), ("yards_per_game", True), ("td_total", True),
+            ("targets_per_game", True), ("receptions_per_game", True),
+            ("yards_per_reception", True), ("yards_per_target", True), ("fantasy_total", True),
+            ("fantasy_per_game", True),
+        ],
+    },
+    "def": {
+        "rows": pl.col("def_tackles_solo").is_not_null() | pl.col("def_tackles_with_assist").is_not_null(),
+        "sums": {
+            "tackles_solo_total": ("def_tackles_solo",),
+            "tackles_assist_total": ("def_tackles_with_assist",),
+            "tfl_total": ("def_tackles_for_loss",),
+            "qb_hits_total": ("def_qb_hits",),
+            "sacks_total": ("def_sacks",),
+            "sack_yards_total": ("def_sack_yards",),
+            "interceptions_total": ("def_interceptions",),
+            "int_yards_total": ("def_interception_yards",),
+            "def_td": ("def_tds",),
+            "fumbles_recovered": ("def_fumbles",),
+            "fumbles_forced": ("def_fumbles_forced",),
+            "pass_defended": ("def_pass_defended",),
+        },
+        "derived": {
+            "tackles_total": pl.col("tackles_solo_total") + pl.col("tackles_assist_total"),
+            "tackles_per_game": _ratio("tackles_total", "games", 1),
+            "tackles_solo_per_game": _ratio("tackles_solo_total", "games", 1),
+            "tfl_per_game": _ratio("tfl_total", "games", 1),
+            "qb_hits_per_game": _ratio("qb_hits_total", "games", 1),
+            "sacks_per_game": _ratio("sacks_total", "games", 1),
+            "interceptions_per_game": _ratio("interceptions_total", "games", 1),
+            "yards_per_sack": _ratio("sack_yards_total", "sacks_total", 1),
+        },
+        "qualify": pl.col("tackles_total") >= 3,
+        "metrics": [
+            ("tackles_total", True), ("tackles_per_game", True), ("tackles_solo_per_game", True),
+            ("tfl_per_game", True), ("qb_hits_per_game", True), ("sacks_total", True),
+            ("sacks_per_game", True), ("yards_per_sack", True), ("interceptions_total", True),
+            ("interceptions_per_game", True), ("def_td", True), ("fumbles_recovered", True),
+            ("fumbles_forced", True), ("pass_defended", True),
+        ],
+    },
+    "kick": {
+        "rows": pl.col("fg_made").is_not_null() | pl.col("fg_att").is_not_null(),
+        "sums": {
+            "fg_made": ("fg_made",),
+            "fg_att": ("fg_att",),
+            "pat_made": ("pat_made",),
+            "pat_att": ("pat_att",),
+            "fg_30_39": ("fg_made_30_39",),
+            "fg_40_49": ("fg_made_40_49",),
+            "fg_50_59": ("fg_made_50_59",),
+            "fg_60_plus": ("fg_made_60_", "fg_made_60_plus"),
+        },
+        "derived": {
+            "fg_50_plus": pl.col("fg_50_59") + pl.col("fg_60_plus"),
+            "fg_pct": _ratio("fg_made", "fg_att", 1, 100),
+            "pat_pct": _ratio("pat_made", "pat_att", 1, 100),
+        },
+        "qualify": pl.col("fg_att") >= 10,
+        "metrics": [
+            ("fg_made", True), ("fg_pct", True), ("pat_pct", True),
+            ("fg_30_39", True), ("fg_40_49", True), ("fg_50_plus", True),
+        ],
+    },
+}
+
+
+def _rank_plan(frame: pl.LazyFrame, schema: pl.Schema, spec: Dict[str, Any]) -> Optional[pl.LazyFrame]:
+    """Lazy per-player table of one position group with rank/percentile columns, or None when its columns are missing."""
+    present = set(schema.names())
+    if not set(spec["rows"].meta.root_names()) <= present:
+        return None
+    sums = {out: next((c for c in src if c in present), None) for out, src in spec["sums"].items()}
+    sums = {out: src for out, src in sums.items() if src}
+    # Derived columns built on sums that are missing (e.g. no sack columns) are left out
+    available = set(sums) | {"games"}
+    ordered: List[Tuple[str, pl.Expr]] = []
+    for out, expr in spec["derived"].items():
+        if set(expr.meta.root_names()) <= available:
+            ordered.append((out, expr))
+            available.add(out)
+    if not set(spec["qualify"].meta.root_names()) <= available:
+        return None
+
+    plan = (
+        frame.filter(spec["rows"] & pl.col("player_display_name").is_not_null())
+        .group_by(["player_id", "player_display_name"])
+        .agg(
+            [pl.col("week").drop_nulls().n_unique().alias("games")]
+            + [pl.col(src).fill_null(0).sum().alias(out) for out, src in sums.items()]
+        )
+        .rename({"player_display_name": "player_name"})
+    )
+    for out, expr in ordered:
+        plan = plan.with_columns(expr.alias(out))
+    plan = plan.filter(spec["qualify"])
+
+    metrics = [(m, higher) for m, higher in spec["metrics"] if m in available]
+    n = pl.len()
+    plan = plan.with_columns(
+        [pl.col(m).rank(method="min", descending=higher).cast(pl.Int64).alias(f"{m}_rank") for m, higher in metrics]
+        # share of qualified players this one is at least as good as
+        + [(pl.col(m).rank(method="max", descending=not higher) / n * 100).round(1).alias(f"{m}_pctile") for m, higher in metrics]
+    )
+    lead = metrics[0][0] if metrics else "player_id"
+    return plan.sort([f"{lead}_rank" if metrics else lead, "player_id"])
+
+
+def _season_identity(stats: pl.DataFrame) -> pl.LazyFrame:
+    """Team, position and headshot per player as of their last game in `stats` (last non-null values)."""
+    cols = set(stats.columns)
+    team = next((c for c in ("team", "recent_team") if c in cols), None)
+
+    def _last(name: Optional[str], alias: str) -> pl.Expr:
+        if name is None or name not in cols:
+            return pl.lit(None, dtype=pl.Utf8).alias(alias)
+        return pl.col(name).cast(pl.Utf8).drop_nulls().last().alias(alias)
+
+    return (
+        stats.lazy()
+        .sort("week", nulls_last=False)
+        .group_by("player_id")
+        .agg([_last(team, "team"), _last("position", "position"), _last("headshot_url", "season_headshot")])
+    )
+
+
+def build_player_ranks(stats: pl.DataFrame, identity: pl.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    """Ranked tables for every position group.
+
+    Team and position are the player's last ones in `stats` (that season), so
+    past seasons keep the team a player was on; `identity` (the registry)
+    only supplies headshot_url, falling back to the season's own.
+    """
+    out: Dict[str, List[Dict[str, Any]]] = {group: [] for group in RANK_GROUPS}
+    if stats.is_empty() or "player_id" not in stats.columns:
+        return out
+    if "week" not in stats.columns:
+        stats = stats.with_columns(pl.lit(None, dtype=pl.Int64).alias("week"))
+
+    lazy = stats.lazy()
+    plans = {group: _rank_plan(lazy, stats.schema, spec) for group, spec in RANK_GROUPS.items()}
+    plans = {group: plan for group, plan in plans.items() if plan is not None}
+    ident = _season_identity(stats)
+    if not identity.is_empty() and "headshot_url" in identity.columns:
+        ident = ident.join(
+            identity.lazy().select(["player_id", pl.col("headshot_url").alias("registry_headshot")]), on="player_id", how="left"
+        ).with_columns(pl.coalesce("registry_headshot", "season_headshot").alias("headshot_url"))
+    else:
+        ident = ident.with_columns(pl.col("season_headshot").alias("headshot_url"))
+    ident = ident.select(["player_id", "team", "position", "headshot_url"])
+    plans = {group: plan.join(ident, on="player_id", how="left", maintain_order="left") for group, plan in plans.items()}
+
+    groups = list(plans)
+    for group, table in zip(groups, pl.collect_all([plans[g] for g in groups])):
+        out[group] = table.to_dicts()
+    return out
+
+
+def load_player_ranks(
+    season: int, game_types: List[str], current_season: int, scoring: Optional[str] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Position-group ranks for a season and game types, built once per data version and scoring profile (blocking).
+    Offensive groups include fantasy_total/fantasy_per_game under `scoring` (see fantasy.parse_scoring);
+    custom profiles are kept in a small LRU (see fantasy.profile_table).
+    """
+    season, types = int(season), tuple(sorted(game_types))
+    profile = parse_scoring(scoring)
+
+    def _build() -> Dict[str, List[Dict[str, Any]]]:
+        registry = load_player_registry(current_season)
+        stats = season_frame(season, list(types))
+        if not stats.is_empty():
+            stats = stats.with_columns(fantasy_expr(profile, stats.schema).alias(FANTASY_STAT))
+        return build_player_ranks(stats, registry["frame"])
+
+    # Headshots come from the current registry, so past seasons also follow the current version
+    version = (data_version(season), data_version(current_season))
+    table, limit = profile_table("player_ranks", profile)
+    return get_or_build(table, (season, types, profile_hash(profile)), version, _build, limit=limit)
@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Optional
+
+import nflreadpy as nfl
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_resolve import is_player_id, name_key, normalize_name
+from app.services.nfl.player_store import season_players
+
+
+REGISTRY_SEASONS = 10
+
+ESPN_HEADSHOT = "https://a.espncdn.com/i/headshots/nfl/players/full/{espn_id}.png"
+ESPN_THUMBNAIL = "https://a.espncdn.com/combiner/i?img=/i/headshots/nfl/players/full/{espn_id}.png&w=96&h=96"
+
+
+def _roster_identity(rosters: pl.DataFrame) -> pl.DataFrame:
+    """Latest roster row per gsis id with the external ids the stats lack."""
+    cols = set(rosters.columns)
+    if rosters.is_empty() or "gsis_id" not in cols:
+        return pl.DataFrame(schema={"player_id": pl.Utf8})
+
+    def _opt(name: str) -> pl.Expr:
+        return (pl.col(name).cast(pl.Utf8) if name in cols else pl.lit(None, dtype=pl.Utf8)).alias(name)
+
+    order = [c for c in ("season", "week") if c in cols]
+    latest = rosters.filter(pl.col("gsis_id").is_not_null())
+    if order:
+        latest = latest.sort(order, descending=True)
+    return latest.unique(subset=["gsis_id"], keep="first").select([
+        pl.col("gsis_id").alias("player_id"),
+        _opt("full_name"),
+        _opt("espn_id"),
+        _opt("pfr_id"),
+        _opt("headshot_url").alias("roster_headshot_url"),
+        _opt("team").alias("roster_team"),
+        _opt("position").alias("roster_position"),
+        (pl.col("season").cast(pl.Int64) if "season" in cols else pl.lit(None, dtype=pl.Int64)).alias("roster_season"),
+    ])
+
+
+def build_player_registry(players: pl.DataFrame, rosters: pl.DataFrame) -> Dict[str, Any]:
+    """One row per gsis player_id joining player-stats identity with roster ids.
+
+    `frame` is ordered by recency then activity and keeps team/position as
+    categoricals; `by_id`, `by_espn` and `by_name` map into its rows.
+    """
+    if players.is_empty() and rosters.is_empty():
+        return {"frame": pl.DataFrame(), "by_id": {}, "by_espn": {}, "by_name": {}}
+
+    if not players.is_empty():
+        cols = set(players.columns)
+        first = [pl.col(c).drop_nulls().first().alias(c) for c in ("player_display_name", "player_name", "position", "position_group", "team", "headshot_url") if c in cols]
+        stats = (
+            players.sort(["season", "week"], descending=[True, True], nulls_last=True)
+            .group_by("player_id", maintain_order=True)
+            .agg(first + [
+                pl.col("season").min().alias("first_season"),
+                pl.col("season").max().alias("last_season"),
+                pl.col("week").first().alias("last_week"),
+                pl.col("rows").sum().alias("games"),
+            ])
+        )
+    else:
+        stats = pl.DataFrame(schema={"player_id": pl.Utf8})
+
+    reg = stats.join(_roster_identity(rosters), on="player_id", how="full", coalesce=True)
+
+    def _col(name: str, dtype=pl.Utf8) -> pl.Expr:
+        return pl.col(name) if name in reg.columns else pl.lit(None, dtype=dtype).alias(name)
+
+    reg = reg.select([
+        pl.col("player_id"),
+        pl.coalesce([_col("player_display_name"), _col("full_name")]).alias("name"),
+        _col("player_name").alias("short_name"),
+        _col("full_name"),
+        _col("espn_id"),
+        _col("pfr_id"),
+        pl.coalesce([_col("headshot_url"), _col("roster_headshot_url")]).alias("headshot_url"),
+        # Rosters describe the current team/position; stats the latest game played
+        pl.coalesce([_col("roster_team"), _col("team")]).cast(pl.Categorical).alias("team"),
+        pl.coalesce([_col("roster_position"), _col("position")]).cast(pl.Categorical).alias("position"),
+        _col("position_group").cast(pl.Categorical).alias("position_group"),
+        _col("first_season", pl.Int64).alias("first_season"),
+        pl.max_horizontal([_col("last_season", pl.Int64), _col("roster_season", pl.Int64)]).alias("last_season"),
+        _col("last_week", pl.Int64).alias("last_week"),
+        _col("games", pl.Int64).fill_null(0).alias("games"),
+    ]).filter(pl.col("name").is_not_null())
+    reg = reg.with_columns([
+        pl.col("name").map_elements(name_key, return_dtype=pl.Utf8).alias("name_key"),
+        pl.col("name").map_elements(normalize_name, return_dtype=pl.Utf8).alias("name_norm"),
+    ]).sort(["last_season", "last_week", "games", "player_id"], descending=[True, True, True, False], nulls_last=True)
+
+    by_id: Dict[str, int] = {}
+    by_espn: Dict[str, int] = {}
+    by_name: Dict[str, List[int]] = {}
+    for i, (pid, espn_id, key) in enumerate(reg.select(["player_id", "espn_id", "name_key"]).iter_rows()):
+        by_id[pid] = i
+        if espn_id:
+            by_espn.setdefault(espn_id, i)
+        if key:
+            by_name.setdefault(key, []).append(i)
+    return {"frame": reg, "by_id": by_id, "by_espn": by_espn, "by_name": by_name}
+
+
+def load_player_registry(season: int) -> Dict[str, Any]:
+    """Registry over the last REGISTRY_SEASONS seasons of stats plus `season` rosters, built once per data version (blocking)."""
+    season = int(season)
+
+    def _build() -> Dict[str, Any]:
+        try:
+            rosters = nfl.load_rosters([season])
+        except Exception:
+            rosters = pl.DataFrame()
+        seasons = list(range(max(1999, season - REGISTRY_SEASONS + 1), season + 1))
+        try:
+            players = season_players(seasons)
+        except Exception:
+            # the newest season may not be published yet
+            players = season_players(seasons[:-1])
+        return build_player_registry(players, rosters)
+
+    return get_or_build("player_registry", season, data_version(season), _build)
+
+
+def registry_player(registry: Dict[str, Any], player_id: str) -> Optional[Dict[str, Any]]:
+    i = registry["by_id"].get(player_id)
+    return registry["frame"].row(i, named=True) if i is not None else None
+
+
+def registry_find(registry: Dict[str, Any], name: str) -> List[Dict[str, Any]]:
+    """Players whose normalised name equals `name`'s, most recent first."""
+    frame = registry["frame"]
+    return [frame.row(i, named=True) for i in registry["by_name"].get(name_key(name), [])]
+
+
+def registry_lookup(registry: Dict[str, Any], queries: List[str], prefer_espn: bool = False) -> pl.DataFrame:
+    """Registry rows for many names/gsis ids in one join, with the `query` that matched.
+
+    Ids match player_id; names match the normalised name key, taking the most
+    recent namesake (or the first with an ESPN id when `prefer_espn`).
+    Queries without an exact match are simply absent.
+    """
+    frame = registry["frame"]
+    queries = list(dict.fromkeys(q for q in queries if q and q.strip()))
+    if frame.is_empty() or not queries:
+        return pl.DataFrame()
+
+    asked = pl.DataFrame({"query": queries}).with_columns(
+        pl.col("query").map_elements(lambda q: q.strip() if is_player_id(q) else None, return_dtype=pl.Utf8).alias("player_id"),
+        pl.col("query").map_elements(name_key, return_dtype=pl.Utf8).alias("name_key"),
+    )
+    by_key = frame.filter(pl.col("name_key").is_not_null())
+    if prefer_espn:
+        by_key = by_key.sort(pl.col("espn_id").is_null(), maintain_order=True)
+    by_key = by_key.unique(subset=["name_key"], keep="first", maintain_order=True)
+
+    return pl.concat([
+        asked.filter(pl.col("player_id").is_not_null()).select("query", "player_id").join(frame, on="player_id", how="inner"),
+        asked.filter(pl.col("player_id").is_null()).select("query", "name_key").join(by_key, on="name_key", how="inner"),
+    ], how="diagonal_relaxed")
+
+
+def espn_headshots(espn_id: Optional[str]) -> Dict[str, Optional[str]]:
+    if not espn_id or espn_id in ("None", "nan"):
+        return {"headshot_url": None, "thumbnail_url": None}
+    return {"headshot_url": ESPN_HEADSHOT.format(espn_id=espn_id), "thumbnail_url": ESPN_THUMBNAIL.format(espn_id=espn_id)}
@@ -0,0 +1,207 @@
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+import re
+import threading
+import unicodedata
+
+import nflreadpy as nfl
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import season_players
+
+
+# nflverse gsis ids, e.g. "00-0033873"
+PLAYER_ID_RE = re.compile(r"^\d{2}-\d{7}$")
+
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+
+# Short first names -> the form they are matched as (applied to both query and names)
+NICKNAMES: Dict[str, str] = {
+    "pat": "patrick", "mike": "michael", "matt": "matthew", "chris": "christopher",
+    "josh": "joshua", "tom": "thomas", "tommy": "thomas", "dan": "daniel", "danny": "daniel",
+    "nick": "nicholas", "rob": "robert", "bob": "robert", "bobby": "robert", "will": "william",
+    "bill": "william", "billy": "william", "jim": "james", "jimmy": "james", "joe": "joseph",
+    "joey": "joseph", "tony": "anthony", "alex": "alexander", "ben": "benjamin",
+    "sam": "samuel", "zach": "zachary", "zack": "zachary", "jake": "jacob", "jon": "jonathan",
+    "johnny": "john", "andy": "andrew", "drew": "andrew", "dave": "david", "greg": "gregory",
+    "jeff": "jeffrey", "ken": "kenneth", "kenny": "kenneth", "steve": "steven", "ed": "edward",
+    "eddie": "edward", "ted": "theodore", "gabe": "gabriel", "nate": "nathan", "tim": "timothy",
+    "cam": "cameron",
+}
+
+# Candidates are listed from MIN_SCORE; a name only resolves on its own from RESOLVE_SCORE
+MIN_SCORE = 0.45
+RESOLVE_SCORE = 0.55
+
+# Resolved queries kept per resolver, and resolvers (season window x game types) kept at once
+MEMO_SIZE = 4096
+RESOLVER_CACHE_SIZE = 8
+
+GAME_TYPES = frozenset({"REG", "POST", "PRE"})
+
+
+def normalize_name(text: str) -> str:
+    """Normalize text for search: remove accents, apostrophes, and special chars.
+    Examples: "Ja'Marr" -> "jamarr", "José" -> "jose"
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFD", text.lower())
+    text = "".join(char for char in text if unicodedata.category(char) != "Mn")
+    text = re.sub(r"['\-\.]", "", text)
+    text = re.sub(r"[^a-z0-9\s]", "", text)
+    return text.strip()
+
+
+def is_player_id(value: str) -> bool:
+    return bool(PLAYER_ID_RE.match((value or "").strip()))
+
+
+def name_key(name: str) -> str:
+    """Comparable form of a name: normalised, suffixes dropped, first name de-nicknamed."""
+    tokens = [t for t in normalize_name(name).split() if t not in SUFFIXES]
+    if tokens:
+        tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return " ".join(tokens)
+
+
+def _grams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _in_order(query_tokens: List[str], key: str) -> bool:
+    """First and last query words appear as words of `key`, in that order."""
+    words = key.split()
+    if not query_tokens or not words:
+        return False
+    first, last = query_tokens[0], query_tokens[-1]
+    try:
+        i = words.index(first)
+    except ValueError:
+        return False
+    return last in words[i + 1:]
+
+
+def build_name_resolver(players: pl.DataFrame) -> Dict[str, Any]:
+    """Trigram index over every name variant in a per-player table.
+
+    `players` holds one entry per player_id (most recent name/team first);
+    `keys` are (player index, name key) pairs with `postings` from trigram to
+    key index. `memo` caches the last MEMO_SIZE resolved queries.
+    """
+    resolver: Dict[str, Any] = {
+        "players": [], "keys": [], "key_grams": [], "by_key": {}, "postings": {},
+        "memo": OrderedDict(), "memo_lock": threading.Lock(),
+    }
+    if players.is_empty() or "player_id" not in players.columns:
+        return resolver
+
+    cols = set(players.columns)
+    names = [c for c in ("player_display_name", "player_name") if c in cols]
+    info = [c for c in ("position", "team") if c in cols]
+    per_player = (
+        players.sort(["season", "week"], descending=[True, True], nulls_last=True)
+        .group_by("player_id", maintain_order=True)
+        .agg(
+            [pl.col(c).drop_nulls().unique(maintain_order=True).alias(f"{c}s") for c in names]
+            + [pl.col(c).drop_nulls().first().alias(c) for c in info]
+            + [pl.col("season").max().alias("latest_season"), pl.col("rows").sum().alias("game_count")]
+        )
+        .sort(["latest_season", "game_count", "player_id"], descending=[True, True, False])
+    )
+
+    for row in per_player.iter_rows(named=True):
+        variants = [n for c in names for n in (row.get(f"{c}s") or [])]
+        if not variants:
+            continue
+        p = len(resolver["players"])
+        resolver["players"].append({
+            "player_id": row["player_id"],
+            "name": variants[0],
+            "position": row.get("position"),
+            "team": row.get("team"),
+            "season": row["latest_season"],
+        })
+        for key in dict.fromkeys(name_key(v) for v in variants):
+            if not key:
+                continue
+            k = len(resolver["keys"])
+            grams = _grams(key)
+            resolver["keys"].append((p, key))
+            resolver["key_grams"].append(len(grams))
+            resolver["by_key"].setdefault(key, []).append(p)
+            for gram in grams:
+                resolver["postings"].setdefault(gram, []).append(k)
+    return resolver
+
+
+def _window(seasons: List[int], game_types: Optional[List[str]] = None) -> Tuple[Tuple[int, ...], Tuple[str, ...]]:
+    """Cache key for a resolver: the contiguous season range covering `seasons` within [1999, current] and the valid game types."""
+    current = int(nfl.get_current_season())
+    valid = [min(max(int(s), 1999), current) for s in seasons] or [current]
+    types = tuple(sorted({str(t).upper() for t in game_types or ()} & GAME_TYPES))
+    return tuple(range(min(valid), max(valid) + 1)), types
+
+
+def load_name_resolver(seasons: List[int], game_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Resolver over the players of the season window covering `seasons`, built once per data version (blocking).
+
+    Requests are keyed on their normalised window so arbitrary season lists
+    share resolvers, and only the RESOLVER_CACHE_SIZE most recent are kept.
+    """
+    window, types = _window(seasons, game_types)
+    return get_or_build(
+        "name_resolver", (window, types), data_version(window[-1]),
+        lambda: build_name_resolver(season_players(list(window), list(types) or None)),
+        limit=RESOLVER_CACHE_SIZE,
+    )
+
+
+def rank_candidates(resolver: Dict[str, Any], query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Players whose names look like `query`, best first.
+
+    Exact key matches score 1.0; names containing the query's first and last
+    words in order score at least 0.9; otherwise trigram Jaccard similarity.
+    Equal scores keep the resolver's recency/activity order.
+    """
+    qkey = name_key(query)
+    if not qkey:
+        return []
+    scores: Dict[int, float] = {p: 1.0 for p in resolver["by_key"].get(qkey, ())}
+
+    qgrams = _grams(qkey)
+    shared = Counter(k for gram in qgrams for k in resolver["postings"].get(gram, ()))
+    q_tokens = qkey.split()
+    for k, n in shared.items():
+        p, key = resolver["keys"][k]
+        if scores.get(p) == 1.0:
+            continue
+        sim = n / (len(qgrams) + resolver["key_grams"][k] - n)
+        if len(q_tokens) > 1 and _in_order(q_tokens, key):
+            sim = max(sim, 0.9)
+        if sim >= MIN_SCORE and sim > scores.get(p, 0.0):
+            scores[p] = sim
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [{**resolver["players"][p], "score": round(score, 3)} for p, score in ranked]
+
+
+def resolve_player_ids(resolver: Dict[str, Any], query: str) -> List[str]:
+    """Ids of the best-scoring candidates (several when namesakes tie), memoised per query (LRU of MEMO_SIZE)."""
+    qkey = name_key(query)
+    memo, lock = resolver["memo"], resolver["memo_lock"]
+    with lock:
+        if qkey in memo:
+            memo.move_to_end(qkey)
+            return memo[qkey]
+    candidates = rank_candidates(resolver, query, limit=25)
+    top = candidates[0]["score"] if candidates else None
+    ids = [c["player_id"] for c in candidates if c["score"] == top and top >= RESOLVE_SCORE]
+    with lock:
+        memo[qkey] = ids
+        memo.move_to_end(qkey)
+        while len(memo) > MEMO_SIZE:
+            memo.popitem(last=False)
+    return ids
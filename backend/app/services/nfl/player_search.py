@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Set
+import re
+
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_registry import load_player_registry
+from app.services.nfl.player_resolve import normalize_name
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def build_search_index(registry: pl.DataFrame) -> Dict[str, Any]:
+    """Typeahead index over registry players.
+
+    Entries keep the registry order (recency, then activity), so every posting
+    list is already in rank order. `prefix` maps every prefix of a name and of
+    each of its words to entries; `grams` maps 2- and 3-grams to entries for
+    substring matches.
+    """
+    entries: List[Dict[str, Any]] = []
+    names: List[str] = []
+    prefix: Dict[str, List[int]] = {}
+    grams: Dict[str, List[int]] = {}
+    if registry.is_empty():
+        return {"entries": entries, "names": names, "prefix": prefix, "grams": grams}
+
+    for row in registry.iter_rows(named=True):
+        norm = row.get("name_norm") or normalize_name(row.get("name") or "")
+        if not norm:
+            continue
+        pos = len(entries)
+        entries.append({
+            "player_id": row["player_id"],
+            "name": row.get("name") or "Unknown",
+            "position": row.get("position") or "",
+            "position_group": row.get("position_group") or "",
+            "team": row.get("team") or "",
+            "headshot_url": row.get("headshot_url"),
+            "season": row.get("last_season"),
+        })
+        names.append(norm)
+        starts = {0} | {m.start() for m in re.finditer(r"(?<=\s)\S", norm)}
+        keys = {norm[s:s + k] for s in starts for k in range(1, len(norm) - s + 1)}
+        for key in keys:
+            prefix.setdefault(key, []).append(pos)
+        for gram in _ngrams(norm, 2) | _ngrams(norm, 3):
+            grams.setdefault(gram, []).append(pos)
+    return {"entries": entries, "names": names, "prefix": prefix, "grams": grams}
+
+
+def load_search_index(season: int) -> Dict[str, Any]:
+    """Search index over registry players active in the given or previous season, built once per data version (blocking)."""
+    season = int(season)
+
+    def _build() -> Dict[str, Any]:
+        frame = load_player_registry(season)["frame"]
+        if not frame.is_empty():
+            frame = frame.filter(pl.col("last_season") >= season - 1)
+        return build_search_index(frame)
+
+    return get_or_build("player_search", season, data_version(season), _build)
+
+
+def search_index(index: Dict[str, Any], query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Name-prefix hits first, then any other name containing the query, each in rank order."""
+    q = normalize_name(query)
+    if not q:
+        return []
+    hits: List[int] = list(index["prefix"].get(q, ()))[:limit]
+    if len(hits) < limit:
+        n = 2 if len(q) < 3 else 3
+        postings = [index["grams"].get(g) for g in _ngrams(q, n)]
+        if postings and all(postings):
+            seen = set(hits)
+            candidates = set.intersection(*(set(p) for p in postings)) - seen
+            names = index["names"]
+            for pos in sorted(candidates):
+                if q in names[pos]:
+                    hits.append(pos)
+                    if len(hits) >= limit:
+                        break
+    return [dict(index["entries"][pos]) for pos in hits]
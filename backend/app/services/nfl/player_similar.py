@@ -0,0 +1,113 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import season_frame
+
+
+# Position group -> per-game features (weekly player-stats columns); share columns are averaged, the rest summed per game
+SIMILAR_FEATURES: Dict[str, Tuple[str, ...]] = {
+    "QB": (
+        "attempts", "completions", "passing_yards", "passing_tds", "passing_interceptions",
+        "sacks_suffered", "passing_air_yards", "passing_epa", "carries", "rushing_yards", "rushing_tds",
+    ),
+    "RB": (
+        "carries", "rushing_yards", "rushing_tds", "rushing_first_downs", "rushing_epa",
+        "targets", "receptions", "receiving_yards", "receiving_tds", "target_share",
+    ),
+    "WR": (
+        "targets", "receptions", "receiving_yards", "receiving_tds", "receiving_air_yards",
+        "receiving_yards_after_catch", "receiving_first_downs", "receiving_epa", "target_share", "air_yards_share", "wopr",
+    ),
+    "TE": (
+        "targets", "receptions", "receiving_yards", "receiving_tds", "receiving_air_yards",
+        "receiving_yards_after_catch", "receiving_first_downs", "receiving_epa", "target_share", "air_yards_share", "wopr",
+    ),
+}
+SHARE_FEATURES = ("target_share", "air_yards_share", "wopr")
+
+MIN_GAMES = 3
+
+
+def build_feature_matrix(frame: pl.DataFrame, group: str) -> Optional[Dict[str, Any]]:
+    """Standardised per-game feature matrix of a position group's players with at least MIN_GAMES games.
+
+    `matrix` is a C-contiguous float64 array (one row per player, z-scored
+    columns) with its row `norms`; `players` and `rates` line up with its rows
+    and `index` maps player_id -> row.
+    """
+    if frame.is_empty() or "position_group" not in frame.columns:
+        return None
+    features = [c for c in SIMILAR_FEATURES[group] if c in frame.columns]
+    if not features:
+        return None
+
+    rates = (
+        frame.filter(pl.col("position_group") == group)
+        .group_by("player_id")
+        .agg(
+            [
+                pl.col("player_display_name").drop_nulls().last().alias("name"),
+                pl.col("team").drop_nulls().last(),
+                pl.col("headshot_url").drop_nulls().last(),
+                pl.col("week").n_unique().alias("games"),
+            ]
+            + [(pl.col(c).fill_null(0).mean() if c in SHARE_FEATURES else pl.col(c).fill_null(0).sum()).alias(c) for c in features]
+        )
+        .filter(pl.col("games") >= MIN_GAMES)
+        .with_columns([(pl.col(c) / pl.col("games")).alias(c) for c in features if c not in SHARE_FEATURES])
+        .sort("player_id")
+    )
+    if rates.height < 2:
+        return None
+
+    raw = np.ascontiguousarray(rates.select(features).to_numpy(), dtype=np.float64)
+    mean = raw.mean(axis=0)
+    std = raw.std(axis=0)
+    std[std == 0] = 1.0
+    matrix = np.ascontiguousarray((raw - mean) / std)
+    return {
+        "features": features,
+        "matrix": matrix,
+        "norms": np.linalg.norm(matrix, axis=1),
+        "players": rates.select(["player_id", "name", "team", "headshot_url", "games"]),
+        "rates": rates.select(["player_id"] + [pl.col(c).round(3) for c in features]),
+        "index": {pid: i for i, pid in enumerate(rates["player_id"].to_list())},
+    }
+
+
+def load_feature_matrix(season: int, group: str, game_types: List[str]) -> Optional[Dict[str, Any]]:
+    """Per-season, per-position-group feature matrix, built once per data version (blocking)."""
+    season, types = int(season), tuple(sorted(game_types))
+    return get_or_build(
+        "player_features", (season, group, types), data_version(season),
+        lambda: build_feature_matrix(season_frame(season, list(types)), group),
+    )
+
+
+def nearest_players(features: Dict[str, Any], player_id: str, limit: int = 10, metric: str = "cosine") -> Optional[pl.DataFrame]:
+    """The `limit` players closest to `player_id` with one matrix-vector product; None when the player is not in the matrix."""
+    row = features["index"].get(player_id)
+    if row is None:
+        return None
+    matrix, norms = features["matrix"], features["norms"]
+    dots = matrix @ matrix[row]
+    if metric == "euclidean":
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b
+        score = -np.sqrt(np.maximum(norms ** 2 + norms[row] ** 2 - 2 * dots, 0.0))
+    else:
+        denom = norms * norms[row]
+        score = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+    score[row] = -np.inf
+    count = min(int(limit), len(score) - 1)
+    top = np.argpartition(-score, count - 1)[:count] if count > 0 else np.array([], dtype=np.int64)
+    top = top[np.argsort(-score[top])]
+
+    if metric == "euclidean":
+        column = pl.Series("distance", np.round(-score[top], 4))
+    else:
+        column = pl.Series("similarity", np.round(score[top], 4))
+    picked = features["players"][top.tolist()].with_columns(column)
+    return picked.join(features["rates"], on="player_id", how="left", maintain_order="left")
@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import nflreadpy as nfl
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+
+
+# Columns describing who a player is; the rest of player_stats are weekly measures
+PLAYER_INFO_COLS = ("player_display_name", "player_name", "position", "position_group", "team", "headshot_url")
+
+
+def row_spans(frame: pl.DataFrame, key: str = "player_id") -> Dict[str, Tuple[int, int]]:
+    """key -> (offset, length) of its contiguous rows in a frame sorted by `key`."""
+    bounds = (
+        frame.select(key).with_row_index("offset")
+        .group_by(key, maintain_order=True)
+        .agg([pl.col("offset").first(), pl.len().alias("length")])
+    )
+    return {k: (int(off), int(n)) for k, off, n in bounds.iter_rows()}
+
+
+def build_player_store(stats: pl.DataFrame) -> Dict[str, Any]:
+    """Index one season of weekly player stats by player_id.
+
+    `frame` is sorted by player_id/season/week so a player's rows are contiguous,
+    `index` maps player_id -> (offset, length) into it, and `players` is one row
+    per (player_id, season_type, name) used for name matching and search.
+    """
+    if stats.is_empty() or "player_id" not in stats.columns:
+        return {"frame": stats, "index": {}, "players": pl.DataFrame()}
+
+    order = [c for c in ("player_id", "season", "week") if c in stats.columns]
+    frame = stats.filter(pl.col("player_id").is_not_null()).sort(order)
+    index = row_spans(frame)
+
+    cols = set(frame.columns)
+    keys = ["player_id"] + [c for c in ("season_type", "player_display_name", "player_name") if c in cols]
+    info = [pl.col(c).drop_nulls().last().alias(c) for c in PLAYER_INFO_COLS if c in cols and c not in keys]
+    players = frame.group_by(keys, maintain_order=True).agg(
+        info
+        + [pl.col(c).max().alias(c) for c in ("season", "week") if c in cols]
+        + [pl.len().alias("rows")]
+    )
+    return {"frame": frame, "index": index, "players": players}
+
+
+def load_player_store(season: int) -> Dict[str, Any]:
+    """Season player-stats store, built once per data version (blocking)."""
+    season = int(season)
+    return get_or_build("player_store", season, data_version(season), lambda: build_player_store(nfl.load_player_stats([season])))
+
+
+def season_frame(season: int, game_types: Optional[List[str]] = None) -> pl.DataFrame:
+    """Every player's weekly rows for a season, optionally limited to game types."""
+    frame = load_player_store(season)["frame"]
+    if game_types and "season_type" in frame.columns:
+        frame = frame.filter(pl.col("season_type").is_in(game_types))
+    return frame
+
+
+def player_rows(seasons: List[int], player_id: str, game_types: Optional[List[str]] = None) -> pl.DataFrame:
+    """A player's weekly rows across seasons, sliced from each season's store."""
+    parts = []
+    for season in seasons:
+        store = load_player_store(season)
+        span = store["index"].get(player_id)
+        if span:
+            parts.append(store["frame"].slice(*span))
+    if not parts:
+        return pl.DataFrame()
+    rows = pl.concat(parts, how="diagonal_relaxed")
+    if game_types and "season_type" in rows.columns:
+        rows = rows.filter(pl.col("season_type").is_in(game_types))
+    return rows
+
+
+def season_players(seasons: List[int], game_types: Optional[List[str]] = None) -> pl.DataFrame:
+    """Per-player name/info rows for the given seasons (small; used for matching)."""
+    parts = [load_player_store(s)["players"] for s in seasons]
+    parts = [p for p in parts if not p.is_empty()]
+    if not parts:
+        return pl.DataFrame()
+    players = pl.concat(parts, how="diagonal_relaxed")
+    if game_types and "season_type" in players.columns:
+        players = players.filter(pl.col("season_type").is_in(game_types))
+    return players
+
+
+def first_headshot(rows: pl.DataFrame) -> Optional[str]:
+    if "headshot_url" not in rows.columns:
+        return None
+    return next((url for url in rows["headshot_url"] if url and str(url) != "None"), None)
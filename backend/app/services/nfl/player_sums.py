@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import nflreadpy as nfl
+import polars as pl
+
+from app.core.settings import settings
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_store import row_spans, season_frame
+
+
+# Per-season sums behind the career blocks: output column -> candidate source columns
+SEASON_SUMS: Dict[str, Tuple[str, ...]] = {
+    "rec_yards": ("receiving_yards", "rec_yards"),
+    "rec_tds": ("receiving_tds", "rec_tds", "receiving_touchdowns"),
+    "targets": ("targets", "receiving_targets"),
+    "receptions": ("receptions",),
+    "rush_yards": ("rushing_yards", "carries_yards"),
+    "rush_tds": ("rushing_tds", "rush_tds", "rushing_touchdowns"),
+    "carries": ("carries", "rushing_attempts", "rush_attempts", "rushing_att"),
+    "pass_yards": ("passing_yards",),
+    "pass_tds": ("passing_tds",),
+    "pass_int": ("passing_interceptions",),
+    "attempts": ("attempts", "passing_attempts"),
+    "completions": ("completions", "passing_completions"),
+    "sacks": ("sacks_suffered", "sacks"),
+    "sack_yards": ("sack_yards_lost",),
+    "def_tackles_solo": ("def_tackles_solo",),
+    "def_tackles_assist": ("def_tackles_with_assist",),
+    "def_tfl": ("def_tackles_for_loss",),
+    "def_qb_hits": ("def_qb_hits",),
+    "def_sacks": ("def_sacks",),
+    "def_sack_yards": ("def_sack_yards",),
+    "def_ints": ("def_interceptions",),
+    "def_int_yards": ("def_interception_yards",),
+    "def_tds": ("def_tds",),
+    "def_fumbles": ("def_fumbles",),
+    "def_fumbles_forced": ("def_fumbles_forced",),
+    "def_pass_def": ("def_pass_defended",),
+    "fg_made": ("fg_made", "field_goals_made"),
+    "fg_att": ("fg_att", "field_goals_attempted", "fg_attempts"),
+    "pat_made": ("pat_made", "extra_points_made"),
+    "pat_att": ("pat_att", "extra_points_attempted", "pat_attempts"),
+    "fg_made_30_39": ("fg_made_30_39",),
+    "fg_made_40_49": ("fg_made_40_49",),
+    "fg_made_50_59": ("fg_made_50_59",),
+    "fg_made_60_plus": ("fg_made_60_", "fg_made_60_plus"),
+}
+
+def season_sums(frame: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+    """Every career stat summed per `keys` (e.g. ["season"]) in a single group_by.
+
+    Sums stay Float64 (half sacks add up across rows) until `merge_sums`
+    truncates the final roll-up; `games` is distinct weeks and `fg_long` the
+    longest field goal.
+    """
+    numeric = {c for c, dtype in frame.schema.items() if dtype.is_numeric()}
+    cols = [pl.col(k) for k in keys]
+    for out, sources in SEASON_SUMS.items():
+        src = next((c for c in sources if c in numeric), None)
+        cols.append((pl.col(src) if src else pl.lit(0)).alias(out))
+    fg_long_src = next((c for c in ("fg_long", "fg_longest") if c in numeric), None)
+    cols.append((pl.col(fg_long_src) if fg_long_src else pl.lit(None, dtype=pl.Float64)).alias("fg_long"))
+    cols.append((pl.col("week") if "week" in frame.columns else pl.lit(None, dtype=pl.Int64)).alias("week"))
+
+    games = pl.col("week").drop_nulls().n_unique() if "week" in frame.columns else pl.len()
+    sums = (
+        frame.filter(pl.all_horizontal([pl.col(k).is_not_null() for k in keys]))
+        .select(cols)
+        .group_by(keys)
+        .agg(
+            [games.cast(pl.Int64).alias("games")]
+            + [pl.col(c).sum().cast(pl.Float64) for c in SEASON_SUMS]
+            + [pl.col("fg_long").max().fill_null(0).cast(pl.Float64)]
+        )
+    )
+    return sums.with_columns([
+        (pl.col("def_tackles_solo") + pl.col("def_tackles_assist")).alias("def_tackles"),
+        (pl.col("fg_made_50_59") + pl.col("fg_made_60_plus")).alias("fg_made_50_plus"),
+    ]).sort(keys)
+
+
+# Bump when SEASON_SUMS or the season_sums layout changes so persisted seasons are rebuilt
+SUMS_FORMAT = 2
+
+
+# Every additive column of a `season_sums` frame (fg_long is a max)
+SUM_COLUMNS: Tuple[str, ...] = ("games",) + tuple(SEASON_SUMS) + ("def_tackles", "fg_made_50_plus")
+
+
+def merge_sums(sums: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+    """Roll `season_sums` rows up to coarser `keys` (e.g. REG+POST rows into one per season).
+
+    The float sums are added first and truncated to int once per output row,
+    like the per-season `int(g.sum())` they replace.
+    """
+    return (
+        sums.group_by(keys)
+        .agg([pl.col(c).sum() for c in SUM_COLUMNS] + [pl.col("fg_long").max()])
+        .select(keys + ["games"] + list(SEASON_SUMS) + ["fg_long", "def_tackles", "fg_made_50_plus"])
+        .with_columns([pl.col(c).cast(pl.Int64) for c in SUM_COLUMNS + ("fg_long",)])
+        .sort(keys)
+    )
+
+
+def _season_path(season: int):
+    return settings.cache_dir / "player_seasons" / f"{int(season)}_v{SUMS_FORMAT}.parquet"
+
+
+def _build_season_sums(season: int) -> pl.DataFrame:
+    """Per (player_id, season, season_type) sums of a season's weekly rows.
+
+    Completed seasons never change, so their sums are written to the cache
+    directory once and read back from then on; the current season is summed
+    from the weekly rows again whenever its data version moves.
+    """
+    path = _season_path(season)
+    done = int(season) < int(nfl.get_current_season())
+    if done and path.exists():
+        try:
+            return pl.read_parquet(path)
+        except Exception:
+            pass  # unreadable or partial file: rebuild it below
+
+    frame = season_frame(season)
+    if frame.is_empty() or "player_id" not in frame.columns:
+        return pl.DataFrame()
+    keys = ["player_id", "season"] + (["season_type"] if "season_type" in frame.columns else [])
+    sums = season_sums(frame, keys)
+
+    if done:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            sums.write_parquet(tmp)
+            tmp.replace(path)
+        except OSError:
+            pass  # read-only cache dir: keep serving from memory
+    return sums
+
+
+def load_season_sums(season: int) -> Dict[str, Any]:
+    """Season sums sorted by player_id with a player_id -> (offset, length) index (blocking)."""
+    season = int(season)
+
+    def _build() -> Dict[str, Any]:
+        sums = _build_season_sums(season)
+        return {"frame": sums, "index": row_spans(sums) if not sums.is_empty() else {}}
+
+    return get_or_build("player_season_sums", season, data_version(season), _build)
+
+
+def player_season_sums(seasons: List[int], player_id: str, game_types: Optional[List[str]] = None) -> pl.DataFrame:
+    """A player's sums per season (game types merged), from each season's cached block."""
+    parts = []
+    for season in seasons:
+        block = load_season_sums(season)
+        span = block["index"].get(player_id)
+        if span:
+            parts.append(block["frame"].slice(*span))
+    if not parts:
+        return pl.DataFrame()
+    rows = pl.concat(parts, how="vertical_relaxed")
+    if game_types and "season_type" in rows.columns:
+        rows = rows.filter(pl.col("season_type").is_in(game_types))
+    if rows.is_empty():
+        return pl.DataFrame()
+    return merge_sums(rows, ["season"])
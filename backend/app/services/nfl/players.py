@@ -1,29 +1,23 @@
-from typing import List, Optional, Dict, Any
-import re
-import unicodedata
+from typing import List, Optional, Dict, Any, Tuple
+import math
 
 import nflreadpy as nfl
 from starlette.concurrency import run_in_threadpool
 import polars as pl
-import pandas as pd
 
-
-def _normalize_text(text: str) -> str:
-    """Normalize text for search: remove accents, apostrophes, and special chars.
-    Examples: "Ja'Marr" -> "jamarr", "José" -> "jose"
-    """
-    if not text:
-        return ""
-    # Lowercase
-    text = text.lower()
-    # Remove accents/diacritics
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(char for char in text if unicodedata.category(char) != 'Mn')
-    # Remove apostrophes, hyphens, dots, etc.
-    text = re.sub(r"['\-\.]", "", text)
-    # Keep only alphanumeric and spaces
-    text = re.sub(r"[^a-z0-9\s]", "", text)
-    return text.strip()
+from app.services.nfl.fantasy import FANTASY_STAT, parse_scoring, with_fantasy
+from app.services.nfl.lines import count_lines, parse_numbers
+from app.services.nfl.pbp_index import pbp_player_ids, player_plays, search_pbp_names
+from app.services.nfl.player_gamelogs import PROP_STATS, game_cursor, game_logs, page_game_logs, parse_cursors, select_game_logs
+from app.services.nfl.player_matrix import player_vs_sums
+from app.services.nfl.player_ranks import load_player_ranks
+from app.services.nfl.player_registry import load_player_registry, registry_find, registry_player
+from app.services.nfl.player_resolve import is_player_id, load_name_resolver, rank_candidates, resolve_player_ids
+from app.services.nfl.player_search import load_search_index, search_index
+from app.services.nfl.player_similar import SIMILAR_FEATURES, load_feature_matrix, nearest_players
+from app.services.nfl.player_store import first_headshot, player_rows
+from app.services.nfl.player_sums import player_season_sums
+from app.services.nfl.usage import player_usage
 
 
 def _parse_seasons(raw: Optional[str], current_season: int) -> List[int]:
@@ -74,281 +68,214 @@ def _last_n_seasons(n: int, current_season: int) -> List[int]:
     return list(range(start, int(current_season) + 1))
 
 
-def _aggregate_player_stats(st_pd, chosen_player_id=None, headshot=None):
-    """Helper to aggregate player stats from pandas DataFrame.
-    Returns seasons array, aggregate blocks, and role guess.
-    """
-    # Normalize column access helpers
-    def get(g, key_list, default=0):
-        for k in key_list:
-            if k in g:
-                return g[k]
-        return default
+# A season counts towards a block when any of these sums is non-zero
+_BLOCK_ACTIVE: Dict[str, Tuple[str, ...]] = {
+    "receiving": ("rec_yards", "receptions", "targets", "rec_tds"),
+    "rushing": ("rush_yards", "carries", "rush_tds"),
+    "passing": ("pass_yards", "attempts", "pass_tds", "pass_int"),
+    "defense": ("def_tackles", "def_sacks", "def_ints", "def_tfl", "def_qb_hits"),
+    "kicking": ("fg_made", "fg_att", "pat_made", "pat_att"),
+}
+
+
+def _season_blocks(r: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Per-season receiving/rushing/passing/defense/kicking dicts from one `season_sums` row."""
+    s, games = int(r["season"]), int(r["games"])
+    out: Dict[str, Dict[str, Any]] = {}
+    if any(r[c] for c in _BLOCK_ACTIVE["receiving"]):
+        yds, recs, tgts = r["rec_yards"], r["receptions"], r["targets"]
+        out["receiving"] = {"season": s, "games": games, "targets": tgts, "receptions": recs, "yards": yds, "td": r["rec_tds"], "yards_per_reception": round(yds / recs, 2) if recs > 0 else 0, "yards_per_target": round(yds / tgts, 2) if tgts > 0 else 0}
+    if any(r[c] for c in _BLOCK_ACTIVE["rushing"]):
+        yds, att = r["rush_yards"], r["carries"]
+        out["rushing"] = {"season": s, "games": games, "attempts": att, "yards": yds, "td": r["rush_tds"], "yards_per_carry": round(yds / att, 2) if att > 0 else 0}
+    if any(r[c] for c in _BLOCK_ACTIVE["passing"]):
+        yds, att, cmp_ = r["pass_yards"], r["attempts"], r["completions"]
+        out["passing"] = {"season": s, "games": games, "attempts": att, "completions": cmp_, "yards": yds, "td": r["pass_tds"], "interceptions": r["pass_int"], "completion_pct": round((cmp_/att*100),1) if att>0 else 0, "yards_per_attempt": round(yds / att, 2) if att > 0 else 0, "sacks": r["sacks"], "sack_yards": r["sack_yards"]}
+    if any(r[c] for c in _BLOCK_ACTIVE["defense"]):
+        sacks = r["def_sacks"]
+        out["defense"] = {"season": s, "games": games, "tackles": r["def_tackles"], "tackles_solo": r["def_tackles_solo"], "tfl": r["def_tfl"], "qb_hits": r["def_qb_hits"], "sacks": sacks, "sack_yards": r["def_sack_yards"], "interceptions": r["def_ints"], "int_yards": r["def_int_yards"], "tds": r["def_tds"], "fumbles_rec": r["def_fumbles"], "fumbles_forced": r["def_fumbles_forced"], "pass_defended": r["def_pass_def"], "yards_per_sack": round(r["def_sack_yards"] / sacks, 1) if sacks > 0 else 0}
+    if any(r[c] for c in _BLOCK_ACTIVE["kicking"]):
+        fgm, fga, pam, paa = r["fg_made"], r["fg_att"], r["pat_made"], r["pat_att"]
+        out["kicking"] = {"season": s, "games": games, "fg_made": fgm, "fg_att": fga, "fg_pct": round((fgm / fga * 100), 1) if fga > 0 else 0, "pat_made": pam, "pat_att": paa, "pat_pct": round((pam / paa * 100), 1) if paa > 0 else 0, "fg_long": r["fg_long"], "fg_made_30_39": r["fg_made_30_39"], "fg_made_40_49": r["fg_made_40_49"], "fg_made_50_plus": r["fg_made_50_plus"]}
+    return out
+
+
+def _career_totals(sums: pl.DataFrame) -> Dict[str, int]:
+    """Career roll-up of `season_sums`: each block only sums the seasons it is active in."""
+    totals: Dict[str, int] = {}
+    for block, active_cols in _BLOCK_ACTIVE.items():
+        part = sums.filter(pl.any_horizontal([pl.col(c) != 0 for c in active_cols]))
+        totals[f"{block}:seasons"] = part.height
+        for name, value in part.drop(["season", "fg_long"]).sum().row(0, named=True).items():
+            totals[f"{block}:{name}"] = int(value or 0)
+        totals[f"{block}:fg_long"] = int(part["fg_long"].max() or 0)
+    return totals
+
+
+def _blocks_from_season_sums(sums: pl.DataFrame):
+    """seasons timeline, aggregate blocks and role guess from per-season sums."""
+    seasons_out = []
+    for r in sums.iter_rows(named=True):
+        blocks = _season_blocks(r)
+        if blocks:
+            seasons_out.append({"season": int(r["season"]), **{k: blocks[k] for k in _BLOCK_ACTIVE if k in blocks}})
 
-    # Get unique seasons from the season column
-    if "season" in st_pd.columns:
-        seasons_vals = sorted(st_pd["season"].dropna().unique().astype(int).tolist())
-    else:
-        seasons_vals = []
-    
-    rec_seasons, rush_seasons, pass_seasons, def_seasons, kick_seasons = [], [], [], [], []
-    for s in seasons_vals:
-        g = st_pd[st_pd["season"] == s]
-        # games count from week column if exists, else len rows
-        games = int(g["week"].nunique()) if "week" in g.columns else int(len(g))
-        # Receiving
-        rec_yds = int(get(g.sum(numeric_only=True), ["receiving_yards", "rec_yards"]))
-        rec_tds = int(get(g.sum(numeric_only=True), ["receiving_tds", "rec_tds", "receiving_touchdowns"]))
-        targets = int(get(g.sum(numeric_only=True), ["targets", "receiving_targets"]))
-        recs = int(get(g.sum(numeric_only=True), ["receptions"]))
-        ypr = round(rec_yds / recs, 2) if recs > 0 else 0
-        ypt = round(rec_yds / targets, 2) if targets > 0 else 0
-        if rec_yds or recs or targets or rec_tds:
-            rec_seasons.append({"season": int(s), "games": games, "targets": targets, "receptions": recs, "yards": rec_yds, "td": rec_tds, "yards_per_reception": ypr, "yards_per_target": ypt})
-        # Rushing
-        ru_yds = int(get(g.sum(numeric_only=True), ["rushing_yards", "carries_yards"]))
-        ru_tds = int(get(g.sum(numeric_only=True), ["rushing_tds", "rush_tds", "rushing_touchdowns"]))
-        ru_att = int(get(g.sum(numeric_only=True), ["carries", "rushing_attempts", "rush_attempts", "rushing_att"]))
-        ypc = round(ru_yds / ru_att, 2) if ru_att > 0 else 0
-        if ru_yds or ru_att or ru_tds:
-            rush_seasons.append({"season": int(s), "games": games, "attempts": ru_att, "yards": ru_yds, "td": ru_tds, "yards_per_carry": ypc})
-        # Passing
-        pa_yds = int(get(g.sum(numeric_only=True), ["passing_yards"]))
-        pa_tds = int(get(g.sum(numeric_only=True), ["passing_tds"]))
-        pa_int = int(get(g.sum(numeric_only=True), ["passing_interceptions"]))
-        att = int(get(g.sum(numeric_only=True), ["attempts", "passing_attempts"]))
-        cmp_ = int(get(g.sum(numeric_only=True), ["completions", "passing_completions"]))
-        ypa = round(pa_yds / att, 2) if att > 0 else 0
-        sacks = int(get(g.sum(numeric_only=True), ["sacks_suffered", "sacks"]))
-        sack_yds = int(get(g.sum(numeric_only=True), ["sack_yards_lost"]))
-        if pa_yds or att or pa_tds or pa_int:
-            pass_seasons.append({"season": int(s), "games": games, "attempts": att, "completions": cmp_, "yards": pa_yds, "td": pa_tds, "interceptions": pa_int, "completion_pct": round((cmp_/att*100),1) if att>0 else 0, "yards_per_attempt": ypa, "sacks": sacks, "sack_yards": sack_yds})
-        # Defense
-        def_tackles_solo = int(get(g.sum(numeric_only=True), ["def_tackles_solo"]))
-        def_tackles_assist = int(get(g.sum(numeric_only=True), ["def_tackles_with_assist"]))
-        def_tackles = def_tackles_solo + def_tackles_assist  # Total tackles = solo + assisted
-        def_tfl = int(get(g.sum(numeric_only=True), ["def_tackles_for_loss"]))
-        def_qb_hits = int(get(g.sum(numeric_only=True), ["def_qb_hits"]))
-        def_sacks = int(get(g.sum(numeric_only=True), ["def_sacks"]))
-        def_sack_yds = int(get(g.sum(numeric_only=True), ["def_sack_yards"]))
-        def_ints = int(get(g.sum(numeric_only=True), ["def_interceptions"]))
-        def_int_yds = int(get(g.sum(numeric_only=True), ["def_interception_yards"]))
-        def_tds = int(get(g.sum(numeric_only=True), ["def_tds"]))
-        def_fumbles = int(get(g.sum(numeric_only=True), ["def_fumbles"]))
-        def_fumbles_forced = int(get(g.sum(numeric_only=True), ["def_fumbles_forced"]))
-        def_pass_def = int(get(g.sum(numeric_only=True), ["def_pass_defended"]))
-        yps = round(def_sack_yds / def_sacks, 1) if def_sacks > 0 else 0
-        if def_tackles or def_sacks or def_ints or def_tfl or def_qb_hits:
-            def_seasons.append({"season": int(s), "games": games, "tackles": def_tackles, "tackles_solo": def_tackles_solo, "tfl": def_tfl, "qb_hits": def_qb_hits, "sacks": def_sacks, "sack_yards": def_sack_yds, "interceptions": def_ints, "int_yards": def_int_yds, "tds": def_tds, "fumbles_rec": def_fumbles, "fumbles_forced": def_fumbles_forced, "pass_defended": def_pass_def, "yards_per_sack": yps})
-        # Kicking
-        try:
-            fg_made = int(get(g.sum(numeric_only=True), ["fg_made", "field_goals_made"]))
-            fg_att = int(get(g.sum(numeric_only=True), ["fg_att", "field_goals_attempted", "fg_attempts"]))
-            fg_pct = round((fg_made / fg_att * 100), 1) if fg_att > 0 else 0
-            pat_made = int(get(g.sum(numeric_only=True), ["pat_made", "extra_points_made"]))
-            pat_att = int(get(g.sum(numeric_only=True), ["pat_att", "extra_points_attempted", "pat_attempts"]))
-            pat_pct = round((pat_made / pat_att * 100), 1) if pat_att > 0 else 0
-            try:
-                fg_long = int(get(g.max(numeric_only=True), ["fg_long", "fg_longest"]))
-            except:
-                fg_long = 0
-            fg_made_30_39 = int(get(g.sum(numeric_only=True), ["fg_made_30_39"]))
-            fg_made_40_49 = int(get(g.sum(numeric_only=True), ["fg_made_40_49"]))
-            # Aggregate all 50+ field goals: 50-59 + 60+
-            fg_made_50_59 = int(get(g.sum(numeric_only=True), ["fg_made_50_59"]))
-            fg_made_60_plus = int(get(g.sum(numeric_only=True), ["fg_made_60_", "fg_made_60_plus"]))
-            fg_made_50_plus = fg_made_50_59 + fg_made_60_plus
-            if fg_made or fg_att or pat_made or pat_att:
-                kick_seasons.append({"season": int(s), "games": games, "fg_made": fg_made, "fg_att": fg_att, "fg_pct": fg_pct, "pat_made": pat_made, "pat_att": pat_att, "pat_pct": pat_pct, "fg_long": fg_long, "fg_made_30_39": fg_made_30_39, "fg_made_40_49": fg_made_40_49, "fg_made_50_plus": fg_made_50_plus})
-        except Exception:
-            pass  # Skip kicking stats if there's any error
-
-    # Build aggregates
-    def _sum(lst, key):
-        return sum(int(x.get(key, 0)) for x in lst)
-    def _games(lst):
-        return sum(int(x.get("games", 0)) for x in lst)
+    t = _career_totals(sums) if sums.height else {}
+
+    def has(block: str) -> bool:
+        return t.get(f"{block}:seasons", 0) > 0
 
     qb_block = None
-    if pass_seasons:
-        g = _games(pass_seasons) or 1
-        total_yards = _sum(pass_seasons, "yards")
-        total_tds = _sum(pass_seasons, "td")
-        total_int = _sum(pass_seasons, "interceptions")
-        total_att = _sum(pass_seasons, "attempts") or 1
-        total_cmp = _sum(pass_seasons, "completions")
-        ypg = round(total_yards / g, 1)
-        td_pg = round(total_tds / g, 2)
-        ypa = round(total_yards / total_att, 2)
-        att_pg = round(total_att / g, 1)
-        cmp_pg = round(total_cmp / g, 1)
-        total_sacks = _sum(pass_seasons, "sacks")
-        total_sack_yds = _sum(pass_seasons, "sack_yards")
-        sacks_pg = round(total_sacks / g, 2)
-        yds_per_sack = round(total_sack_yds / total_sacks, 1) if total_sacks > 0 else 0
+    if has("passing"):
+        g = t["passing:games"] or 1
+        total_yards, total_tds = t["passing:pass_yards"], t["passing:pass_tds"]
+        total_att = t["passing:attempts"] or 1
+        total_sacks, total_sack_yds = t["passing:sacks"], t["passing:sack_yards"]
         qb_block = {
-            "attempts_per_game": att_pg,
-            "completions_per_game": cmp_pg,
-            "yards_per_game": ypg,
+            "attempts_per_game": round(total_att / g, 1),
+            "completions_per_game": round(t["passing:completions"] / g, 1),
+            "yards_per_game": round(total_yards / g, 1),
             "yards_total": total_yards,
-            "td_per_game": td_pg,
+            "td_per_game": round(total_tds / g, 2),
             "td_total": total_tds,
-            "interceptions": total_int,
-            "yards_per_attempt": ypa,
-            "sacks_per_game": sacks_pg,
-            "yards_per_sack": yds_per_sack
+            "interceptions": t["passing:pass_int"],
+            "yards_per_attempt": round(total_yards / total_att, 2),
+            "sacks_per_game": round(total_sacks / g, 2),
+            "yards_per_sack": round(total_sack_yds / total_sacks, 1) if total_sacks > 0 else 0
         }
 
     rb_block = None
-    if rush_seasons:
-        g = _games(rush_seasons) or 1
-        total_yards = _sum(rush_seasons, "yards")
-        total_tds = _sum(rush_seasons, "td")
-        total_att = _sum(rush_seasons, "attempts") or 1
-        ypg = round(total_yards / g, 1)
-        att_pg = round(total_att / g, 1)
-        ypc = round(total_yards / total_att, 2)
+    if has("rushing"):
+        g = t["rushing:games"] or 1
+        total_yards = t["rushing:rush_yards"]
+        total_att = t["rushing:carries"] or 1
         rb_block = {
-            "yards_per_game": ypg,
+            "yards_per_game": round(total_yards / g, 1),
             "yards_total": total_yards,
-            "td_total": total_tds,
-            "attempts_per_game": att_pg,
-            "yards_per_carry": ypc
+            "td_total": t["rushing:rush_tds"],
+            "attempts_per_game": round(total_att / g, 1),
+            "yards_per_carry": round(total_yards / total_att, 2)
         }
 
     wr_block = None
-    if rec_seasons:
-        g = _games(rec_seasons) or 1
-        total_yards = _sum(rec_seasons, "yards")
-        total_tds = _sum(rec_seasons, "td")
-        total_targets = _sum(rec_seasons, "targets")
-        total_rec = _sum(rec_seasons, "receptions")
-        ypg = round(total_yards / g, 1)
-        tgt_pg = round(total_targets / g, 1)
-        rec_pg = round(total_rec / g, 1)
-        ypr = round(total_yards / total_rec, 2) if total_rec > 0 else 0
-        ypt = round(total_yards / total_targets, 2) if total_targets > 0 else 0
-        wr_block = {"yards_per_game": ypg, "yards_total": total_yards, "td_total": total_tds, "targets_per_game": tgt_pg, "receptions_per_game": rec_pg, "yards_per_reception": ypr, "yards_per_target": ypt}
+    if has("receiving"):
+        g = t["receiving:games"] or 1
+        total_yards, total_targets, total_rec = t["receiving:rec_yards"], t["receiving:targets"], t["receiving:receptions"]
+        wr_block = {"yards_per_game": round(total_yards / g, 1), "yards_total": total_yards, "td_total": t["receiving:rec_tds"], "targets_per_game": round(total_targets / g, 1), "receptions_per_game": round(total_rec / g, 1), "yards_per_reception": round(total_yards / total_rec, 2) if total_rec > 0 else 0, "yards_per_target": round(total_yards / total_targets, 2) if total_targets > 0 else 0}
 
     def_block = None
-    if def_seasons:
-        g = _games(def_seasons) or 1
-        total_tackles = _sum(def_seasons, "tackles")
-        total_tackles_solo = _sum(def_seasons, "tackles_solo")
-        total_tfl = _sum(def_seasons, "tfl")
-        total_qb_hits = _sum(def_seasons, "qb_hits")
-        total_sacks = _sum(def_seasons, "sacks")
-        total_sack_yds = _sum(def_seasons, "sack_yards")
-        total_ints = _sum(def_seasons, "interceptions")
-        total_int_yds = _sum(def_seasons, "int_yards")
-        total_def_tds = _sum(def_seasons, "tds")
-        total_fumbles_rec = _sum(def_seasons, "fumbles_rec")
-        total_fumbles_forced = _sum(def_seasons, "fumbles_forced")
-        total_pass_def = _sum(def_seasons, "pass_defended")
-        tackles_pg = round(total_tackles / g, 1)
-        tackles_solo_pg = round(total_tackles_solo / g, 1)
-        tfl_pg = round(total_tfl / g, 1)
-        qb_hits_pg = round(total_qb_hits / g, 1)
-        sacks_pg = round(total_sacks / g, 1)
-        ints_pg = round(total_ints / g, 1)
-        yps = round(total_sack_yds / total_sacks, 1) if total_sacks > 0 else 0
+    if has("defense"):
+        g = t["defense:games"] or 1
+        total_sacks, total_sack_yds = t["defense:def_sacks"], t["defense:def_sack_yards"]
         def_block = {
-            "tackles_total": total_tackles,
-            "tackles_per_game": tackles_pg,
-            "tackles_solo_per_game": tackles_solo_pg,
-            "tfl_per_game": tfl_pg,
-            "qb_hits_per_game": qb_hits_pg,
+            "tackles_total": t["defense:def_tackles"],
+            "tackles_per_game": round(t["defense:def_tackles"] / g, 1),
+            "tackles_solo_per_game": round(t["defense:def_tackles_solo"] / g, 1),
+            "tfl_per_game": round(t["defense:def_tfl"] / g, 1),
+            "qb_hits_per_game": round(t["defense:def_qb_hits"] / g, 1),
             "sacks_total": total_sacks,
-            "sacks_per_game": sacks_pg,
+            "sacks_per_game": round(total_sacks / g, 1),
             "sack_yards_total": total_sack_yds,
-            "yards_per_sack": yps,
-            "interceptions_total": total_ints,
-            "interceptions_per_game": ints_pg,
-            "interception_yards": total_int_yds,
-            "def_td": total_def_tds,
-            "fumbles_recovered": total_fumbles_rec,
-            "fumbles_forced": total_fumbles_forced,
-            "pass_defended": total_pass_def
+            "yards_per_sack": round(total_sack_yds / total_sacks, 1) if total_sacks > 0 else 0,
+            "interceptions_total": t["defense:def_ints"],
+            "interceptions_per_game": round(t["defense:def_ints"] / g, 1),
+            "interception_yards": t["defense:def_int_yards"],
+            "def_td": t["defense:def_tds"],
+            "fumbles_recovered": t["defense:def_fumbles"],
+            "fumbles_forced": t["defense:def_fumbles_forced"],
+            "pass_defended": t["defense:def_pass_def"]
         }
 
     kick_block = None
-    if kick_seasons:
-        g = _games(kick_seasons) or 1
-        total_fg_made = _sum(kick_seasons, "fg_made")
-        total_fg_att = _sum(kick_seasons, "fg_att")
-        fg_pct = round((total_fg_made / total_fg_att * 100), 1) if total_fg_att > 0 else 0
-        total_pat_made = _sum(kick_seasons, "pat_made")
-        total_pat_att = _sum(kick_seasons, "pat_att")
-        pat_pct = round((total_pat_made / total_pat_att * 100), 1) if total_pat_att > 0 else 0
-        fg_long = max((x.get("fg_long", 0) for x in kick_seasons), default=0)
-        total_fg_30_39 = _sum(kick_seasons, "fg_made_30_39")
-        total_fg_40_49 = _sum(kick_seasons, "fg_made_40_49")
-        total_fg_50_plus = _sum(kick_seasons, "fg_made_50_plus")
+    if has("kicking"):
+        fgm, fga, pam, paa = t["kicking:fg_made"], t["kicking:fg_att"], t["kicking:pat_made"], t["kicking:pat_att"]
         kick_block = {
-            "fg_made": total_fg_made,
-            "fg_att": total_fg_att,
-            "fg_pct": fg_pct,
-            "pat_made": total_pat_made,
-            "pat_att": total_pat_att,
-            "pat_pct": pat_pct,
-            "fg_long": fg_long,
-            "fg_made_30_39": total_fg_30_39,
-            "fg_made_40_49": total_fg_40_49,
-            "fg_made_50_plus": total_fg_50_plus
+            "fg_made": fgm,
+            "fg_att": fga,
+            "fg_pct": round((fgm / fga * 100), 1) if fga > 0 else 0,
+            "pat_made": pam,
+            "pat_att": paa,
+            "pat_pct": round((pam / paa * 100), 1) if paa > 0 else 0,
+            "fg_long": t["kicking:fg_long"],
+            "fg_made_30_39": t["kicking:fg_made_30_39"],
+            "fg_made_40_49": t["kicking:fg_made_40_49"],
+            "fg_made_50_plus": t["kicking:fg_made_50_plus"]
         }
 
-    # seasons_out combining
-    seasons_out = []
-    seasons_set = set()
-    for lst in (rec_seasons or []):
-        seasons_set.add(int(lst.get("season")))
-    for lst in (rush_seasons or []):
-        seasons_set.add(int(lst.get("season")))
-    for lst in (pass_seasons or []):
-        seasons_set.add(int(lst.get("season")))
-    for lst in (def_seasons or []):
-        seasons_set.add(int(lst.get("season")))
-    for lst in (kick_seasons or []):
-        seasons_set.add(int(lst.get("season")))
-    unique = sorted(seasons_set)
-    for s in unique:
-        row = {"season": int(s)}
-        for lst, key in ((rec_seasons, "receiving"), (rush_seasons, "rushing"), (pass_seasons, "passing"), (def_seasons, "defense"), (kick_seasons, "kicking")):
-            found = next((x for x in lst if x["season"] == s), None) if lst else None
-            if found:
-                row[key] = found
-        seasons_out.append(row)
-
     # Role guess
     counts = {
-        "passing": _sum(pass_seasons, "attempts"), 
-        "rushing": _sum(rush_seasons, "attempts"), 
-        "receiving": _sum(rec_seasons, "targets"),
-        "defense": _sum(def_seasons, "tackles"),
-        "kicking": _sum(kick_seasons, "fg_att")
+        "passing": t.get("passing:attempts", 0),
+        "rushing": t.get("rushing:carries", 0),
+        "receiving": t.get("receiving:targets", 0),
+        "defense": t.get("defense:def_tackles", 0),
+        "kicking": t.get("kicking:fg_att", 0)
     }
     best = max(counts, key=lambda k: counts[k]) if any(v>0 for v in counts.values()) else None
     role_guess = ("QB" if best == "passing" else ("RB" if best == "rushing" else ("WR/TE" if best == "receiving" else ("DEF" if best == "defense" else ("K" if best == "kicking" else None)))))
 
-    # Total games across all activities
-    total_games = _games(rec_seasons) + _games(rush_seasons) + _games(pass_seasons) + _games(def_seasons) + _games(kick_seasons)
-    if "week" in st_pd.columns:
-        total_games = int(st_pd["week"].nunique())
-
-    return {
-        "seasons": seasons_out,
-        "aggregate": {
-            "role_guess": role_guess,
-            "qb": qb_block,
-            "rb": rb_block,
-            "wr_te": wr_block,
-            "def": def_block,
-            "kick": kick_block,
-        },
-        "total_games": total_games,
-        "player_id": chosen_player_id,
-        "headshot_url": headshot,
+    aggregate = {
+        "role_guess": role_guess,
+        "qb": qb_block,
+        "rb": rb_block,
+        "wr_te": wr_block,
+        "def": def_block,
+        "kick": kick_block,
     }
+    total_games = sum(t.get(f"{b}:games", 0) for b in _BLOCK_ACTIVE)
+    return seasons_out, aggregate, total_games
+
+
+def _player_ids(player: str, seasons: List[int], game_types: List[str]) -> List[str]:
+    """[player] when it already is a player_id, else the best name matches (blocking)."""
+    if is_player_id(player):
+        return [player.strip()]
+    return resolve_player_ids(load_name_resolver(seasons, game_types), player)
+
+
+def _registry_ids(player: str) -> List[str]:
+    """[player] when it already is a player_id, else the registry's exact namesakes, most recent first (blocking)."""
+    if is_player_id(player):
+        return [player.strip()]
+    try:
+        return [row["player_id"] for row in registry_find(load_player_registry(nfl.get_current_season()), player)]
+    except Exception:
+        return []
+
+
+def _identity(player_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Registry row (names, espn_id, headshot, current team/position) for a player_id (blocking)."""
+    if not player_id:
+        return None
+    try:
+        return registry_player(load_player_registry(nfl.get_current_season()), player_id)
+    except Exception:
+        return None
+
+
+def _headshot(identity: Optional[Dict[str, Any]], seasons: List[int], player_id: str, game_types: List[str]) -> Optional[str]:
+    """Registry headshot, else the first one in the player's weekly rows (blocking)."""
+    return (identity or {}).get("headshot_url") or first_headshot(player_rows(seasons, player_id, game_types))
+
+
+def _display_name(player: str, identity: Optional[Dict[str, Any]]) -> str:
+    if is_player_id(player) and identity and identity.get("name"):
+        return identity["name"]
+    return player.title()
+
+
+async def resolve_player_service(name: str, seasons: Optional[str] = None, game_types: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
+    """Ranked player_id candidates for a (possibly misspelled or nicknamed) name.
+    Defaults: seasons = last 10, game_types = REG,POST.
+    """
+    current_season = nfl.get_current_season()
+    season_list = _parse_seasons(seasons, current_season) if seasons else _last_n_seasons(10, current_season)
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+    try:
+        resolver = await run_in_threadpool(load_name_resolver, season_list, game_type_list)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load players: {str(e)}", "candidates": []}
+    candidates = rank_candidates(resolver, name, limit)
+    return {"status": "success", "query": name, "count": len(candidates), "candidates": candidates}
 
 
 async def get_player_career_service(
@@ -365,116 +292,44 @@ async def get_player_career_service(
 
     # First try player-level stats (more robust: includes player_id)
     try:
-        def _load_stats():
-            # Load player stats without stat_type filter - get all positions
-            return nfl.load_player_stats(season_list)
-        stats = await run_in_threadpool(_load_stats)
-        
-        cols = stats.columns
-        # Filter by game types if column exists
-        if "season_type" in cols:
-            stats = stats.filter(pl.col("season_type").is_in(game_type_list))
-        
-        # Match by player name (try multiple column names)
-        name_l = player_name.strip().lower()
-        
-        conds = []
-        if "player_display_name" in cols:
-            conds.append(pl.col("player_display_name").str.to_lowercase() == name_l)
-        if "player_name" in cols:
-            conds.append(pl.col("player_name").str.to_lowercase() == name_l)
-        
-        st = stats
-        if conds:
-            st = stats.filter(conds[0] if len(conds)==1 else conds[0] | conds[1])
-        
-        # If not found, try fuzzy: first+last tokens in order
-        if st.height == 0 and ("player_display_name" in cols or "player_name" in cols):
-            import re as _re
-            tokens = [tok for tok in _re.split(r"\s+", player_name.strip()) if tok]
-            first = tokens[0] if tokens else player_name.strip()
-            last = tokens[-1] if tokens else player_name.strip()
-            patt = rf"(?i)\b{_re.escape(first)}\b.*\b{_re.escape(last)}\b"
-            cond_list = []
-            if "player_display_name" in cols:
-                cond_list.append(pl.col("player_display_name").str.contains(patt))
-            if "player_name" in cols:
-                cond_list.append(pl.col("player_name").str.contains(patt))
-            if cond_list:
-                st = stats.filter(cond_list[0] if len(cond_list)==1 else cond_list[0] | cond_list[1])
-        
-        chosen_player_id = None
-        headshot = None
-        if "player_id" in st.columns and st.height > 0:
-            # Choose most frequent player_id (prioritize by most recent activity)
-            # Group by player_id and get the one with most recent games
-            st_pd_temp = st.to_pandas()
-            if "season" in st_pd_temp.columns and "player_id" in st_pd_temp.columns:
-                # Get player_id with most recent activity
-                grouped = st_pd_temp.groupby("player_id").agg({
-                    "season": ["max", "count"]
-                }).reset_index()
-                grouped.columns = ["player_id", "latest_season", "game_count"]
-                # Sort by latest season desc, then by game count desc
-                grouped = grouped.sort_values(["latest_season", "game_count"], ascending=[False, False])
-                chosen_player_id = grouped.iloc[0]["player_id"] if len(grouped) > 0 else None
-            else:
-                # Fallback: most frequent player_id
-                pid_rows = st.select(pl.col("player_id")).to_series().to_list()
-                freq = {}
-                for pid in pid_rows:
-                    if pid is None:
-                        continue
-                    freq[pid] = freq.get(pid, 0) + 1
-                chosen_player_id = max(freq, key=freq.get) if freq else None
-            
-            if chosen_player_id:
-                st = st.filter(pl.col("player_id") == chosen_player_id)
-                
-                # Get headshot URL
-                if "headshot_url" in st.columns:
-                    headshot_series = st.select(pl.col("headshot_url")).to_series()
-                    headshot = next((url for url in headshot_series if url and str(url) != "None"), None)
-
-        if st.height > 0:
-            # Convert to pandas and use helper to aggregate
-            st_pd = st.to_pandas()
-            result = _aggregate_player_stats(st_pd, chosen_player_id, headshot)
-            
+        def _lookup():
+            # Registry namesakes with sums in these seasons first, so only the persisted season blocks are read;
+            # the fuzzy resolver (which loads the weekly stores) only runs when the registry has no usable match
+            for pid in _registry_ids(player_name):
+                sums = player_season_sums(season_list, pid, game_type_list)
+                if sums.height > 0:
+                    return pid, sums
+            candidates = [] if is_player_id(player_name) else _player_ids(player_name, season_list, game_type_list)
+            if not candidates:
+                return None, pl.DataFrame()
+            return candidates[0], player_season_sums(season_list, candidates[0], game_type_list)
+
+        chosen_player_id, sums = await run_in_threadpool(_lookup)
+
+        if sums.height > 0:
+            identity = await run_in_threadpool(_identity, chosen_player_id)
+            headshot = (identity or {}).get("headshot_url")
+            seasons_out, aggregate, _ = _blocks_from_season_sums(sums)
+
             return {
                 "status": "success",
-                "player": player_name.title(),
-                "player_id": result["player_id"],
-                "headshot_url": result["headshot_url"],
+                "player": _display_name(player_name, identity),
+                "player_id": chosen_player_id,
+                "headshot_url": headshot,
                 "game_types": game_type_list,
-                "seasons": result["seasons"],
-                "aggregate": result["aggregate"],
+                "seasons": seasons_out,
+                "aggregate": aggregate,
             }
     except Exception:
         pass
 
-    # Fallback to PBP if player_stats is unavailable
-    def _load_pbp():
-        return nfl.load_pbp(season_list)
+    # Fallback to PBP if player_stats is unavailable: only this player's plays, via the PBP index
+    def _load_plays():
+        ids = [player_name.strip()] if is_player_id(player_name) else pbp_player_ids(season_list, player_name)
+        return {role: player_plays(season_list, ids, role, game_type_list) for role in ("receiver", "rusher", "passer")}
 
-    pbp = await run_in_threadpool(_load_pbp)
-
-    # Filter by season type (regular/post/pre)
-    if "season_type" in pbp.columns:
-        pbp = pbp.filter(pl.col("season_type").is_in(game_type_list))
-    elif "game_type" in pbp.columns:
-        pbp = pbp.filter(pl.col("game_type").is_in(game_type_list))
-
-    # Strict full name (case-insensitive) to avoid mixing (e.g., Tyreek vs Taysom Hill)
-    name_eq = player_name.strip().lower()
-
-    def name_condition(column: str):
-        return pl.col(column).str.to_lowercase() == name_eq
-
-    cols = pbp.columns
-    rec_df = pbp.filter(name_condition("receiver_player_name")) if "receiver_player_name" in cols else pbp.head(0)
-    rush_df = pbp.filter(name_condition("rusher_player_name")) if "rusher_player_name" in cols else pbp.head(0)
-    pass_df = pbp.filter(name_condition("passer_player_name")) if "passer_player_name" in cols else pbp.head(0)
+    plays = await run_in_threadpool(_load_plays)
+    rec_df, rush_df, pass_df = plays["receiver"], plays["rusher"], plays["passer"]
 
     rec_pd = rec_df.to_pandas() if rec_df.height > 0 else None
     rush_pd = rush_df.to_pandas() if rush_df.height > 0 else None
@@ -665,275 +520,385 @@ async def get_player_career_service(
         },
     }
 
+def _pick_vs_player(candidates: List[str], season_list: List[int], game_types: List[str], opponent: Optional[str] = None):
+    """(player_id, per opponent/season sums) of the candidate with the most recent, then most, games (blocking)."""
+    found = [(pid, player_vs_sums(season_list, pid, game_types, opponent)) for pid in candidates]
+    found = [(pid, sums) for pid, sums in found if not sums.is_empty()]
+    if not found:
+        return None, pl.DataFrame()
+    # Among same-name players, prefer the one with the most recent games
+    return min(found, key=lambda f: (-f[1]["season"].max(), -f[1]["games"].sum(), f[0]))
+
+
 async def get_player_vs_team_service(
     player_name: str,
     team: str,
     seasons: Optional[str],
     game_types: Optional[str] = None
 ):
-    """Player stats vs specific team using load_player_stats for accuracy.
+    """Player stats vs specific team, looked up in the player x opponent matrix.
     Defaults: game_types = REG,POST
     """
     current_season = nfl.get_current_season()
     season_list = _parse_seasons(seasons, current_season)
     game_type_list = _parse_game_types(game_types or "REG,POST")
-    
-    # Use load_player_stats (same as career)
+    team_abbr = team.upper()
+
     try:
-        def _load_stats():
-            return nfl.load_player_stats(season_list)
-        
-        stats = await run_in_threadpool(_load_stats)
-        
-        cols = stats.columns
-        # Filter by game types
-        if "season_type" in cols:
-            stats = stats.filter(pl.col("season_type").is_in(game_type_list))
-        
-        # Filter by opponent_team
-        if "opponent_team" in cols:
-            stats = stats.filter(pl.col("opponent_team") == team.upper())
-        else:
-            # If opponent_team not available, return not found
-            return {
-                "status": "not_found",
-                "message": f"opponent_team column not available",
-                "player": player_name,
-                "team": team.upper(),
-            }
-        
-        # Match by player name (exact or fuzzy)
-        name_l = player_name.strip().lower()
-        
-        conds = []
-        if "player_display_name" in cols:
-            conds.append(pl.col("player_display_name").str.to_lowercase() == name_l)
-        if "player_name" in cols:
-            conds.append(pl.col("player_name").str.to_lowercase() == name_l)
-        
-        st = stats
-        if conds:
-            st = stats.filter(conds[0] if len(conds)==1 else conds[0] | conds[1])
-        
-        # If not found, try fuzzy: first+last tokens in order
-        if st.height == 0 and ("player_display_name" in cols or "player_name" in cols):
-            import re as _re
-            tokens = [tok for tok in _re.split(r"\s+", player_name.strip()) if tok]
-            first = tokens[0] if tokens else player_name.strip()
-            last = tokens[-1] if tokens else player_name.strip()
-            patt = rf"(?i)\b{_re.escape(first)}\b.*\b{_re.escape(last)}\b"
-            cond_list = []
-            if "player_display_name" in cols:
-                cond_list.append(pl.col("player_display_name").str.contains(patt))
-            if "player_name" in cols:
-                cond_list.append(pl.col("player_name").str.contains(patt))
-            if cond_list:
-                st = stats.filter(cond_list[0] if len(cond_list)==1 else cond_list[0] | cond_list[1])
-        
-        if st.height == 0:
+        def _lookup():
+            candidates = _player_ids(player_name, season_list, game_type_list)
+            return _pick_vs_player(candidates, season_list, game_type_list, team_abbr)
+
+        chosen_player_id, sums = await run_in_threadpool(_lookup)
+        if sums.is_empty():
             return {
                 "status": "not_found",
                 "message": f"No data found for {player_name} vs {team}",
                 "player": player_name,
-                "team": team.upper(),
-            }
-        
-        chosen_player_id = None
-        headshot = None
-        if "player_id" in st.columns and st.height > 0:
-            # Choose most frequent player_id (prioritize by most recent activity)
-            st_pd_temp = st.to_pandas()
-            if "season" in st_pd_temp.columns and "player_id" in st_pd_temp.columns:
-                # Get player_id with most recent activity
-                grouped = st_pd_temp.groupby("player_id").agg({
-                    "season": ["max", "count"]
-                }).reset_index()
-                grouped.columns = ["player_id", "latest_season", "game_count"]
-                # Sort by latest season desc, then by game count desc
-                grouped = grouped.sort_values(["latest_season", "game_count"], ascending=[False, False])
-                chosen_player_id = grouped.iloc[0]["player_id"] if len(grouped) > 0 else None
-            else:
-                # Fallback: most frequent player_id
-                pid_rows = st.select(pl.col("player_id")).to_series().to_list()
-                freq = {}
-                for pid in pid_rows:
-                    if pid is None:
-                        continue
-                    freq[pid] = freq.get(pid, 0) + 1
-                chosen_player_id = max(freq, key=freq.get) if freq else None
-            
-            if chosen_player_id:
-                st = st.filter(pl.col("player_id") == chosen_player_id)
-                
-                # Get headshot URL
-                if "headshot_url" in st.columns:
-                    headshot_series = st.select(pl.col("headshot_url")).to_series()
-                    headshot = next((url for url in headshot_series if url and str(url) != "None"), None)
-        
-        if st.height > 0:
-            # Convert to pandas and use helper to aggregate
-            st_pd = st.to_pandas()
-            result = _aggregate_player_stats(st_pd, chosen_player_id, headshot)
-            
-            return {
-                "status": "success",
-                "player": player_name.title(),
-                "player_id": result["player_id"],
-                "headshot_url": result["headshot_url"],
-                "opponent_team": team.upper(),
-                "game_types": game_type_list,
-                "games": result["total_games"],
-                "seasons": result["seasons"],
-                "aggregate": result["aggregate"],
+                "team": team_abbr,
             }
+
+        identity = await run_in_threadpool(_identity, chosen_player_id)
+        headshot = await run_in_threadpool(_headshot, identity, season_list, chosen_player_id, game_type_list)
+        seasons_out, aggregate, _ = _blocks_from_season_sums(sums.drop("opponent_team"))
+
+        return {
+            "status": "success",
+            "player": _display_name(player_name, identity),
+            "player_id": chosen_player_id,
+            "headshot_url": headshot,
+            "opponent_team": team_abbr,
+            "game_types": game_type_list,
+            "games": int(sums["games"].sum()),
+            "seasons": seasons_out,
+            "aggregate": aggregate,
+        }
     except Exception as e:
         # If player_stats fails, return error
         return {
             "status": "error",
             "message": f"Failed to load player stats: {str(e)}",
             "player": player_name,
-            "team": team.upper(),
+            "team": team_abbr,
         }
 
 
-async def search_players_service(query: str, seasons: Optional[str], game_types: Optional[str] = None):
+async def get_player_vs_all_service(
+    player_name: str,
+    seasons: Optional[str],
+    game_types: Optional[str] = None
+):
+    """Player splits against every opponent faced, from the player x opponent matrix.
+    Defaults: game_types = REG,POST
+    """
     current_season = nfl.get_current_season()
     season_list = _parse_seasons(seasons, current_season)
-    game_type_list = _parse_game_types(game_types)
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+
+    try:
+        def _lookup():
+            candidates = _player_ids(player_name, season_list, game_type_list)
+            return _pick_vs_player(candidates, season_list, game_type_list)
+
+        chosen_player_id, sums = await run_in_threadpool(_lookup)
+        if sums.is_empty():
+            return {"status": "not_found", "message": f"No data found for {player_name}", "player": player_name}
+
+        identity = await run_in_threadpool(_identity, chosen_player_id)
+        opponents = []
+        for (opp,), part in sorted(sums.partition_by("opponent_team", as_dict=True).items()):
+            seasons_out, aggregate, _ = _blocks_from_season_sums(part.drop("opponent_team"))
+            opponents.append({
+                "opponent_team": opp,
+                "games": int(part["games"].sum()),
+                "seasons": seasons_out,
+                "aggregate": aggregate,
+            })
+
+        return {
+            "status": "success",
+            "player": _display_name(player_name, identity),
+            "player_id": chosen_player_id,
+            "headshot_url": (identity or {}).get("headshot_url"),
+            "game_types": game_type_list,
+            "count": len(opponents),
+            "opponents": opponents,
+        }
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load player stats: {str(e)}", "player": player_name}
+
+
+async def get_player_hit_rates_service(
+    player: str,
+    stat: str,
+    lines: Optional[str] = None,
+    seasons: Optional[str] = None,
+    game_types: Optional[str] = None,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent: Optional[str] = None,
+    scoring: Optional[str] = None,
+):
+    """Over/under/push counts of a prop stat against one or more lines, from the player's game logs.
+    Defaults: seasons = last 3, game_types = REG,POST, lines = median rounded to the next half point.
+    stat "fantasy" is scored with the `scoring` profile (default ppr).
+    """
+    stat_key = (stat or "").strip().lower()
+    if stat_key not in PROP_STATS and stat_key != FANTASY_STAT:
+        return {"status": "error", "message": f"Unknown stat '{stat}'", "stats": list(PROP_STATS) + [FANTASY_STAT]}
+    current_season = nfl.get_current_season()
+    season_list = _parse_seasons(seasons, current_season) if seasons else _last_n_seasons(3, current_season)
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+
+    try:
+        def _lookup():
+            candidates = _player_ids(player, season_list, game_type_list)
+            if not candidates:
+                return None, pl.DataFrame()
+            logs = game_logs(season_list, candidates[:1])
+            if stat_key == FANTASY_STAT:
+                logs = with_fantasy(logs, season_list, parse_scoring(scoring))
+            return candidates[0], select_game_logs(logs, game_type_list, last_n=last_n, venue=venue, opponent=opponent)
+
+        player_id, logs = await run_in_threadpool(_lookup)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load game logs: {str(e)}", "player": player, "stat": stat_key}
+
+    if player_id is None:
+        return {"status": "not_found", "message": f"No player found for {player}", "player": player, "stat": stat_key}
+
+    values = logs[stat_key].drop_nulls() if not logs.is_empty() else pl.Series(stat_key, [], dtype=pl.Float64)
+    line_list = parse_numbers(lines or "")
+    if not line_list and values.len():
+        line_list = [math.floor(values.median()) + 0.5]
+
+    identity = await run_in_threadpool(_identity, player_id)
+    log_cols = ["season", "week", "season_type", "opponent_team", "venue", "gameday"]
+    return {
+        "status": "success",
+        "player": _display_name(player, identity),
+        "player_id": player_id,
+        "stat": stat_key,
+        "seasons": season_list,
+        "game_types": game_type_list,
+        "filters": {"last_n": last_n, "venue": venue, "opponent": opponent.upper() if opponent else None, "scoring": scoring},
+        "games": int(values.len()),
+        "average": round(float(values.mean()), 2) if values.len() else None,
+        "median": float(values.median()) if values.len() else None,
+        "lines": count_lines(values, line_list),
+        "log": logs.select(log_cols + [pl.col(stat_key).alias("value")]).to_dicts() if not logs.is_empty() else [],
+    }
 
-    def _load_pbp():
-        return nfl.load_pbp(season_list)
-
-    pbp = await run_in_threadpool(_load_pbp)
-
-    # Filter by season type
-    if "season_type" in pbp.columns:
-        pbp = pbp.filter(pl.col("season_type").is_in(game_type_list))
-    elif "game_type" in pbp.columns:
-        pbp = pbp.filter(pl.col("game_type").is_in(game_type_list))
-
-    pattern = f"(?i){re.escape(query)}"
-
-    # Search across multiple name columns
-    name_cols = [c for c in [
-        "receiver_player_name",
-        "rusher_player_name",
-        "passer_player_name"
-    ] if c in pbp.columns]
-
-    if not name_cols:
-        return {"status": "success", "count": 0, "players": []}
-
-    cond = None
-    for col in name_cols:
-        c = pl.col(col).str.contains(pattern)
-        cond = c if cond is None else (cond | c)
-
-    subset = pbp.filter(cond)
-    # Gather unique names with counts
-    rows = []
-    for col in name_cols:
-        if col in subset.columns:
-            names = subset.select(pl.col(col)).drop_nulls().to_series().to_list()
-            rows.extend(names)
-
-    # Count and return unique names sorted
-    counts = {}
-    for n in rows:
-        key = n.strip()
-        if not key:
+
+async def get_players_gamelogs_service(
+    ids: str,
+    stats: Optional[str] = None,
+    last_n: int = 10,
+    seasons: Optional[str] = None,
+    game_types: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """Compact per-game arrays (oldest first) of a few stats for many players, e.g. for sparklines.
+    Pages go back in time per player: `cursor` takes "pid:season-week" pairs (the top-level
+    next_cursor pages every player that has more; ids it omits are finished), or a bare player next_cursor with a single id.
+    Defaults: stats = fantasy_points_ppr, seasons = last 10, game_types = REG,POST.
+    """
+    player_ids = list(dict.fromkeys(p.strip() for p in (ids or "").split(",") if p.strip()))
+    if len(player_ids) > 100:
+        return {"status": "error", "message": "At most 100 ids per request", "players": []}
+    stat_list = list(dict.fromkeys(s.strip().lower() for s in (stats or "").split(",") if s.strip())) or ["fantasy_points_ppr"]
+    unknown = [s for s in stat_list if s not in PROP_STATS]
+    if unknown:
+        return {"status": "error", "message": f"Unknown stats: {', '.join(unknown)}", "stats": list(PROP_STATS)}
+    current_season = nfl.get_current_season()
+    season_list = _parse_seasons(seasons, current_season) if seasons else _last_n_seasons(10, current_season)
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+    valid_ids = [p for p in player_ids if is_player_id(p)]
+    try:
+        cursors = parse_cursors(cursor, player_ids)
+    except ValueError as e:
+        return {"status": "error", "message": str(e), "players": []}
+
+    def _load():
+        pages = page_game_logs(valid_ids, season_list, game_type_list, last_n, cursors)
+        registry = load_player_registry(current_season)
+        return pages, {pid: registry_player(registry, pid) for pid in valid_ids}
+
+    try:
+        pages, identities = await run_in_threadpool(_load)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load game logs: {str(e)}", "players": []}
+
+    players = []
+    for pid in player_ids:
+        rows, more = pages.get(pid, (pl.DataFrame(), False))
+        identity = identities.get(pid) or {}
+        if rows.is_empty():
+            players.append({"player_id": pid, "name": identity.get("name"), "games": 0, "next_cursor": None})
             continue
-        counts[key] = counts.get(key, 0) + 1
+        oldest = rows.row(0, named=True)
+        players.append({
+            "player_id": pid,
+            "name": identity.get("name") or rows["player_name"][-1],
+            "position": identity.get("position") or rows["position"][-1],
+            "games": rows.height,
+            "next_cursor": game_cursor(oldest["season"], oldest["week"]) if more else None,
+            "season": rows["season"].to_list(),
+            "week": rows["week"].to_list(),
+            "opponent": rows["opponent_team"].to_list(),
+            "stats": {s: rows[s].to_list() for s in stat_list},
+        })
+    return {
+        "status": "success",
+        "seasons": season_list,
+        "game_types": game_type_list,
+        "stats": stat_list,
+        "last_n": last_n,
+        "cursor": cursor,
+        "next_cursor": ",".join(f"{p['player_id']}:{p['next_cursor']}" for p in players if p["next_cursor"]) or None,
+        "players": players,
+    }
 
-    players = [
-        {"name": name, "count": counts[name]}
-        for name in sorted(counts.keys(), key=lambda k: counts[k], reverse=True)
-    ][:50]
 
+async def get_player_similar_service(
+    player: str,
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    limit: int = 10,
+    metric: str = "cosine",
+):
+    """Players whose standardised per-game profile is closest to this player's within their position group.
+    Defaults: season = current, game_types = REG,POST, metric = cosine (or euclidean).
+    """
+    current_season = nfl.get_current_season()
+    season_val = int(season) if season else int(current_season)
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+    metric_key = "euclidean" if (metric or "").lower() == "euclidean" else "cosine"
+
+    def _lookup():
+        candidates = _player_ids(player, [season_val], game_type_list)
+        if not candidates:
+            return None, None, None
+        rows = player_rows([season_val], candidates[0], game_type_list)
+        groups = rows["position_group"].drop_nulls() if not rows.is_empty() and "position_group" in rows.columns else []
+        group = groups[-1] if len(groups) else None
+        if group not in SIMILAR_FEATURES:
+            return candidates[0], group, None
+        features = load_feature_matrix(season_val, group, game_type_list)
+        return candidates[0], group, features
+
+    try:
+        player_id, group, features = await run_in_threadpool(_lookup)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load player features: {str(e)}", "player": player}
+
+    if player_id is None:
+        return {"status": "not_found", "message": f"No player found for {player}", "player": player}
+    if features is None:
+        return {"status": "error", "message": f"No comparable players for position group {group}", "player": player, "player_id": player_id}
+    similar = nearest_players(features, player_id, limit, metric_key)
+    if similar is None:
+        return {
+            "status": "not_found",
+            "message": f"Fewer than the minimum games in {season_val} to compare",
+            "player": player,
+            "player_id": player_id,
+        }
+
+    identity = await run_in_threadpool(_identity, player_id)
+    own = features["rates"].row(features["index"][player_id], named=True)
+    own.pop("player_id")
+    return {
+        "status": "success",
+        "player": _display_name(player, identity),
+        "player_id": player_id,
+        "season": season_val,
+        "game_types": game_type_list,
+        "position_group": group,
+        "metric": metric_key,
+        "features": features["features"],
+        "rates": own,
+        "similar": similar.to_dicts(),
+    }
+
+
+async def get_player_usage_service(
+    player: str,
+    seasons: Optional[str] = None,
+    game_types: Optional[str] = None,
+    window: Optional[int] = None,
+):
+    """Game-by-game target/carry/air-yards/red-zone/snap shares, with rolling shares over `window` games.
+    Defaults: seasons = current, game_types = REG,POST.
+    """
+    current_season = nfl.get_current_season()
+    season_list = _parse_seasons(seasons, current_season) if seasons else [current_season]
+    game_type_list = _parse_game_types(game_types or "REG,POST")
+
+    try:
+        def _lookup():
+            candidates = _player_ids(player, season_list, game_type_list)
+            if not candidates:
+                return None, pl.DataFrame()
+            return candidates[0], player_usage(season_list, candidates[0], ",".join(game_type_list), window)
+
+        player_id, rows = await run_in_threadpool(_lookup)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load usage: {str(e)}", "player": player}
+
+    if player_id is None:
+        return {"status": "not_found", "message": f"No player found for {player}", "player": player}
+
+    identity = await run_in_threadpool(_identity, player_id)
+    return {
+        "status": "success",
+        "player": _display_name(player, identity),
+        "player_id": player_id,
+        "seasons": season_list,
+        "game_types": game_type_list,
+        "window": window,
+        "games": rows.height,
+        "weeks": rows.to_dicts(),
+    }
+
+
+async def search_players_service(query: str, seasons: Optional[str], game_types: Optional[str] = None):
+    current_season = nfl.get_current_season()
+    season_list = _parse_seasons(seasons, current_season)
+    game_type_list = _parse_game_types(game_types)
+
+    # Names come from the per-season PBP index instead of scanning every play
+    players = await run_in_threadpool(search_pbp_names, season_list, query, game_type_list, 50)
     return {"status": "success", "count": len(players), "players": players}
 
 
 async def search_players_service(query: str, limit: int = 20) -> Dict[str, Any]:
     """Search for players by name with normalized fuzzy matching.
     Returns player_id, name, position, team, and headshot for autocomplete/disambiguation.
-    Normalizes both query and names to ignore apostrophes, accents, etc.
+    Served from the prebuilt name index (current and previous season).
     """
     if not query or len(query.strip()) < 2:
         return {"status": "error", "message": "Query must be at least 2 characters", "results": []}
-    
-    # Normalize query for flexible matching
-    query_normalized = _normalize_text(query.strip())
+
     current_season = nfl.get_current_season()
-    
+
     try:
-        # Load player stats for recent seasons to get active players
-        def _load_stats():
-            return nfl.load_player_stats([current_season, current_season - 1])
-        
-        stats = await run_in_threadpool(_load_stats)
-        
-        # Filter by name match (contains query)
-        if "player_display_name" not in stats.columns:
+        index = await run_in_threadpool(load_search_index, current_season)
+        if not index["entries"]:
             return {"status": "error", "message": "Player data unavailable", "results": []}
-        
-        # Convert to pandas for easier string manipulation with normalization
-        df = stats.to_pandas()
-        
-        # Create normalized name column
-        df['name_normalized'] = df['player_display_name'].apply(lambda x: _normalize_text(str(x)) if pd.notna(x) else "")
-        
-        # Filter matches: normalized name contains normalized query
-        df = df[df['name_normalized'].str.contains(query_normalized, case=False, na=False)]
-        
-        if df.empty:
-            return {"status": "success", "results": []}
-        
-        # Convert back to polars for consistency
-        matches = pl.from_pandas(df)
-        
-        if matches.height == 0:
-            return {"status": "success", "results": []}
-        
-        # Convert to pandas for easier grouping
-        df = matches.to_pandas()
-        
-        # Group by player_id to get unique players with their latest info
-        if "player_id" not in df.columns:
+
+        results = search_index(index, query, limit)
+        if not results:
             return {"status": "success", "results": []}
-        
-        # For each player_id, get most recent season data
-        results = []
-        seen_ids = set()
-        
-        for _, row in df.sort_values(["season", "week"], ascending=[False, False]).iterrows():
-            pid = row.get("player_id")
-            if not pid or pid in seen_ids:
-                continue
-            
-            seen_ids.add(pid)
-            
-            player_info = {
-                "player_id": pid,
-                "name": row.get("player_display_name") or row.get("player_name", "Unknown"),
-                "position": row.get("position", ""),
-                "position_group": row.get("position_group", ""),
-                "team": row.get("team", ""),
-                "headshot_url": row.get("headshot_url") if pd.notna(row.get("headshot_url")) else None,
-                "season": int(row.get("season", 0)) if pd.notna(row.get("season")) else None,
-            }
-            
-            results.append(player_info)
-            
-            if len(results) >= limit:
-                break
-        
+
         return {
             "status": "success",
             "query": query,
             "count": len(results),
             "results": results
         }
-        
+
     except Exception as e:
         return {
             "status": "error",
@@ -942,218 +907,20 @@ async def search_players_service(query: str, limit: int = 20) -> Dict[str, Any]:
         }
 
 
-async def get_player_ranks_service(season: Optional[int] = None, game_types: Optional[str] = None) -> Dict[str, Any]:
+async def get_player_ranks_service(
+    season: Optional[int] = None, game_types: Optional[str] = None, scoring: Optional[str] = None
+) -> Dict[str, Any]:
     """Get player rankings for season (default current) by position.
-    Returns rankings for QB, RB, and WR/TE metrics.
+    Each row carries <metric>_rank (1 = best) and <metric>_pctile for its group's metrics;
+    fantasy metrics use the `scoring` profile (default ppr).
     """
     current_season = nfl.get_current_season()
     target_season = season if season else current_season
-    
-    # Parse game_types
     game_type_list = _parse_game_types(game_types or "REG,POST")
-    
+
     try:
-        def _load_stats():
-            return nfl.load_player_stats([target_season])
-        
-        stats = await run_in_threadpool(_load_stats)
-        
-        # Filter by game types
-        if "season_type" in stats.columns:
-            stats = stats.filter(pl.col("season_type").is_in(game_type_list))
-        
-        # Convert to pandas for easier aggregation
-        df = stats.to_pandas()
-        
-        if df.empty:
-            return {"status": "success", "season": target_season, "qb": [], "rb": [], "wr_te": [], "def": []}
-        
-        # Group by player_id and aggregate stats
-        # QB Rankings (passing stats)
-        qb_df = df[df["passing_yards"].notna() & (df["passing_yards"] > 0)].copy()
-        if not qb_df.empty:
-            # Check which sack columns exist
-            sack_col = None
-            sack_yds_col = None
-            for col in df.columns:
-                if col in ["sacks_suffered", "sacks"] and sack_col is None:
-                    sack_col = col
-                if col in ["sack_yards_lost", "sack_yards"] and sack_yds_col is None:
-                    sack_yds_col = col
-            
-            agg_dict = {
-                "week": "nunique",  # games
-                "passing_yards": "sum",
-                "passing_tds": "sum",
-                "attempts": "sum",
-                "completions": "sum",
-                "passing_interceptions": "sum",
-            }
-            if sack_col:
-                agg_dict[sack_col] = "sum"
-            if sack_yds_col:
-                agg_dict[sack_yds_col] = "sum"
-            
-            qb_agg = qb_df.groupby(["player_id", "player_display_name"]).agg(agg_dict).reset_index()
-            
-            # Rename columns
-            col_names = ["player_id", "player_name", "games", "yards_total", "td_total", "attempts_total", "completions_total", "interceptions"]
-            if sack_col:
-                col_names.append("sacks_total")
-            if sack_yds_col:
-                col_names.append("sack_yards_total")
-            qb_agg.columns = col_names
-            
-            qb_agg["yards_per_game"] = (qb_agg["yards_total"] / qb_agg["games"]).round(1)
-            qb_agg["attempts_per_game"] = (qb_agg["attempts_total"] / qb_agg["games"]).round(1)
-            qb_agg["completions_per_game"] = (qb_agg["completions_total"] / qb_agg["games"]).round(1)
-            qb_agg["yards_per_attempt"] = (qb_agg["yards_total"] / qb_agg["attempts_total"]).round(2)
-            qb_agg["td_per_game"] = (qb_agg["td_total"] / qb_agg["games"]).round(2)
-            
-            # Add sack metrics if data exists
-            if sack_col:
-                qb_agg["sacks_per_game"] = (qb_agg["sacks_total"] / qb_agg["games"]).round(2)
-            if sack_yds_col and sack_col:
-                qb_agg["yards_per_sack"] = (qb_agg["sack_yards_total"] / qb_agg["sacks_total"]).fillna(0).round(1)
-            
-            # Filter: min 75 attempts (allows QBs with fewer games to qualify)
-            qb_agg = qb_agg[qb_agg["attempts_total"] >= 75]
-            qb_ranks = qb_agg.to_dict("records")
-        else:
-            qb_ranks = []
-        
-        # RB Rankings (rushing stats)
-        rb_df = df[df["rushing_yards"].notna() & (df["rushing_yards"] > 0)].copy()
-        if not rb_df.empty:
-            rb_agg = rb_df.groupby(["player_id", "player_display_name"]).agg({
-                "week": "nunique",
-                "rushing_yards": "sum",
-                "rushing_tds": "sum",
-                "carries": "sum",
-            }).reset_index()
-            rb_agg.columns = ["player_id", "player_name", "games", "yards_total", "td_total", "attempts_total"]
-            rb_agg["yards_per_game"] = (rb_agg["yards_total"] / rb_agg["games"]).round(1)
-            rb_agg["attempts_per_game"] = (rb_agg["attempts_total"] / rb_agg["games"]).round(1)
-            rb_agg["yards_per_carry"] = (rb_agg["yards_total"] / rb_agg["attempts_total"]).round(2)
-            
-            # Filter: min 35 carries (allows QBs like Mahomes to qualify)
-            rb_agg = rb_agg[rb_agg["attempts_total"] >= 35]
-            rb_ranks = rb_agg.to_dict("records")
-        else:
-            rb_ranks = []
-        
-        # WR/TE Rankings (receiving stats)
-        wr_df = df[df["receiving_yards"].notna() & (df["receiving_yards"] > 0)].copy()
-        if not wr_df.empty:
-            wr_agg = wr_df.groupby(["player_id", "player_display_name"]).agg({
-                "week": "nunique",
-                "receiving_yards": "sum",
-                "receiving_tds": "sum",
-                "targets": "sum",
-                "receptions": "sum",
-            }).reset_index()
-            wr_agg.columns = ["player_id", "player_name", "games", "yards_total", "td_total", "targets_total", "receptions_total"]
-            wr_agg["yards_per_game"] = (wr_agg["yards_total"] / wr_agg["games"]).round(1)
-            wr_agg["targets_per_game"] = (wr_agg["targets_total"] / wr_agg["games"]).round(1)
-            wr_agg["receptions_per_game"] = (wr_agg["receptions_total"] / wr_agg["games"]).round(1)
-            wr_agg["yards_per_reception"] = (wr_agg["yards_total"] / wr_agg["receptions_total"]).round(2)
-            wr_agg["yards_per_target"] = (wr_agg["yards_total"] / wr_agg["targets_total"]).round(2)
-            
-            # Filter: min 20 targets
-            wr_agg = wr_agg[wr_agg["targets_total"] >= 20]
-            wr_ranks = wr_agg.to_dict("records")
-        else:
-            wr_ranks = []
-        
-        # DEF Rankings (defensive stats)
-        def_df = df[(df["def_tackles_solo"].notna()) | (df["def_tackles_with_assist"].notna())].copy()
-        if not def_df.empty:
-            def_agg = def_df.groupby(["player_id", "player_display_name"]).agg({
-                "week": "nunique",  # games
-                "def_tackles_solo": "sum",
-                "def_tackles_with_assist": "sum",
-                "def_tackles_for_loss": "sum",
-                "def_qb_hits": "sum",
-                "def_sacks": "sum",
-                "def_sack_yards": "sum",
-                "def_interceptions": "sum",
-                "def_interception_yards": "sum",
-                "def_tds": "sum",
-                "def_fumbles": "sum",
-                "def_fumbles_forced": "sum",
-                "def_pass_defended": "sum",
-            }).reset_index()
-            def_agg.columns = ["player_id", "player_name", "games", "tackles_solo_total", "tackles_assist_total", "tfl_total", "qb_hits_total", "sacks_total", "sack_yards_total", "interceptions_total", "int_yards_total", "def_td", "fumbles_recovered", "fumbles_forced", "pass_defended"]
-            # Calculate total tackles = solo + assisted
-            def_agg["tackles_total"] = def_agg["tackles_solo_total"] + def_agg["tackles_assist_total"]
-            def_agg["tackles_per_game"] = (def_agg["tackles_total"] / def_agg["games"]).round(1)
-            def_agg["tackles_solo_per_game"] = (def_agg["tackles_solo_total"] / def_agg["games"]).round(1)
-            def_agg["tfl_per_game"] = (def_agg["tfl_total"] / def_agg["games"]).round(1)
-            def_agg["qb_hits_per_game"] = (def_agg["qb_hits_total"] / def_agg["games"]).round(1)
-            def_agg["sacks_per_game"] = (def_agg["sacks_total"] / def_agg["games"]).round(1)
-            def_agg["interceptions_per_game"] = (def_agg["interceptions_total"] / def_agg["games"]).round(1)
-            def_agg["yards_per_sack"] = (def_agg["sack_yards_total"] / def_agg["sacks_total"]).round(1).fillna(0)
-            
-            # Filter: min 3 total tackles
-            def_agg = def_agg[def_agg["tackles_total"] >= 3]
-            def_ranks = def_agg.to_dict("records")
-        else:
-            def_ranks = []
-        
-        # KICKER Rankings (kicking stats)
-        kick_ranks = []
-        try:
-            # Check if kicking columns exist
-            if "fg_made" in df.columns and "fg_att" in df.columns:
-                kick_df = df[(df["fg_made"].notna()) | (df["fg_att"].notna())].copy()
-            else:
-                kick_df = pl.DataFrame()  # Empty dataframe
-            
-            if not kick_df.is_empty():
-                # Need to aggregate individual kick attempts by distance
-                # For 50+ yardas, we'll sum fg_made from multiple columns
-                kick_agg = kick_df.groupby(["player_id", "player_display_name"]).agg({
-                    "week": "nunique",  # games
-                    "fg_made": "sum",
-                    "fg_att": "sum",
-                    "pat_made": "sum",
-                    "pat_att": "sum",
-                    "fg_made_30_39": "sum",
-                    "fg_made_40_49": "sum",
-                    "fg_made_50_plus": "sum",
-                }).reset_index()
-                kick_agg.columns = ["player_id", "player_name", "games", "fg_made", "fg_att", "pat_made", "pat_att", "fg_30_39", "fg_40_49", "fg_50_plus"]
-                
-                # Calculate percentages
-                kick_agg["fg_pct"] = (kick_agg["fg_made"] / kick_agg["fg_att"] * 100).round(1)
-                kick_agg["pat_pct"] = (kick_agg["pat_made"] / kick_agg["pat_att"] * 100).round(1)
-                
-                # For 50+ bucket: sum 50-59 and 60+ if they exist as separate columns
-                if "fg_made_50_59" in kick_df.columns and "fg_made_60_" in kick_df.columns:
-                    extra_agg = kick_df.groupby(["player_id", "player_display_name"]).agg({
-                        "fg_made_50_59": "sum",
-                        "fg_made_60_": "sum"
-                    }).reset_index()
-                    kick_agg = kick_agg.merge(extra_agg, on=["player_id", "player_name"], how="left")
-                    kick_agg["fg_50_plus"] = kick_agg["fg_50_plus"].fillna(0) + kick_agg["fg_made_50_59"].fillna(0) + kick_agg["fg_made_60_"].fillna(0)
-                    kick_agg = kick_agg.drop(columns=["fg_made_50_59", "fg_made_60_"])
-                
-                # Filter: min 10 field goal attempts
-                kick_agg = kick_agg[kick_agg["fg_att"] >= 10]
-                kick_ranks = kick_agg.to_dict("records")
-        except Exception:
-            pass  # Skip kicking rankings if there's any error
-        
-        return {
-            "status": "success",
-            "season": target_season,
-            "qb": qb_ranks,
-            "rb": rb_ranks,
-            "wr_te": wr_ranks,
-            "def": def_ranks,
-            "kick": kick_ranks,
-        }
-        
+        ranks = await run_in_threadpool(load_player_ranks, target_season, game_type_list, current_season, scoring)
+        return {"status": "success", "season": target_season, **ranks}
     except Exception as e:
         return {
             "status": "error",
@@ -1165,5 +932,3 @@ async def get_player_ranks_service(season: Optional[int] = None, game_types: Opt
             "def": [],
             "kick": [],
         }
-
-
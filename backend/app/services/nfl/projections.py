@@ -0,0 +1,198 @@
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+
+import nflreadpy as nfl
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.defense_position import DVP_METRICS, load_dvp_weekly, select_dvp, summarize_dvp
+from app.services.nfl.lines import parse_numbers
+from app.services.nfl.player_gamelogs import PROP_STATS, game_logs, select_game_logs
+from app.services.nfl.props import VALID_GAME_TYPES, resolve_slate_players
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_DRAWS = 5000
+MAX_DRAWS = 20000
+
+# Opponent adjustment is the defense's allowed-per-game over the league's, kept within these bounds
+FACTOR_BOUNDS = (0.7, 1.3)
+
+
+def recency_weights(n: int, half_life: Optional[float]) -> np.ndarray:
+    """Sampling probabilities for n games ordered oldest first; uniform without a half-life."""
+    if not half_life or half_life <= 0:
+        return np.full(n, 1.0 / n)
+    age = np.arange(n - 1, -1, -1, dtype=np.float64)
+    w = 0.5 ** (age / float(half_life))
+    return w / w.sum()
+
+
+def bootstrap(values: np.ndarray, weights: np.ndarray, draws: int, rng: np.random.Generator, factor: float = 1.0) -> np.ndarray:
+    """`draws` next-game outcomes resampled from `values` with `weights` in one vectorised draw."""
+    return values[rng.choice(len(values), size=draws, p=weights)] * factor
+
+
+def item_rng(seed: int, player_id: str, stat: str, opponent: Optional[str]) -> np.random.Generator:
+    """Generator seeded from (seed, player, stat, opponent), so an item draws the same sample in any slate."""
+    digest = hashlib.sha1(f"{seed}:{player_id}:{stat}:{opponent or ''}".encode()).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+
+def summarize_draws(sample: np.ndarray, lines: Optional[List[float]] = None) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "mean": round(float(sample.mean()), 2),
+        "percentiles": {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(sample, PERCENTILES))},
+    }
+    if lines:
+        out["lines"] = {
+            str(line): {"over": round(float((sample > line).mean()), 3), "under": round(float((sample < line).mean()), 3)}
+            for line in lines
+        }
+    return out
+
+
+def dvp_factors(season: int, game_types: List[str]) -> Dict[Tuple[str, str, str], Tuple[float, int]]:
+    """(defense, position_group, stat) -> (allowed per game / league per game, games) for the DvP metrics (blocking)."""
+    summary = summarize_dvp(select_dvp(load_dvp_weekly(season), ",".join(game_types)))
+    if summary.is_empty():
+        return {}
+    metrics = [m for m in DVP_METRICS if f"{m}_per_game" in summary.columns]
+    ratios = summary.select(
+        ["defense", "position_group", "games"]
+        + [(pl.col(f"{m}_per_game") / pl.col(f"{m}_per_game").mean().over("position_group")).alias(m) for m in metrics]
+    )
+    low, high = FACTOR_BOUNDS
+    out: Dict[Tuple[str, str, str], Tuple[float, int]] = {}
+    for row in ratios.iter_rows(named=True):
+        for m in metrics:
+            if row[m] is not None and np.isfinite(row[m]):
+                out[(row["defense"], row["position_group"], m)] = (float(min(max(row[m], low), high)), int(row["games"]))
+    return out
+
+
+def project_slate(
+    items: List[Dict[str, Any]],
+    seasons: List[int],
+    game_types: List[str],
+    current_season: int,
+    *,
+    last_n: int = 16,
+    half_life: Optional[float] = None,
+    draws: int = DEFAULT_DRAWS,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Bootstrap next-game distributions for (player, stat[, opponent][, lines]) items (blocking).
+
+    Each item resamples the player's last `last_n` games (recency weighted when
+    `half_life` is set) with its own item_rng and scales the draws by the
+    opponent's defense-vs-position factor for that stat when an opponent is given.
+    """
+    if not items:
+        return []
+    players = sorted({str(i.get("player") or "").strip() for i in items} - {""})
+    ids = resolve_slate_players(players, seasons, game_types, current_season)
+    by_player = {r["player"]: (r["player_id"], r["name"]) for r in ids.iter_rows(named=True)}
+
+    pids = sorted({pid for pid, _ in by_player.values() if pid})
+    logs = select_game_logs(game_logs(seasons, pids), game_types, last_n=last_n) if pids else pl.DataFrame()
+    per_player = logs.partition_by("player_id", as_dict=True) if not logs.is_empty() else {}
+    factors = dvp_factors(current_season, game_types) if any(i.get("opponent") for i in items) else {}
+
+    out = []
+    for item in items:
+        player = str(item.get("player") or "").strip()
+        stat = str(item.get("stat") or "").strip().lower()
+        opponent = str(item.get("opponent") or "").strip().upper() or None
+        pid, name = by_player.get(player, (None, None))
+        row: Dict[str, Any] = {"player": player, "stat": stat, "opponent": opponent, "player_id": pid, "name": name}
+        if pid is None:
+            out.append({**row, "status": "not_found"})
+            continue
+        if stat not in PROP_STATS:
+            out.append({**row, "status": "unknown_stat"})
+            continue
+        games = per_player.get((pid,))
+        values = games[stat].drop_nulls().to_numpy().astype(np.float64) if games is not None else np.array([])
+        if not len(values):
+            out.append({**row, "status": "no_games", "games": 0})
+            continue
+
+        group = games["position_group"].drop_nulls()
+        factor, factor_games = factors.get((opponent, group[-1] if len(group) else None, stat), (1.0, None)) if opponent else (1.0, None)
+        sample = bootstrap(values, recency_weights(len(values), half_life), draws, item_rng(seed, pid, stat, opponent), factor)
+        out.append({
+            **row,
+            "status": "success",
+            "games": int(len(values)),
+            "average": round(float(values.mean()), 2),
+            "opponent_factor": round(factor, 3) if factor_games is not None else None,
+            **summarize_draws(sample, item.get("lines")),
+        })
+    return out
+
+
+def _settings(seasons: Optional[List[int]], game_types: Optional[List[str]], draws: Optional[int]) -> Tuple[int, List[int], List[str], int]:
+    current_season = int(nfl.get_current_season())
+    season_list = sorted({int(s) for s in seasons or [] if 1999 <= int(s) <= current_season})
+    season_list = season_list or [current_season - 1, current_season]
+    type_list = [t.upper() for t in game_types or [] if t.upper() in VALID_GAME_TYPES] or ["REG", "POST"]
+    draw_count = min(max(int(draws or DEFAULT_DRAWS), 100), MAX_DRAWS)
+    return current_season, season_list, type_list, draw_count
+
+
+async def project_slate_service(
+    items: List[Dict[str, Any]],
+    seasons: Optional[List[int]] = None,
+    game_types: Optional[List[str]] = None,
+    *,
+    last_n: int = 16,
+    half_life: Optional[float] = None,
+    draws: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Percentile ranges (P10..P90) of next-game stat lines for a slate.
+    Defaults: seasons = last 2, game_types = REG,POST, last 16 games, 5000 draws.
+    """
+    current_season, season_list, type_list, draw_count = _settings(seasons, game_types, draws)
+    try:
+        results = await run_in_threadpool(
+            lambda: project_slate(items, season_list, type_list, current_season, last_n=last_n, half_life=half_life, draws=draw_count)
+        )
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to project: {str(e)}", "results": []}
+
+    return {
+        "status": "success",
+        "seasons": season_list,
+        "game_types": type_list,
+        "settings": {"last_n": last_n, "half_life": half_life, "draws": draw_count},
+        "count": len(results),
+        "results": results,
+    }
+
+
+async def get_player_projection_service(
+    player: str,
+    stat: str,
+    opponent: Optional[str] = None,
+    lines: Optional[str] = None,
+    seasons: Optional[str] = None,
+    game_types: Optional[str] = None,
+    *,
+    last_n: int = 16,
+    half_life: Optional[float] = None,
+    draws: Optional[int] = None,
+) -> Dict[str, Any]:
+    """One player's next-game distribution (same engine as the slate); seasons/lines are comma separated."""
+    out = await project_slate_service(
+        [{"player": player, "stat": stat, "opponent": opponent, "lines": parse_numbers(lines or "")}],
+        [int(s) for s in parse_numbers(seasons or "")],
+        [t.strip() for t in (game_types or "").split(",") if t.strip()],
+        last_n=last_n, half_life=half_life, draws=draws,
+    )
+    if out["status"] != "success":
+        return out
+    result = out.pop("results")[0]
+    out.pop("count")
+    return {**out, **result}
@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional
+
+import nflreadpy as nfl
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.fantasy import FANTASY_STAT, parse_scoring, with_fantasy
+from app.services.nfl.player_gamelogs import PROP_STATS, game_logs, select_game_logs
+from app.services.nfl.player_registry import load_player_registry, registry_lookup
+from app.services.nfl.player_resolve import load_name_resolver, resolve_player_ids
+
+
+VALID_GAME_TYPES = ("REG", "POST", "PRE")
+SLATE_STATS = list(PROP_STATS) + [FANTASY_STAT]
+
+
+def resolve_slate_players(players: List[str], seasons: List[int], game_types: List[str], current_season: int) -> pl.DataFrame:
+    """player (as given) -> player_id/name: one registry join, then the fuzzy resolver for the rest."""
+    registry = load_player_registry(current_season)
+    hits = registry_lookup(registry, players)
+    found = hits.select([pl.col("query").alias("player"), "player_id", "name"]) if not hits.is_empty() else pl.DataFrame(schema={"player": pl.Utf8, "player_id": pl.Utf8, "name": pl.Utf8})
+
+    missing = sorted(set(players) - set(found["player"].to_list()))
+    if missing:
+        resolver = load_name_resolver(seasons, game_types)
+        names = {p["player_id"]: p["name"] for p in resolver["players"]}
+        extra = []
+        for player in missing:
+            ids = resolve_player_ids(resolver, player)
+            if ids:
+                extra.append({"player": player, "player_id": ids[0], "name": names.get(ids[0])})
+        if extra:
+            found = pl.concat([found, pl.DataFrame(extra, schema=found.schema)], how="vertical_relaxed")
+    return found
+
+
+def evaluate_props(
+    props: List[Dict[str, Any]],
+    seasons: List[int],
+    game_types: List[str],
+    current_season: int,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent: Optional[str] = None,
+    scoring: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Grade a whole slate of (player, stat, line) props in one join and group_by (blocking).
+
+    The "fantasy" stat is scored with the `scoring` profile (see fantasy.parse_scoring).
+    """
+    if not props:
+        return []
+    slate = pl.DataFrame({
+        "player": [str(p.get("player") or "").strip() for p in props],
+        "stat": [str(p.get("stat") or "").strip().lower() for p in props],
+        "line": [p.get("line") for p in props],
+    }, schema={"player": pl.Utf8, "stat": pl.Utf8, "line": pl.Float64}).with_row_index("idx")
+
+    players = slate.filter(pl.col("player") != "")["player"].unique().to_list()
+    ids = resolve_slate_players(players, seasons, game_types, current_season)
+    slate = slate.join(ids, on="player", how="left")
+
+    valid = slate.filter(pl.col("player_id").is_not_null() & pl.col("stat").is_in(SLATE_STATS) & pl.col("line").is_not_null())
+    stats = valid["stat"].unique().to_list()
+    logs = select_game_logs(
+        game_logs(seasons, valid["player_id"].unique().to_list()),
+        game_types, last_n=last_n, venue=venue, opponent=opponent,
+    )
+    if FANTASY_STAT in stats:
+        logs = with_fantasy(logs, seasons, parse_scoring(scoring))
+    if logs.is_empty() or not stats:
+        values = pl.DataFrame(schema={"player_id": pl.Utf8, "stat": pl.Utf8, "value": pl.Float64})
+    else:
+        values = logs.select(["player_id"] + stats).unpivot(index="player_id", on=stats, variable_name="stat", value_name="value")
+
+    value = pl.col("value")
+    graded = valid.join(values, on=["player_id", "stat"], how="left").group_by("idx").agg([
+        value.count().alias("games"),
+        (value > pl.col("line")).sum().alias("over"),
+        (value < pl.col("line")).sum().alias("under"),
+        (value == pl.col("line")).sum().alias("push"),
+        value.mean().round(2).alias("average"),
+        value.median().alias("median"),
+    ])
+    decided = pl.col("over") + pl.col("under")
+    out = slate.join(graded, on="idx", how="left").sort("idx").with_columns([
+        pl.when(decided > 0).then((pl.col("over") / decided).round(3)).otherwise(None).alias("hit_rate"),
+        pl.when(pl.col("player_id").is_null()).then(pl.lit("not_found"))
+          .when(~pl.col("stat").is_in(SLATE_STATS)).then(pl.lit("unknown_stat"))
+          .when(pl.col("line").is_null()).then(pl.lit("missing_line"))
+          .otherwise(pl.lit("success")).alias("status"),
+    ])
+    return out.drop("idx").to_dicts()
+
+
+async def evaluate_props_service(
+    props: List[Dict[str, Any]],
+    seasons: Optional[List[int]] = None,
+    game_types: Optional[List[str]] = None,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent: Optional[str] = None,
+    scoring: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Hit rates for a slate of props sharing the same filters.
+    Defaults: seasons = last 3, game_types = REG,POST.
+    """
+    current_season = int(nfl.get_current_season())
+    season_list = sorted({int(s) for s in seasons or [] if 1999 <= int(s) <= current_season})
+    season_list = season_list or list(range(current_season - 2, current_season + 1))
+    type_list = [t.upper() for t in game_types or [] if t.upper() in VALID_GAME_TYPES] or ["REG", "POST"]
+
+    try:
+        results = await run_in_threadpool(
+            lambda: evaluate_props(props, season_list, type_list, current_season, last_n=last_n, venue=venue, opponent=opponent, scoring=scoring)
+        )
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to evaluate props: {str(e)}", "results": []}
+
+    return {
+        "status": "success",
+        "seasons": season_list,
+        "game_types": type_list,
+        "filters": {"last_n": last_n, "venue": venue, "opponent": opponent.upper() if opponent else None, "scoring": scoring},
+        "count": len(results),
+        "graded": sum(1 for r in results if r["status"] == "success"),
+        "results": results,
+    }
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional
+import nflreadpy as nfl
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+
+
+TEAM_TO_DIVISION: Dict[str, str] = {
+    'BUF': 'AFC East', 'MIA': 'AFC East', 'NE': 'AFC East', 'NYJ': 'AFC East',
+    'BAL': 'AFC North', 'CIN': 'AFC North', 'CLE': 'AFC North', 'PIT': 'AFC North',
+    'HOU': 'AFC South', 'IND': 'AFC South', 'JAX': 'AFC South', 'TEN': 'AFC South',
+    'DEN': 'AFC West', 'KC': 'AFC West', 'LV': 'AFC West', 'LAC': 'AFC West',
+    'DAL': 'NFC East', 'NYG': 'NFC East', 'PHI': 'NFC East', 'WAS': 'NFC East',
+    'CHI': 'NFC North', 'DET': 'NFC North', 'GB': 'NFC North', 'MIN': 'NFC North',
+    'ATL': 'NFC South', 'CAR': 'NFC South', 'NO': 'NFC South', 'TB': 'NFC South',
+    'ARI': 'NFC West', 'LA': 'NFC West', 'LAR': 'NFC West', 'SEA': 'NFC West', 'SF': 'NFC West',
+}
+TEAM_TO_CONFERENCE: Dict[str, str] = {t: dv.split(' ')[0] for t, dv in TEAM_TO_DIVISION.items()}
+
+QUARTERS = (1, 2, 3, 4)
+PERIODS = ('q1', 'q2', 'q3', 'q4', 'ot')
+
+
+def _first_col(cols, names) -> Optional[str]:
+    return next((c for c in names if c in cols), None)
+
+
+def _fg_made_expr(cols) -> Optional[pl.Expr]:
+    if 'field_goal_made' in cols:
+        return pl.col('field_goal_made').cast(pl.Int64) == 1
+    if 'field_goal_result' in cols:
+        return pl.col('field_goal_result').str.to_lowercase().is_in(['made', 'good', 'success', 'successful'])
+    if 'fg_result' in cols:
+        return pl.col('fg_result').str.to_lowercase().is_in(['made', 'good'])
+    if 'kick_result' in cols:
+        return pl.col('kick_result').str.to_lowercase().is_in(['good', 'made'])
+    return None
+
+
+def build_quarter_scores(pbp: pl.DataFrame, schedules: pl.DataFrame) -> pl.DataFrame:
+    """One row per game with the points each side scored in every quarter and OT.
+
+    Running scoreboard columns are monotonic, so the score at the end of quarter q
+    is the max over plays with qtr <= q; OT is whatever was added after Q4.
+    Field goals made per half are carried along for the trends FG lines.
+    """
+    cols = set(pbp.columns)
+    game_id_col = 'game_id' if 'game_id' in cols else None
+    qtr_col = _first_col(cols, ('qtr', 'quarter'))
+    home_col = _first_col(cols, ('total_home_score', 'home_score_post', 'home_score'))
+    away_col = _first_col(cols, ('total_away_score', 'away_score_post', 'away_score'))
+    if not (game_id_col and qtr_col and home_col and away_col):
+        return pl.DataFrame()
+
+    plays = pbp.filter(pl.col(qtr_col).is_not_null())
+    ends = []
+    for side, col in (('home', home_col), ('away', away_col)):
+        for q in QUARTERS:
+            ends.append(pl.col(col).filter(pl.col(qtr_col) <= q).max().cast(pl.Int64).alias(f'{side}_end_q{q}'))
+        ends.append(pl.col(col).max().cast(pl.Int64).alias(f'{side}_final'))
+    games = plays.group_by(game_id_col).agg(ends).rename({game_id_col: 'game_id'})
+
+    points = []
+    for side in ('home', 'away'):
+        prev = pl.lit(0)
+        for q in QUARTERS:
+            end = pl.col(f'{side}_end_q{q}').fill_null(0)
+            points.append((end - prev).alias(f'{side}_q{q}'))
+            prev = end
+        points.append((pl.col(f'{side}_final').fill_null(0) - prev).alias(f'{side}_ot'))
+        points.append(pl.col(f'{side}_end_q2').fill_null(0).alias(f'{side}_h1'))
+    games = games.with_columns(points)
+
+    # Field goals made by the kicking (possession) team, per half
+    posteam_col = _first_col(cols, ('posteam', 'possession_team'))
+    made_expr = _fg_made_expr(cols)
+    if made_expr is not None and posteam_col:
+        fgm = (
+            plays.filter(made_expr.fill_null(False) & pl.col(posteam_col).is_not_null())
+            .group_by([game_id_col, posteam_col])
+            .agg([
+                pl.len().cast(pl.Int64).alias('fgm'),
+                (pl.col(qtr_col) <= 2).sum().cast(pl.Int64).alias('fgm_h1'),
+                (pl.col(qtr_col) >= 3).sum().cast(pl.Int64).alias('fgm_h2'),
+            ])
+            .rename({game_id_col: 'game_id', posteam_col: 'fg_team'})
+        )
+    else:
+        fgm = pl.DataFrame(schema={'game_id': pl.Utf8, 'fg_team': pl.Utf8, 'fgm': pl.Int64, 'fgm_h1': pl.Int64, 'fgm_h2': pl.Int64})
+
+    meta_cols = [c for c in ('game_id', 'season', 'game_type', 'week', 'gameday', 'home_team', 'away_team', 'home_score', 'away_score') if c in schedules.columns]
+    meta = schedules.select(meta_cols).unique(subset=['game_id'])
+    if 'home_team' not in meta.columns or 'away_team' not in meta.columns:
+        return pl.DataFrame()
+    completed = (
+        pl.col('home_score').is_not_null() & pl.col('away_score').is_not_null()
+        if 'home_score' in meta.columns and 'away_score' in meta.columns else pl.lit(True)
+    )
+    meta = meta.with_columns(completed.alias('completed')).drop([c for c in ('home_score', 'away_score') if c in meta.columns])
+    games = games.join(meta, on='game_id', how='inner')
+
+    for side in ('home', 'away'):
+        side_fg = fgm.rename({'fgm': f'{side}_fgm', 'fgm_h1': f'{side}_fgm_h1', 'fgm_h2': f'{side}_fgm_h2'})
+        games = games.join(side_fg, left_on=['game_id', f'{side}_team'], right_on=['game_id', 'fg_team'], how='left')
+        if made_expr is not None and posteam_col:
+            games = games.with_columns([pl.col(c).fill_null(0) for c in (f'{side}_fgm', f'{side}_fgm_h1', f'{side}_fgm_h2')])
+
+    return games.drop([c for c in games.columns if '_end_q' in c]).sort('game_id')
+
+
+def team_games_from_scores(scores: pl.DataFrame) -> pl.DataFrame:
+    """Long view of the quarter table: one row per team per game, from the team's side."""
+    if scores.is_empty():
+        return pl.DataFrame()
+    keep = [c for c in ('game_id', 'season', 'game_type', 'week', 'gameday', 'completed') if c in scores.columns]
+    stat_cols = [*PERIODS, 'h1', 'final', 'fgm', 'fgm_h1', 'fgm_h2']
+
+    def _side(us: str, them: str, is_home: int) -> pl.DataFrame:
+        return scores.select(
+            keep
+            + [
+                pl.col(f'{us}_team').alias('team'),
+                pl.col(f'{them}_team').alias('opp'),
+                pl.lit(is_home).cast(pl.Int8).alias('is_home'),
+            ]
+            + [pl.col(f'{us}_{c}').alias(c) for c in stat_cols]
+            + [pl.col(f'{them}_{c}').alias(f'opp_{c}') for c in stat_cols]
+        )
+
+    long = pl.concat([_side('home', 'away', 1), _side('away', 'home', 0)], how='vertical')
+    season_type = pl.col('game_type').str.to_uppercase() if 'game_type' in long.columns else pl.lit('REG')
+    return long.with_columns([
+        (pl.col('final') - pl.col('h1')).alias('h2'),
+        (pl.col('opp_final') - pl.col('opp_h1')).alias('opp_h2'),
+        (pl.col('final') - pl.col('opp_final')).alias('margin'),
+        pl.when(season_type.is_in(['REG', 'PRE'])).then(season_type).otherwise(pl.lit('POST')).alias('season_type'),
+        pl.col('opp').replace_strict(TEAM_TO_CONFERENCE, default=None).alias('opp_conf'),
+        pl.col('opp').replace_strict(TEAM_TO_DIVISION, default=None).alias('opp_div'),
+    ]).sort(['team', 'gameday', 'game_id'] if 'gameday' in long.columns else ['team', 'game_id'])
+
+
+def load_quarter_scores(season: int) -> pl.DataFrame:
+    """Season quarter-by-quarter scoreboard, built once per data version (blocking)."""
+    season = int(season)
+
+    def _build() -> pl.DataFrame:
+        return build_quarter_scores(nfl.load_pbp([season]), nfl.load_schedules([season]))
+
+    return get_or_build('quarter_scores', season, data_version(season), _build)
+
+
+def load_team_games(season: int) -> pl.DataFrame:
+    """Per-team view of `load_quarter_scores`, built once per data version (blocking)."""
+    season = int(season)
+    return get_or_build('team_games', season, data_version(season), lambda: team_games_from_scores(load_quarter_scores(season)))
+
+
+def parse_game_types(raw: Optional[str], default: str = 'REG') -> List[str]:
+    return [p.strip().upper() for p in str(raw or default).split(',') if p.strip()] or [default]
+
+
+def select_team_games(
+    team_games: pl.DataFrame,
+    team: Optional[str] = None,
+    game_types: Optional[str] = None,
+    *,
+    last_n: Optional[int] = None,
+    venue: Optional[str] = None,
+    opponent_conf: Optional[str] = None,
+    opponent_div: Optional[str] = None,
+    completed_only: bool = True,
+) -> pl.DataFrame:
+    """Apply the usual trends filters to a team-games table.
+
+    Without `team` the filters apply to every team at once and `last_n` keeps
+    each team's most recent games.
+    """
+    if team_games.is_empty():
+        return team_games
+    types = parse_game_types(game_types)
+    df = team_games.filter(pl.col('season_type').is_in(types) | pl.col('game_type').str.to_uppercase().is_in(types))
+    if team:
+        df = df.filter(pl.col('team') == str(team).upper())
+    if completed_only and 'completed' in df.columns:
+        df = df.filter(pl.col('completed'))
+    if opponent_conf and str(opponent_conf).upper() in {'AFC', 'NFC'}:
+        df = df.filter(pl.col('opp_conf') == str(opponent_conf).upper())
+    if opponent_div and opponent_div != 'all':
+        wanted = str(opponent_div).upper()
+        if any(d.upper() == wanted for d in TEAM_TO_DIVISION.values()):
+            df = df.filter(pl.col('opp_div').str.to_uppercase() == wanted)
+    if str(venue or '').lower() == 'home':
+        df = df.filter(pl.col('is_home') == 1)
+    elif str(venue or '').lower() == 'away':
+        df = df.filter(pl.col('is_home') == 0)
+    order = ['team', 'gameday', 'game_id'] if 'gameday' in df.columns else ['team', 'game_id']
+    df = df.sort(order)
+    if last_n and last_n > 0:
+        df = df.filter(pl.int_range(pl.len()).reverse().over('team') < int(last_n))
+    return df
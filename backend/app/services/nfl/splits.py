@@ -1,96 +1,248 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import nflreadpy as nfl
 from starlette.concurrency import run_in_threadpool
 import polars as pl
 
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.scoreboard import TEAM_TO_CONFERENCE, TEAM_TO_DIVISION, parse_game_types
 
-async def get_team_home_away_splits_service(team: str, season: Optional[int] = None):
-    team = team.upper()
-    season_val = int(season) if season else int(nfl.get_current_season())
 
-    def _load():
-        return nfl.load_schedules([season_val])
+# Dimensions of the splits cube (all derived from schedules) and its additive measures
+SPLIT_DIMS = ("venue", "opp_conf", "opp_div", "division_game", "roof", "surface", "weekday", "rest", "favorite")
+MEASURES = ("games", "w", "l", "t", "pf", "pa", "margin")
+
+
+def _rest_bucket(col: str) -> pl.Expr:
+    rest = pl.col(col)
+    return (
+        pl.when(rest.is_null()).then(pl.lit(None))
+        .when(rest <= 5).then(pl.lit("short"))
+        .when(rest <= 8).then(pl.lit("normal"))
+        .when(rest <= 12).then(pl.lit("long"))
+        .otherwise(pl.lit("bye"))
+    )
+
 
-    schedules = await run_in_threadpool(_load)
+def build_team_results(schedules: pl.DataFrame) -> pl.DataFrame:
+    """One row per team per completed game with the cube dimensions and raw measures."""
     cols = set(schedules.columns)
+    if not {"game_id", "home_team", "away_team", "home_score", "away_score"} <= cols:
+        return pl.DataFrame()
+
+    def _opt(name: str, dtype=pl.Utf8) -> pl.Expr:
+        return pl.col(name) if name in cols else pl.lit(None, dtype=dtype).alias(name)
+
+    games = schedules.filter(pl.col("home_score").is_not_null() & pl.col("away_score").is_not_null()).select([
+        pl.col("game_id"),
+        _opt("season", pl.Int64),
+        _opt("game_type"),
+        _opt("week", pl.Int64),
+        _opt("gameday"),
+        pl.col("home_team"),
+        pl.col("away_team"),
+        pl.col("home_score").cast(pl.Int64),
+        pl.col("away_score").cast(pl.Int64),
+        _opt("roof"),
+        _opt("surface"),
+        _opt("weekday"),
+        _opt("home_rest", pl.Int64),
+        _opt("away_rest", pl.Int64),
+        _opt("spread_line", pl.Float64),
+        _opt("total_line", pl.Float64),
+        _opt("div_game", pl.Int64),
+    ])
+
+    def _side(us: str, them: str) -> pl.DataFrame:
+        # spread_line is from the home side: positive means the home team was favored
+        spread = pl.col("spread_line") if us == "home" else -pl.col("spread_line")
+        return games.select([
+            "game_id", "season", "game_type", "week", "gameday",
+            pl.col(f"{us}_team").alias("team"),
+            pl.col(f"{them}_team").alias("opp"),
+            pl.lit(us).alias("venue"),
+            pl.col(f"{us}_score").alias("pf"),
+            pl.col(f"{them}_score").alias("pa"),
+            spread.alias("team_spread"),
+            pl.col("total_line"),
+            pl.when(pl.col("div_game") == 1).then(pl.lit("division")).when(pl.col("div_game") == 0).then(pl.lit("non_division")).otherwise(pl.lit(None)).alias("division_game"),
+            pl.col("roof").str.strip_chars().str.to_lowercase().alias("roof"),
+            pl.when(pl.col("surface").str.strip_chars().str.to_lowercase() == "grass").then(pl.lit("grass"))
+              .when(pl.col("surface").str.strip_chars().str.len_chars() > 0).then(pl.lit("turf"))
+              .otherwise(pl.lit(None)).alias("surface"),
+            pl.col("weekday").str.to_lowercase().alias("weekday"),
+            _rest_bucket(f"{us}_rest").alias("rest"),
+            pl.when(spread > 0).then(pl.lit("favorite")).when(spread < 0).then(pl.lit("underdog"))
+              .when(spread == 0).then(pl.lit("pickem")).otherwise(pl.lit(None)).alias("favorite"),
+        ])
+
+    long = pl.concat([_side("home", "away"), _side("away", "home")], how="vertical")
+    game_type = pl.col("game_type").str.to_uppercase()
+    return long.with_columns([
+        pl.when(game_type.is_in(["REG", "PRE"])).then(game_type).otherwise(pl.lit("POST")).alias("season_type"),
+        pl.col("opp").replace_strict(TEAM_TO_CONFERENCE, default=None).alias("opp_conf"),
+        pl.col("opp").replace_strict(TEAM_TO_DIVISION, default=None).alias("opp_div"),
+        (pl.col("pf") - pl.col("pa")).alias("margin"),
+        (pl.col("pf") > pl.col("pa")).cast(pl.Int64).alias("w"),
+        (pl.col("pf") < pl.col("pa")).cast(pl.Int64).alias("l"),
+        (pl.col("pf") == pl.col("pa")).cast(pl.Int64).alias("t"),
+    ]).sort(["team", "gameday", "game_id"])
+
+
+def build_splits_cube(results: pl.DataFrame) -> pl.DataFrame:
+    """Base cuboid: measure sums per (season_type, team, every dimension).
+
+    Any split is a roll-up of this small table; everything in it comes from schedules.
+    """
+    if results.is_empty():
+        return pl.DataFrame()
+    return results.group_by(["season_type", "team", *SPLIT_DIMS]).agg([
+        pl.len().alias("games"),
+        pl.col("w").sum(),
+        pl.col("l").sum(),
+        pl.col("t").sum(),
+        pl.col("pf").sum(),
+        pl.col("pa").sum(),
+        pl.col("margin").sum(),
+    ])
+
+
+def load_team_results(season: int) -> pl.DataFrame:
+    """Per-team game results with split dimensions, built once per data version (blocking)."""
+    season = int(season)
+    return get_or_build("team_results", season, data_version(season), lambda: build_team_results(nfl.load_schedules([season])))
+
+
+def load_splits_cube(season: int) -> pl.DataFrame:
+    """Season splits cube from the schedules, built once per data version (blocking)."""
+    season = int(season)
+    return get_or_build("splits_cube", season, data_version(season), lambda: build_splits_cube(load_team_results(season)))
+
 
-    # Only regular-season games that have been played (scores present)
-    reg_mask = (pl.col("game_type") == "REG") if "game_type" in cols else pl.lit(True)
-    if "home_score" in cols and "away_score" in cols:
-        played_mask = pl.col("home_score").is_not_null() & pl.col("away_score").is_not_null()
-    elif "result" in cols:
-        played_mask = pl.col("result").is_not_null()
-    else:
-        played_mask = pl.lit(False)
-
-    df = schedules.filter(reg_mask & played_mask)
-
-    # Build flags on filtered set
-    is_home = (pl.col("home_team") == team) if "home_team" in cols else pl.lit(False)
-    is_away = (pl.col("away_team") == team) if "away_team" in cols else pl.lit(False)
-
-    df_home = df.filter(is_home)
-    df_away = df.filter(is_away)
-
-    def _wins_losses(df: pl.DataFrame, side: str):
-        if df.height == 0:
-            return 0, 0
-        if "home_score" in cols and "away_score" in cols:
-            if side == "home":
-                wins = int((df["home_score"] > df["away_score"]).sum())
-            else:
-                wins = int((df["away_score"] > df["home_score"]).sum())
-            losses = int(df.height - wins)
-            return wins, losses
-        if "result" in cols:
-            # result > 0 => home win, < 0 => home loss
-            if side == "home":
-                wins = int((df["result"] > 0).sum())
-                losses = int((df["result"] < 0).sum())
-                return wins, losses
-            else:
-                wins = int((df["result"] < 0).sum())
-                losses = int((df["result"] > 0).sum())
-                return wins, losses
-        return 0, 0
-
-    def _points(df: pl.DataFrame, side: str):
-        if df.height == 0 or not ("home_score" in cols and "away_score" in cols):
-            return 0, 0, 0.0
-        if side == "home":
-            pf = int(df["home_score"].sum())
-            pa = int(df["away_score"].sum())
+def parse_dims(raw: Optional[str]) -> List[str]:
+    parts = [p.strip().lower() for p in str(raw or "").split(",") if p.strip()]
+    return [p for p in dict.fromkeys(parts) if p in SPLIT_DIMS]
+
+
+def parse_where(raw: Optional[str]) -> Dict[str, List[str]]:
+    """"roof:dome|closed,favorite:underdog" -> {"roof": ["dome", "closed"], "favorite": ["underdog"]}"""
+    out: Dict[str, List[str]] = {}
+    for part in str(raw or "").split(","):
+        dim, _, values = part.partition(":")
+        dim = dim.strip().lower()
+        vals = [v.strip() for v in values.split("|") if v.strip()]
+        if dim in SPLIT_DIMS and vals:
+            out[dim] = vals
+    return out
+
+
+def rollup_splits(
+    cube: pl.DataFrame,
+    dims: List[str],
+    *,
+    team: Optional[str] = None,
+    game_types: Optional[str] = None,
+    where: Optional[Dict[str, List[str]]] = None,
+    by_team: bool = True,
+) -> pl.DataFrame:
+    """Roll the cube up to `dims` (optionally per team) with derived rates."""
+    if cube.is_empty():
+        return cube
+    df = cube.filter(pl.col("season_type").is_in(parse_game_types(game_types)))
+    if team:
+        df = df.filter(pl.col("team") == team.upper())
+    for dim, values in (where or {}).items():
+        if dim in ("opp_conf", "opp_div"):
+            df = df.filter(pl.col(dim).str.to_uppercase().is_in([v.upper() for v in values]))
         else:
-            pf = int(df["away_score"].sum())
-            pa = int(df["home_score"].sum())
-        avg = round(pf / df.height, 1) if df.height else 0.0
-        return pf, pa, avg
+            df = df.filter(pl.col(dim).is_in([v.lower() for v in values]))
+    keys = (["team"] if by_team else []) + dims
+    measures = [pl.col(m).sum() for m in MEASURES]
+    out = df.group_by(keys).agg(measures) if keys else df.select(measures)
+    gp = pl.col("games")
+    out = out.with_columns([
+        pl.when(gp > 0).then(((pl.col("w") + 0.5 * pl.col("t")) / gp).round(3)).otherwise(0.0).alias("win_pct"),
+        pl.when(gp > 0).then((pl.col("pf") / gp).round(1)).otherwise(0.0).alias("pf_pg"),
+        pl.when(gp > 0).then((pl.col("pa") / gp).round(1)).otherwise(0.0).alias("pa_pg"),
+        pl.when(gp > 0).then((pl.col("margin") / gp).round(1)).otherwise(0.0).alias("margin_pg"),
+    ])
+    return out.sort(keys) if keys else out
+
+
+async def get_team_home_away_splits_service(
+    team: str,
+    season: Optional[int] = None,
+    *,
+    dims: Optional[str] = None,
+    where: Optional[str] = None,
+    game_types: Optional[str] = None,
+):
+    """Team results split by any combination of cube dimensions.
+
+    Without `dims` this keeps the original home/away response; with them it
+    returns one row per combination of dimension values.
+    """
+    team = team.upper()
+    season_val = int(season) if season else int(nfl.get_current_season())
+    cube = await run_in_threadpool(load_splits_cube, season_val)
+    dim_list = parse_dims(dims)
+
+    if dim_list or where:
+        splits = rollup_splits(cube, dim_list, team=team, game_types=game_types, where=parse_where(where))
+        return {
+            "status": "success",
+            "team": team,
+            "season": season_val,
+            "game_types": parse_game_types(game_types),
+            "dims": dim_list,
+            "splits": splits.to_dicts() if not splits.is_empty() else [],
+        }
 
-    home_wins, home_losses = _wins_losses(df_home, "home")
-    away_wins, away_losses = _wins_losses(df_away, "away")
-    home_pf, home_pa, home_avg = _points(df_home, "home")
-    away_pf, away_pa, away_avg = _points(df_away, "away")
+    by_venue = {}
+    if not cube.is_empty():
+        by_venue = {row["venue"]: row for row in rollup_splits(cube, ["venue"], team=team, game_types="REG").to_dicts()}
+
+    def _venue(venue: str) -> Dict[str, Any]:
+        row = by_venue.get(venue)
+        if not row:
+            return {"games": 0, "wins": 0, "losses": 0, "ties": 0, "points_for": 0, "points_against": 0,
+                    "avg_points_for": 0.0}
+        return {
+            "games": int(row["games"]),
+            "wins": int(row["w"]),
+            "losses": int(row["l"]),
+            "ties": int(row["t"]),
+            "points_for": int(row["pf"]),
+            "points_against": int(row["pa"]),
+            "avg_points_for": row["pf_pg"],
+        }
 
     return {
         "status": "success",
         "team": team,
         "season": season_val,
-        "home": {
-            "games": int(df_home.height),
-            "wins": home_wins,
-            "losses": home_losses,
-            "points_for": home_pf,
-            "points_against": home_pa,
-            "avg_points_for": home_avg,
-        },
-        "away": {
-            "games": int(df_away.height),
-            "wins": away_wins,
-            "losses": away_losses,
-            "points_for": away_pf,
-            "points_against": away_pa,
-            "avg_points_for": away_avg,
-        },
+        "home": _venue("home"),
+        "away": _venue("away"),
     }
 
 
+async def get_league_splits_service(
+    season: Optional[int] = None,
+    *,
+    dims: Optional[str] = None,
+    where: Optional[str] = None,
+    game_types: Optional[str] = None,
+    by_team: bool = True,
+):
+    """Splits for every team (or league totals with by_team=False) from the same cube."""
+    season_val = int(season) if season else int(nfl.get_current_season())
+    cube = await run_in_threadpool(load_splits_cube, season_val)
+    dim_list = parse_dims(dims) or ["venue"]
+    splits = rollup_splits(cube, dim_list, game_types=game_types, where=parse_where(where), by_team=by_team)
+    return {
+        "status": "success",
+        "season": season_val,
+        "game_types": parse_game_types(game_types),
+        "dims": dim_list,
+        "by_team": by_team,
+        "splits": splits.to_dicts() if not splits.is_empty() else [],
+    }
@@ -0,0 +1,231 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import nflreadpy as nfl
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_gamelogs import PROP_STATS, game_logs
+from app.services.nfl.scoreboard import parse_game_types
+from app.services.nfl.splits import load_team_results
+
+
+STREAK_OPS = {
+    "gte": lambda v, t: v >= t,
+    "gt": lambda v, t: v > t,
+    "lte": lambda v, t: v <= t,
+    "lt": lambda v, t: v < t,
+    "eq": lambda v, t: v == t,
+}
+
+# Team series values (from the team-results table)
+TEAM_VALUES: Dict[str, pl.Expr] = {
+    "points": pl.col("pf"),
+    "points_allowed": pl.col("pa"),
+    "margin": pl.col("margin"),
+    "total": pl.col("pf") + pl.col("pa"),
+    # team_spread > 0 means favored by that many, so covering is beating the spread
+    "ats_margin": pl.col("margin") - pl.col("team_spread"),
+    "ou_margin": pl.col("pf") + pl.col("pa") - pl.col("total_line"),
+}
+
+# Named team streaks -> (value, op, threshold)
+TEAM_CONDITIONS: Dict[str, Tuple[str, str, float]] = {
+    "win": ("margin", "gt", 0),
+    "loss": ("margin", "lt", 0),
+    "cover": ("ats_margin", "gt", 0),
+    "no_cover": ("ats_margin", "lt", 0),
+    "over": ("ou_margin", "gt", 0),
+    "under": ("ou_margin", "lt", 0),
+}
+
+MAX_SPAN = 5
+
+# Streak tables kept at once (each query's stat/op/threshold is its own entry)
+STREAK_CACHE_SIZE = 32
+
+
+def find_streaks(series: pl.DataFrame, entity: List[str], hit: pl.Expr) -> pl.DataFrame:
+    """Run-length encode `hit` over every entity's sorted game series at once.
+
+    `series` is sorted by entity then time and carries season/week; returns one
+    row per run of hits with its length, first/last game and whether it is
+    still active: it ends at the entity's reference latest game, the `latest`
+    column (season * 100 + week) when the series has one, else the entity's
+    own last game. Missing values end a run.
+    """
+    if series.is_empty():
+        return pl.DataFrame()
+    order = pl.col("season") * 100 + pl.col("week")
+    latest = pl.col("latest") if "latest" in series.columns else order.max().over(entity)
+    runs = series.with_columns(hit.fill_null(False).alias("hit"), latest.alias("latest")).with_columns(
+        pl.col("hit").rle_id().over(entity).alias("run")
+    )
+    return (
+        runs.filter(pl.col("hit"))
+        .group_by(entity + ["run"], maintain_order=True)
+        .agg([
+            pl.len().alias("length"),
+            (order.last() == pl.col("latest").first()).alias("active"),
+            pl.col("season").first().alias("start_season"),
+            pl.col("week").first().alias("start_week"),
+            pl.col("season").last().alias("end_season"),
+            pl.col("week").last().alias("end_week"),
+            pl.col("value").min().alias("min_value"),
+            pl.col("value").mean().round(2).alias("avg_value"),
+        ])
+        .drop("run")
+    )
+
+
+def _top(streaks: pl.DataFrame, limit: int) -> Dict[str, List[Dict[str, Any]]]:
+    if streaks.is_empty():
+        return {"active": [], "longest": []}
+    order = ["length", "end_season", "end_week"]
+    ranked = streaks.sort(order, descending=True)
+    return {
+        "active": ranked.filter(pl.col("active")).head(limit).to_dicts(),
+        "longest": ranked.head(limit).to_dicts(),
+    }
+
+
+def _versions(seasons: List[int]) -> Tuple[int, ...]:
+    return tuple(data_version(s) for s in seasons)
+
+
+def load_player_streaks(
+    stat: str, op: str, threshold: float, seasons: List[int], game_types: List[str], position: Optional[str] = None
+) -> pl.DataFrame:
+    """Every player's streaks of games with `stat` `op` `threshold`, the STREAK_CACHE_SIZE latest queries cached (blocking)."""
+    seasons, types = sorted(seasons), tuple(sorted(game_types))
+
+    def _build() -> pl.DataFrame:
+        logs = game_logs(seasons)
+        if logs.is_empty():
+            return pl.DataFrame()
+        logs = logs.filter(pl.col("season_type").is_in(types))
+        # A streak is active only if it reaches the latest game of the player's (last) team,
+        # so players who were cut, hurt or retired drop out even when their own last games hit
+        logs = logs.with_columns((pl.col("season") * 100 + pl.col("week")).max().over("team").alias("team_latest"))
+        if position:
+            logs = logs.filter(pl.col("position_group") == position)
+        series = logs.sort(["player_id", "season", "week"]).select([
+            "player_id", "season", "week",
+            pl.col("player_name").last().over("player_id"),
+            pl.col("position").last().over("player_id"),
+            pl.col("team").last().over("player_id"),
+            pl.col("team_latest").last().over("player_id").alias("latest"),
+            pl.col(stat).alias("value"),
+        ])
+        cond = STREAK_OPS[op](pl.col("value"), threshold)
+        return find_streaks(series, ["player_id", "player_name", "position", "team"], cond)
+
+    key = (stat, op, float(threshold), tuple(seasons), types, position)
+    return get_or_build("player_streaks", key, _versions(seasons), _build, limit=STREAK_CACHE_SIZE)
+
+
+def load_team_streaks(value: str, op: str, threshold: float, seasons: List[int], game_types: List[str]) -> pl.DataFrame:
+    """Every team's streaks of games with `value` `op` `threshold`, the STREAK_CACHE_SIZE latest queries cached (blocking)."""
+    seasons, types = sorted(seasons), tuple(sorted(game_types))
+
+    def _build() -> pl.DataFrame:
+        parts = [load_team_results(s) for s in seasons]
+        parts = [p for p in parts if not p.is_empty()]
+        if not parts:
+            return pl.DataFrame()
+        results = pl.concat(parts, how="vertical_relaxed").filter(pl.col("season_type").is_in(types))
+        series = results.sort(["team", "season", "week"]).select(["team", "season", "week", TEAM_VALUES[value].alias("value")])
+        return find_streaks(series, ["team"], STREAK_OPS[op](pl.col("value"), threshold))
+
+    key = (value, op, float(threshold), tuple(seasons), types)
+    return get_or_build("team_streaks", key, _versions(seasons), _build, limit=STREAK_CACHE_SIZE)
+
+
+def _seasons(season: Optional[int], span: int) -> List[int]:
+    end = int(season) if season else int(nfl.get_current_season())
+    span = min(max(int(span or 1), 1), MAX_SPAN)
+    return list(range(max(1999, end - span + 1), end + 1))
+
+
+async def get_player_streaks_service(
+    stat: str,
+    threshold: float,
+    op: str = "gte",
+    season: Optional[int] = None,
+    span: int = 1,
+    game_types: Optional[str] = None,
+    *,
+    position: Optional[str] = None,
+    limit: int = 25,
+) -> Dict[str, Any]:
+    """Top active and longest player streaks, e.g. stat=receptions&threshold=6 (6+ receptions).
+    `span` seasons ending at `season` form one series, so streaks carry across seasons.
+    """
+    stat_key = (stat or "").strip().lower()
+    op_key = (op or "gte").strip().lower()
+    if stat_key not in PROP_STATS:
+        return {"status": "error", "message": f"Unknown stat '{stat}'", "stats": list(PROP_STATS)}
+    if op_key not in STREAK_OPS:
+        return {"status": "error", "message": f"Unknown op '{op}'", "ops": list(STREAK_OPS)}
+    seasons = _seasons(season, span)
+    types = parse_game_types(game_types, "REG")
+    group = (position or "").strip().upper() or None
+
+    try:
+        streaks = await run_in_threadpool(load_player_streaks, stat_key, op_key, threshold, seasons, types, group)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load streaks: {str(e)}", "active": [], "longest": []}
+
+    return {
+        "status": "success",
+        "stat": stat_key,
+        "op": op_key,
+        "threshold": threshold,
+        "seasons": seasons,
+        "game_types": types,
+        "position": group,
+        **_top(streaks, limit),
+    }
+
+
+async def get_team_streaks_service(
+    stat: str = "win",
+    threshold: Optional[float] = None,
+    op: Optional[str] = None,
+    season: Optional[int] = None,
+    span: int = 1,
+    game_types: Optional[str] = None,
+    *,
+    limit: int = 10,
+) -> Dict[str, Any]:
+    """Top active and longest team streaks: a named condition (win, cover, over, ...)
+    or a value (points, margin, total, ...) with op/threshold.
+    """
+    stat_key = (stat or "").strip().lower()
+    if stat_key in TEAM_CONDITIONS:
+        value, op_key, threshold_val = TEAM_CONDITIONS[stat_key]
+    elif stat_key in TEAM_VALUES:
+        if threshold is None:
+            return {"status": "error", "message": f"threshold is required for '{stat_key}'"}
+        value, op_key, threshold_val = stat_key, (op or "gte").strip().lower(), threshold
+    else:
+        return {"status": "error", "message": f"Unknown stat '{stat}'", "stats": list(TEAM_CONDITIONS) + list(TEAM_VALUES)}
+    if op_key not in STREAK_OPS:
+        return {"status": "error", "message": f"Unknown op '{op}'", "ops": list(STREAK_OPS)}
+    seasons = _seasons(season, span)
+    types = parse_game_types(game_types, "REG")
+
+    try:
+        streaks = await run_in_threadpool(load_team_streaks, value, op_key, threshold_val, seasons, types)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load streaks: {str(e)}", "active": [], "longest": []}
+
+    return {
+        "status": "success",
+        "stat": stat_key,
+        "op": op_key,
+        "threshold": threshold_val,
+        "seasons": seasons,
+        "game_types": types,
+        **_top(streaks, limit),
+    }
@@ -3,6 +3,8 @@ import polars as pl
 import nflreadpy as nfl
 from starlette.concurrency import run_in_threadpool
 
+from app.services.nfl.drives import load_drives
+
 
 def _safe_int(val: Optional[str | int]) -> Optional[int]:
     try:
@@ -285,11 +287,14 @@ async def get_team_offense_service(team: str, season: Optional[int] = None, game
     # Plays per game
     plays_pg = per_game(plays)
 
-    # Avg starting field position (yardline_100) del primer snap de cada drive
+    # Avg starting field position (yardline_100) from the season drive table
     start_pos_avg = None
-    if yardline100_col and drive_col and drive_play_num_col:
-        start_pos_avg = df.filter(pl.col(drive_play_num_col) == 1).select(pl.col(yardline100_col)).to_series().mean()
-        start_pos_avg = round(float(start_pos_avg), 1) if start_pos_avg is not None else None
+    if game_id_col:
+        drives = await run_in_threadpool(load_drives, season_val)
+        if not drives.is_empty():
+            game_ids = df.select(pl.col(game_id_col)).unique().to_series()
+            start_pos_avg = drives.filter((pl.col('team') == team_abbr) & pl.col('game_id').is_in(game_ids))['start_yardline_100'].mean()
+            start_pos_avg = round(float(start_pos_avg), 1) if start_pos_avg is not None else None
 
     # Points per game – fallback: approximate from touchdowns * 6 (excludes FGs)
     ppg_est = per_game(td_total * 6)
@@ -412,8 +417,6 @@ async def get_offense_league_service(season: Optional[int] = None, game_types: O
         pl.when(valid & ((pl.col('yardline_100') <= 20) if 'yardline_100' in pbp.columns else pl.lit(False)) & (pl.col('rush_touchdown').cast(pl.Int64) == 1 if 'rush_touchdown' in pbp.columns else pl.lit(False))).then(1).otherwise(0).sum().alias('rz_rush_td'),
         # explosive
         pl.when(valid & ((pl.col('yards_gained') >= 20) if 'yards_gained' in pbp.columns else pl.lit(False))).then(1).otherwise(0).sum().alias('explosive'),
-        # start field position
-        (pl.when((pl.col('drive_play_number') == 1) if 'drive_play_number' in pbp.columns else pl.lit(False)).then(pl.col('yardline_100')).otherwise(None)).mean().alias('start_pos_avg') if 'yardline_100' in pbp.columns else pl.lit(None).alias('start_pos_avg'),
     ]
 
     if game_id_col:
@@ -464,6 +467,17 @@ async def get_offense_league_service(season: Optional[int] = None, game_types: O
         else:
             result = result.with_columns([pl.lit(0.0).alias('pf_pg')])
 
+        # Start field position per team from the season drive table
+        drives = await run_in_threadpool(load_drives, season_val)
+        if not drives.is_empty() and game_id_col:
+            game_ids = pbp.select(pl.col(game_id_col)).unique().to_series()
+            start_df = drives.filter(pl.col('game_id').is_in(game_ids)).group_by('team').agg([
+                pl.col('start_yardline_100').mean().round(1).alias('start_pos_avg')
+            ])
+            result = result.join(start_df, on='team', how='left')
+        else:
+            result = result.with_columns([pl.lit(None, dtype=pl.Float64).alias('start_pos_avg')])
+
         teams = result.select([
             'team', 'pf_pg', 'pyds_pg', 'ruyds_pg', 'td_pg', 'pass_td_pg', 'rush_td_pg', 'to_pg', 'ypp', pl.col('tds').alias('td_total'),
             'to_margin_pg', 'third_pct', 'fourth_pct', 'rz_td_pct', 'explosive_pg', 'plays_pg', 'start_pos_avg'
@@ -513,6 +527,7 @@ async def get_offense_league_service(season: Optional[int] = None, game_types: O
             return set()
         u = str(div).upper()
         return {t for t, d in TEAM_TO_DIV.items() if d.upper() == u}
+    drives = await run_in_threadpool(load_drives, season_val)
     out_rows: List[Dict[str, Any]] = []
     for t in teams_list:
         t_str = str(t)
@@ -594,6 +609,9 @@ async def get_offense_league_service(season: Optional[int] = None, game_types: O
             'plays_pg': per_game(plays),
             'start_pos_avg': None,
         }
+        if ids and not drives.is_empty():
+            start = drives.filter((pl.col('team') == t_str) & pl.col('game_id').is_in(list(ids)))['start_yardline_100'].mean()
+            row['start_pos_avg'] = round(float(start), 1) if start is not None else None
         out_rows.append(row)
 
     return {"status": "success", "season": season_val, "teams": out_rows}
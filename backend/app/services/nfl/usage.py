@@ -0,0 +1,241 @@
+from typing import Any, Dict, List, Optional
+
+import nflreadpy as nfl
+from starlette.concurrency import run_in_threadpool
+import polars as pl
+
+from app.services.nfl.cache import data_version, get_or_build
+from app.services.nfl.player_registry import load_player_registry
+from app.services.nfl.scoreboard import parse_game_types
+
+
+# Volume counted per player-game; each gets a team_<col> total and a share
+USAGE_COUNTS = ("targets", "carries", "air_yards", "rz_targets", "rz_carries")
+USAGE_SHARES = {
+    "target_share": "targets",
+    "carry_share": "carries",
+    "air_yards_share": "air_yards",
+    "rz_target_share": "rz_targets",
+    "rz_carry_share": "rz_carries",
+}
+GAME_KEYS = ["season", "season_type", "week", "game_id", "team"]
+
+RED_ZONE = 20
+
+
+def _share(count: str, total: str) -> pl.Expr:
+    return pl.when(pl.col(total) > 0).then((pl.col(count) / pl.col(total)).round(3)).otherwise(None)
+
+
+def build_usage(pbp: pl.DataFrame) -> pl.DataFrame:
+    """One row per player per game with their targets, carries, air yards and red-zone looks, team totals and shares.
+
+    Targets and carries from every play are stacked into one event frame and
+    summed in a single group_by; team totals are window sums over the game.
+    """
+    cols = set(pbp.columns)
+    if pbp.is_empty() or not {"game_id", "posteam", "play_type"} <= cols:
+        return pl.DataFrame()
+
+    def _opt(name: str, dtype=pl.Float64) -> pl.Expr:
+        return pl.col(name) if name in cols else pl.lit(None, dtype=dtype)
+
+    live = pl.col("posteam").is_not_null()
+    if "no_play" in cols:
+        live = live & (pl.col("no_play").fill_null(0).cast(pl.Int64) != 1)
+    if "two_point_attempt" in cols:
+        live = live & (pl.col("two_point_attempt").fill_null(0).cast(pl.Int64) != 1)
+    plays = pbp.filter(live).select([
+        "game_id", "season", "season_type", "week",
+        pl.col("posteam").alias("team"),
+        _opt("defteam", pl.Utf8).alias("opp"),
+        "play_type",
+        (_opt("yardline_100") <= RED_ZONE).fill_null(False).alias("rz"),
+        _opt("air_yards").cast(pl.Float64).fill_null(0).alias("air"),
+        _opt("receiver_player_id", pl.Utf8).alias("receiver_id"),
+        _opt("receiver_player_name", pl.Utf8).alias("receiver_name"),
+        _opt("rusher_player_id", pl.Utf8).alias("rusher_id"),
+        _opt("rusher_player_name", pl.Utf8).alias("rusher_name"),
+    ])
+
+    base = ["game_id", "season", "season_type", "week", "team", "opp", "rz"]
+    targets = plays.filter((pl.col("play_type") == "pass") & pl.col("receiver_id").is_not_null()).select(
+        base + [pl.col("receiver_id").alias("player_id"), pl.col("receiver_name").alias("player_name"),
+                pl.lit(1).alias("target"), pl.lit(0).alias("carry"), "air"]
+    )
+    carries = plays.filter((pl.col("play_type") == "run") & pl.col("rusher_id").is_not_null()).select(
+        base + [pl.col("rusher_id").alias("player_id"), pl.col("rusher_name").alias("player_name"),
+                pl.lit(0).alias("target"), pl.lit(1).alias("carry"), pl.lit(0.0).alias("air")]
+    )
+    events = pl.concat([targets, carries], how="vertical_relaxed")
+    if events.is_empty():
+        return pl.DataFrame()
+
+    usage = events.group_by(GAME_KEYS + ["player_id"]).agg([
+        pl.col("player_name").drop_nulls().first(),
+        pl.col("opp").first(),
+        pl.col("target").sum().alias("targets"),
+        pl.col("carry").sum().alias("carries"),
+        pl.col("air").sum().alias("air_yards"),
+        (pl.col("target") * pl.col("rz")).sum().alias("rz_targets"),
+        (pl.col("carry") * pl.col("rz")).sum().alias("rz_carries"),
+    ])
+    usage = usage.with_columns(
+        [pl.col(c).sum().over(["game_id", "team"]).alias(f"team_{c}") for c in USAGE_COUNTS]
+    ).with_columns(
+        [_share(count, f"team_{count}").alias(share) for share, count in USAGE_SHARES.items()]
+    )
+    return usage.sort(["team", "season", "week", "player_id"])
+
+
+def _snap_shares(season: int) -> pl.DataFrame:
+    """Offensive snaps and snap share per gsis player-week, or an empty frame when snap counts are unavailable (blocking)."""
+    try:
+        snaps = nfl.load_snap_counts([season])
+        rosters = nfl.load_rosters([season])
+    except Exception:
+        return pl.DataFrame()
+    if snaps.is_empty() or not {"pfr_player_id", "offense_snaps", "offense_pct"} <= set(snaps.columns) or not {"pfr_id", "gsis_id"} <= set(rosters.columns):
+        return pl.DataFrame()
+    ids = rosters.filter(pl.col("pfr_id").is_not_null() & pl.col("gsis_id").is_not_null()).select(
+        [pl.col("pfr_id").alias("pfr_player_id"), pl.col("gsis_id").alias("player_id")]
+    ).unique(subset=["pfr_player_id"])
+    return snaps.join(ids, on="pfr_player_id").select([
+        "player_id",
+        pl.col("season").cast(pl.Int64),
+        pl.col("week").cast(pl.Int64),
+        pl.col("offense_snaps").cast(pl.Float64),
+        pl.col("offense_pct").cast(pl.Float64).round(3).alias("snap_share"),
+    ]).unique(subset=["player_id", "season", "week"])
+
+
+def load_usage(season: int) -> pl.DataFrame:
+    """Season usage table from PBP (plus snap shares when published), built once per data version (blocking)."""
+    season = int(season)
+
+    def _build() -> pl.DataFrame:
+        usage = build_usage(nfl.load_pbp([season]))
+        if usage.is_empty():
+            return usage
+        snaps = _snap_shares(season)
+        if snaps.is_empty():
+            return usage.with_columns([pl.lit(None, dtype=pl.Float64).alias(c) for c in ("offense_snaps", "snap_share")])
+        snaps = snaps.with_columns(pl.col("season").cast(usage.schema["season"]), pl.col("week").cast(usage.schema["week"]))
+        return usage.join(snaps, on=["player_id", "season", "week"], how="left")
+
+    return get_or_build("player_usage", season, data_version(season), _build)
+
+
+def select_usage(
+    usage: pl.DataFrame,
+    game_types: Optional[str] = None,
+    *,
+    team: Optional[str] = None,
+    last_n: Optional[int] = None,
+) -> pl.DataFrame:
+    """Filter the usage table; `last_n` keeps each team's most recent games."""
+    if usage.is_empty():
+        return usage
+    df = usage.filter(pl.col("season_type").is_in(parse_game_types(game_types)))
+    if team:
+        df = df.filter(pl.col("team") == str(team).upper())
+    if last_n and last_n > 0:
+        df = df.filter(pl.col("week").rank("dense", descending=True).over("team") <= int(last_n))
+    return df
+
+
+def with_rolling(usage: pl.DataFrame, window: int) -> pl.DataFrame:
+    """Add <share>_roll: each player's share over their last `window` games (sums over sums, not a mean of shares)."""
+    if usage.is_empty() or not window or window < 1:
+        return usage
+    df = usage.sort(["player_id", "season", "week"])
+
+    def roll(col: str) -> pl.Expr:
+        return pl.col(col).rolling_sum(int(window), min_periods=1).over("player_id")
+
+    rolled = []
+    for share, count in USAGE_SHARES.items():
+        total = roll(f"team_{count}")
+        rolled.append(pl.when(total > 0).then((roll(count) / total).round(3)).otherwise(None).alias(f"{share}_roll"))
+    if "snap_share" in df.columns:
+        rolled.append(pl.col("snap_share").rolling_mean(int(window), min_periods=1).over("player_id").round(3).alias("snap_share_roll"))
+    return df.with_columns(rolled)
+
+
+def summarize_usage(usage: pl.DataFrame) -> pl.DataFrame:
+    """Per-player totals and shares of their team's volume over the selected games (including games they missed)."""
+    if usage.is_empty():
+        return pl.DataFrame()
+    team_totals = usage.unique(subset=["game_id", "team"]).group_by("team").agg(
+        [pl.len().alias("team_games")] + [pl.col(f"team_{c}").sum() for c in USAGE_COUNTS]
+    )
+    summary = usage.group_by(["team", "player_id"]).agg(
+        [pl.col("player_name").drop_nulls().first(), pl.col("game_id").n_unique().alias("games")]
+        + [pl.col(c).sum() for c in USAGE_COUNTS]
+        + [pl.col("snap_share").mean().round(3)]
+    ).join(team_totals, on="team")
+    return summary.with_columns(
+        [_share(count, f"team_{count}").alias(share) for share, count in USAGE_SHARES.items()]
+    ).sort(["team", "targets", "carries"], descending=[False, True, True])
+
+
+def _with_identity(frame: pl.DataFrame, current_season: int) -> pl.DataFrame:
+    """Display name, position and headshot from the registry by player_id (blocking)."""
+    try:
+        registry = load_player_registry(current_season)["frame"]
+    except Exception:
+        return frame
+    if registry.is_empty() or frame.is_empty():
+        return frame
+    ident = registry.select([
+        "player_id",
+        pl.col("name").alias("display_name"),
+        pl.col("position").cast(pl.Utf8),
+        "headshot_url",
+    ])
+    return frame.join(ident, on="player_id", how="left", maintain_order="left")
+
+
+async def get_team_usage_service(
+    team: str,
+    season: Optional[int] = None,
+    game_types: Optional[str] = None,
+    *,
+    last_n: Optional[int] = None,
+    include_weeks: bool = False,
+) -> Dict[str, Any]:
+    """Target/carry/air-yards/red-zone/snap shares of every player on a team."""
+    team_abbr = (team or "").upper()
+    current_season = int(nfl.get_current_season())
+    season_val = int(season) if season else current_season
+
+    def _load():
+        selected = select_usage(load_usage(season_val), game_types, team=team_abbr, last_n=last_n)
+        return selected, _with_identity(summarize_usage(selected), current_season)
+
+    try:
+        selected, summary = await run_in_threadpool(_load)
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to load usage: {str(e)}", "team": team_abbr, "season": season_val, "players": []}
+
+    out: Dict[str, Any] = {
+        "status": "success",
+        "season": season_val,
+        "team": team_abbr,
+        "games": int(selected["game_id"].n_unique()) if not selected.is_empty() else 0,
+        "players": summary.to_dicts(),
+    }
+    if include_weeks:
+        out["weeks"] = selected.to_dicts()
+    return out
+
+
+def player_usage(seasons: List[int], player_id: str, game_types: Optional[str] = None, window: Optional[int] = None) -> pl.DataFrame:
+    """A player's game-by-game usage over `seasons`, with rolling shares when `window` is given (blocking)."""
+    parts = [select_usage(load_usage(s), game_types) for s in seasons]
+    parts = [p.filter(pl.col("player_id") == player_id) for p in parts if not p.is_empty()]
+    parts = [p for p in parts if not p.is_empty()]
+    if not parts:
+        return pl.DataFrame()
+    rows = pl.concat(parts, how="vertical_relaxed")
+    return with_rolling(rows, window) if window else rows.sort(["season", "week"])
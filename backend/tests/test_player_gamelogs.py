@@ -0,0 +1,56 @@
+import polars as pl
+
+from app.services.nfl import player_gamelogs
+from app.services.nfl.player_gamelogs import build_game_logs, game_cursor, page_game_logs, parse_cursors
+
+
+LONG = "00-0000001"   # three seasons of games
+SHORT = "00-0000002"  # four games in the last season
+
+
+def _weekly(season: int) -> pl.DataFrame:
+    rows = [(LONG, week) for week in range(1, 5)]
+    if season == 2024:
+        rows += [(SHORT, week) for week in range(1, 5)]
+    return pl.DataFrame({
+        "player_id": [pid for pid, _ in rows],
+        "player_display_name": ["Long" if pid == LONG else "Short" for pid, _ in rows],
+        "position": "WR",
+        "position_group": "WR",
+        "team": "KC",
+        "opponent_team": "BUF",
+        "season": season,
+        "week": [week for _, week in rows],
+        "season_type": "REG",
+        "receptions": [float(week) for _, week in rows],
+    })
+
+
+def _follow(monkeypatch, limit: int):
+    """Page both players by feeding each response's combined next_cursor back in, as a client would."""
+    logs = {season: build_game_logs(_weekly(season), pl.DataFrame()) for season in (2022, 2023, 2024)}
+    monkeypatch.setattr(player_gamelogs, "load_game_logs", lambda season: logs[season])
+    ids = [LONG, SHORT]
+    seen = {pid: [] for pid in ids}
+    cursor = None
+    for _ in range(10):
+        pages = page_game_logs(ids, [2022, 2023, 2024], ["REG"], limit, parse_cursors(cursor, ids))
+        for pid, (rows, _) in pages.items():
+            seen[pid] += list(zip(rows["season"], rows["week"]))
+        nxt = [f"{pid}:{game_cursor(rows['season'][0], rows['week'][0])}" for pid, (rows, more) in pages.items() if more]
+        if not nxt:
+            break
+        cursor = ",".join(nxt)
+    return seen
+
+
+def test_pages_do_not_repeat_players_that_ran_out(monkeypatch):
+    seen = _follow(monkeypatch, limit=3)
+
+    assert len(seen[SHORT]) == len(set(seen[SHORT])) == 4
+    assert len(seen[LONG]) == len(set(seen[LONG])) == 12
+
+
+def test_pair_cursor_finishes_missing_ids():
+    assert parse_cursors(f"{LONG}:2024-3", [LONG, SHORT]) == {LONG: 202403, SHORT: 0}
+    assert parse_cursors("2024-3", [LONG]) == {LONG: 202403}
@@ -0,0 +1,46 @@
+import polars as pl
+
+from app.services.nfl.player_registry import build_player_registry, registry_find, registry_player
+
+
+def _players() -> pl.DataFrame:
+    return pl.DataFrame({
+        "player_id": ["00-0033873", "00-0036900"],
+        "player_display_name": ["Patrick Mahomes", "Ja'Marr Chase"],
+        "player_name": ["P.Mahomes", "J.Chase"],
+        "position": ["QB", "WR"],
+        "position_group": ["QB", "WR"],
+        "team": ["KC", "CIN"],
+        "headshot_url": [None, "https://example.com/chase.png"],
+        "season": [2024, 2024],
+        "week": [18, 18],
+        "rows": [17, 17],
+    })
+
+
+def test_registry_builds_without_rosters():
+    registry = build_player_registry(_players(), pl.DataFrame())
+
+    frame = registry["frame"]
+    assert frame.height == 2
+    assert {"full_name", "espn_id", "pfr_id"} <= set(frame.columns)
+    assert frame["espn_id"].null_count() == 2
+    assert registry["by_espn"] == {}
+    assert registry_player(registry, "00-0036900")["team"] == "CIN"
+    assert [row["player_id"] for row in registry_find(registry, "jamarr chase")] == ["00-0036900"]
+
+
+def test_registry_joins_roster_ids():
+    rosters = pl.DataFrame({
+        "gsis_id": ["00-0033873"],
+        "full_name": ["Patrick Mahomes"],
+        "espn_id": ["3139477"],
+        "pfr_id": ["MahoPa00"],
+        "team": ["KC"],
+        "position": ["QB"],
+        "season": [2025],
+    })
+    registry = build_player_registry(_players(), rosters)
+
+    assert registry_player(registry, "00-0033873")["espn_id"] == "3139477"
+    assert registry["by_espn"]["3139477"] == registry["by_id"]["00-0033873"]
@@ -13,6 +13,26 @@ export const getPlayerVsTeam = async (player, team, seasons, gameTypes) => {
   return data;
 };
 
+export const getPlayerVsAll = async (player, seasons, gameTypes) => {
+  const params = {};
+  if (seasons) params.seasons = seasons;
+  if (gameTypes) params.game_types = gameTypes;
+  const { data } = await api.get(`/api/nfl/player/${encodeURIComponent(player)}/vs`, { params });
+  return data;
+};
+
+export const getPlayerHitRates = async (player, stat, lines, extraParams) => {
+  const params = { stat, ...(extraParams || {}) };
+  if (lines) params.lines = Array.isArray(lines) ? lines.join(',') : lines;
+  const { data } = await api.get(`/api/nfl/player/${encodeURIComponent(player)}/hit-rates`, { params });
+  return data;
+};
+
+export const evaluateProps = async (props, filters) => {
+  const { data } = await api.post('/api/nfl/props/evaluate', { props, ...(filters || {}) });
+  return data;
+};
+
 export const getSchedule = async (start, end, season, week) => {
   const params = {};
   if (start) params.start = start;
@@ -28,10 +48,11 @@ export const searchPlayers = async (q, limit = 20) => {
   return data;
 };
 
-export const getPlayerRanks = async (season, gameTypes) => {
+export const getPlayerRanks = async (season, gameTypes, scoring) => {
   const params = {};
   if (season) params.season = season;
   if (gameTypes) params.game_types = gameTypes;
+  if (scoring) params.scoring = scoring;
   const { data } = await api.get('/api/nfl/players/ranks', { params });
   return data;
 };
@@ -54,6 +75,11 @@ export const resolveHeadshot = async (q, season) => {
   return data;
 };
 
+export const resolveHeadshots = async (queries, season) => {
+  const { data } = await api.post('/api/nfl/players/headshots', season ? { queries, season } : { queries });
+  return data;
+};
+
 export const getStandings = async (season) => {
   const { data } = await api.get('/api/nfl/standings', { params: season ? { season } : {} });
   return data;
@@ -122,7 +148,81 @@ export const getTeamTrends = async (team, season, gameTypes, extraParams) => {
   return data;
 };
 
+export const getLeagueTrends = async (season, gameTypes, extraParams) => {
+  const params = {};
+  if (season) params.season = season;
+  if (gameTypes) params.game_types = gameTypes;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get('/api/nfl/trends/league', { params });
+  return data;
+};
+
 
 // (dedup) getTeamDefense/getLeagueDefenseRanks defined above
 
+export const getTeamDvp = async (team, season, gameTypes, extraParams) => {
+  const params = {};
+  if (season) params.season = season;
+  if (gameTypes) params.game_types = gameTypes;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get(`/api/nfl/team/${encodeURIComponent(team)}/dvp`, { params });
+  return data;
+};
+
+export const getLeagueDvpRanks = async (season, gameTypes, extraParams) => {
+  const params = {};
+  if (season) params.season = season;
+  if (gameTypes) params.game_types = gameTypes;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get('/api/nfl/team/dvp/ranks', { params });
+  return data;
+};
+
+export const getPlayersGamelogs = async (ids, stats, lastN, extraParams) => {
+  const params = { ids: Array.isArray(ids) ? ids.join(',') : ids };
+  if (stats) params.stats = Array.isArray(stats) ? stats.join(',') : stats;
+  if (lastN) params.last_n = lastN;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get('/api/nfl/players/gamelogs', { params });
+  return data;
+};
+
+export const getPlayerStreaks = async (stat, threshold, extraParams) => {
+  const params = { stat, threshold, ...(extraParams || {}) };
+  const { data } = await api.get('/api/nfl/streaks/players', { params });
+  return data;
+};
+
+export const getTeamStreaks = async (stat, extraParams) => {
+  const params = { stat, ...(extraParams || {}) };
+  const { data } = await api.get('/api/nfl/streaks/teams', { params });
+  return data;
+};
 
+export const getPlayerSimilar = async (player, season, extraParams) => {
+  const params = {};
+  if (season) params.season = season;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get(`/api/nfl/player/${encodeURIComponent(player)}/similar`, { params });
+  return data;
+};
+
+export const getTeamCorrelations = async (team, season, extraParams) => {
+  const params = {};
+  if (season) params.season = season;
+  if (extraParams && typeof extraParams === 'object') Object.assign(params, extraParams);
+  const { data } = await api.get(`/api/nfl/team/${encodeURIComponent(team)}/correlations`, { params });
+  return data;
+};
+
+export const getPlayerProjection = async (player, stat, extraParams) => {
+  const params = { stat, ...(extraParams || {}) };
+  if (Array.isArray(params.lines)) params.lines = params.lines.join(',');
+  const { data } = await api.get(`/api/nfl/player/${encodeURIComponent(player)}/projection`, { params });
+  return data;
+};
+
+export const projectProps = async (items, settings) => {
+  const { data } = await api.post('/api/nfl/props/project', { items, ...(settings || {}) });
+  return data;
+};
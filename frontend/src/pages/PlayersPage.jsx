@@ -573,17 +573,11 @@ export default function PlayersPage() {
               
               if (!ranksList || !Array.isArray(ranksList) || ranksList.length === 0) return null;
               
-              // Sort by metric descending (higher is better)
-              const sorted = [...ranksList].sort((a, b) => {
-                const aVal = a[metricKey] ?? -Infinity;
-                const bVal = b[metricKey] ?? -Infinity;
-                return bVal - aVal;
-              });
-              
-              // Find rank (1-based) - normalize player_id comparison
+              // Ranks are precomputed by the API (<metric>_rank, 1 = best) - normalize player_id comparison
               const normalizedPlayerId = String(playerId);
-              const rank = sorted.findIndex(p => String(p.player_id) === normalizedPlayerId);
-              return rank >= 0 ? `${rank + 1}.º` : null;
+              const row = ranksList.find(p => String(p.player_id) === normalizedPlayerId);
+              const rank = row?.[`${metricKey}_rank`];
+              return rank != null ? `${rank}.º` : null;
             };
 
             // Check if there's any data at all